@@ -0,0 +1,202 @@
+import numpy as np
+
+import instrumentation
+
+# Işık hızı (m/s)
+c = 299792458.0
+
+# WGS84 elipsoidi: büyük yarı eksen (m) ve basıklık
+WGS84_A = 6378137.0
+WGS84_F = 1.0 / 298.257223563
+WGS84_E2 = WGS84_F * (2.0 - WGS84_F)
+
+# Alıcı bu mesafeden (m) az yer değiştirdiyse jeodezik koordinatlar ve ENU dönüşümü yeniden kullanılır
+GEOMETRY_REUSE_DISTANCE = 100.0
+
+# Saastamoinen modelinde kullanılan bağıl nem (standart atmosfer)
+TROPO_RELATIVE_HUMIDITY = 0.7
+
+# Klobuchar gecikmesi GPS L1 içindir; GLONASS G1 (1602 MHz) için frekans oranının karesiyle ölçeklenir
+GLONASS_IONO_SCALE = (1575.42 / 1602.0) ** 2
+
+# Önbellek verilmezse kullanılan modül düzeyi alıcı geometrisi önbelleği
+_receiver_geometry = {}
+
+
+# Function to convert ECEF coordinates (..., 3) to geodetic latitude, longitude (rad) and height (m)
+def ecef_to_geodetic(xyz):
+    xyz = np.asarray(xyz, dtype=np.float64)
+    x, y, z = xyz[..., 0], xyz[..., 1], xyz[..., 2]
+    p = np.hypot(x, y)
+    lon = np.arctan2(y, x)
+    lat = np.arctan2(z, p * (1.0 - WGS84_E2))
+    # Yeryüzü yakınında birkaç iterasyonda mm altına yakınsar
+    for _ in range(5):
+        N = WGS84_A / np.sqrt(1.0 - WGS84_E2 * np.sin(lat) ** 2)
+        height = p / np.cos(lat) - N
+        lat = np.arctan2(z, p * (1.0 - WGS84_E2 * N / (N + height)))
+    N = WGS84_A / np.sqrt(1.0 - WGS84_E2 * np.sin(lat) ** 2)
+    height = p / np.cos(lat) - N
+    return lat, lon, height
+
+
+# Function to return the geodetic position and ENU rotation of a receiver, reusing cached values
+def receiver_geometry(XYZ, cache=None, reuse_distance=GEOMETRY_REUSE_DISTANCE):
+    """
+    Alıcının enlem, boylam, yükseklik, trigonometrik terimleri ve ECEF->ENU dönüşüm matrisini
+    döndürür. Alıcı önbellekteki konumdan reuse_distance'tan az uzaklaştıysa önbellekteki değerler
+    yeniden kullanılır (sabit ya da yavaş hareket eden alıcıda epoch başına hesap yapılmaz).
+
+    Args:
+        XYZ (list): Alıcı ECEF konumu (m).
+        cache (dict): Son hesaplanan geometriyi tutan sözlük (None ise modül önbelleği).
+
+    Returns:
+        dict: "xyz", "lat", "lon", "height", "sin_lat", "cos_lat", "sin_lon", "cos_lon", "enu" (3x3).
+    """
+    if cache is None:
+        cache = _receiver_geometry
+    XYZ = np.asarray(XYZ, dtype=np.float64)
+    geometry = cache.get("geometry")
+    if geometry is not None and np.sum((XYZ - geometry["xyz"]) ** 2) <= reuse_distance ** 2:
+        instrumentation.count("atmosphere.geometry_hits")
+        return geometry
+
+    instrumentation.count("atmosphere.geometry_misses")
+    lat, lon, height = ecef_to_geodetic(XYZ)
+    sin_lat, cos_lat, sin_lon, cos_lon = np.sin(lat), np.cos(lat), np.sin(lon), np.cos(lon)
+    geometry = {
+        "xyz": XYZ,
+        "lat": float(lat),
+        "lon": float(lon),
+        "height": float(height),
+        "sin_lat": float(sin_lat),
+        "cos_lat": float(cos_lat),
+        "sin_lon": float(sin_lon),
+        "cos_lon": float(cos_lon),
+        # Satırlar doğu, kuzey, yukarı birim vektörleri
+        "enu": np.array([[-sin_lon, cos_lon, 0.0],
+                         [-sin_lat * cos_lon, -sin_lat * sin_lon, cos_lat],
+                         [cos_lat * cos_lon, cos_lat * sin_lon, sin_lat]])
+    }
+    cache["geometry"] = geometry
+    return geometry
+
+
+# Function to compute satellite elevation and azimuth (rad) for any number of satellites in one pass
+def elevation_azimuth(sat_xyz, geometry):
+    enu = (np.asarray(sat_xyz, dtype=np.float64) - geometry["xyz"]) @ geometry["enu"].T
+    distance = np.sqrt(np.einsum('...k,...k->...', enu, enu))
+    elevation = np.arcsin(np.clip(enu[..., 2] / np.where(distance > 0, distance, 1.0), -1.0, 1.0))
+    azimuth = np.arctan2(enu[..., 0], enu[..., 1]) % (2 * np.pi)
+    return elevation, azimuth
+
+
+# Function to compute the Klobuchar ionospheric delay on GPS L1 (m)
+def klobuchar_delay(elevation, azimuth, lat, lon, sow, ion_alpha, ion_beta):
+    """
+    IS-GPS-200 Klobuchar modeli. Tüm argümanlar diziler halinde (ör. epoch x uydu) verilebilir.
+
+    Args:
+        elevation, azimuth (ndarray): Uydu yükseklik ve azimut açıları (rad).
+        lat, lon (float | ndarray): Alıcı jeodezik enlem ve boylamı (rad).
+        sow (float | ndarray): GPS haftanın saniyesi.
+        ion_alpha, ion_beta (list): decode_nav_header_data'daki 4'er katsayı.
+
+    Returns:
+        ndarray: L1 iyonosfer gecikmesi (m).
+    """
+    # Model yarım daire (semicircle) biriminde çalışır
+    elevation_sc = np.asarray(elevation) / np.pi
+    psi = 0.0137 / (elevation_sc + 0.11) - 0.022
+    phi_i = np.clip(lat / np.pi + psi * np.cos(azimuth), -0.416, 0.416)
+    lam_i = lon / np.pi + psi * np.sin(azimuth) / np.cos(phi_i * np.pi)
+    phi_m = phi_i + 0.064 * np.cos((lam_i - 1.617) * np.pi)
+
+    local_time = (4.32e4 * lam_i + sow) % 86400.0
+    slant_factor = 1.0 + 16.0 * (0.53 - elevation_sc) ** 3
+    amplitude = np.maximum(np.polyval(ion_alpha[::-1], phi_m), 0.0)
+    period = np.maximum(np.polyval(ion_beta[::-1], phi_m), 72000.0)
+
+    x = 2.0 * np.pi * (local_time - 50400.0) / period
+    delay = np.where(np.abs(x) < 1.57, 5e-9 + amplitude * (1.0 - x ** 2 / 2.0 + x ** 4 / 24.0), 5e-9)
+    return c * slant_factor * delay
+
+
+# Function to compute the Saastamoinen tropospheric delay (m) with a standard atmosphere
+def saastamoinen_delay(elevation, lat, height, humidity=TROPO_RELATIVE_HUMIDITY):
+    """
+    Standart atmosfer (deniz seviyesinde 1013.25 hPa, 15 °C) ile Saastamoinen modeli.
+    Ufkun altındaki uydular ve -100 m / 10 km dışındaki yükseklikler için 0 döner.
+    """
+    elevation = np.asarray(elevation, dtype=np.float64)
+    if height < -100.0 or height > 1.0e4:
+        return np.zeros(elevation.shape)
+    h = max(height, 0.0)
+    pressure = 1013.25 * (1.0 - 2.2557e-5 * h) ** 5.2568
+    temperature = 15.0 - 6.5e-3 * h + 273.16
+    vapour = 6.108 * humidity * np.exp((17.15 * temperature - 4684.0) / (temperature - 38.45))
+
+    cos_z = np.sin(np.maximum(elevation, 1e-3))
+    hydrostatic = 0.0022768 * pressure / (1.0 - 0.00266 * np.cos(2.0 * lat) - 0.00028 * h / 1e3) / cos_z
+    wet = 0.002277 * (1255.0 / temperature + 0.05) * vapour / cos_z
+    return np.where(elevation > 0.0, hydrostatic + wet, 0.0)
+
+
+# Function to compute ionospheric and tropospheric delays for stacked epoch x satellite arrays
+def atmospheric_delays(sat_xyz, mask, receiver_xyz, sow, ion_alpha=None, ion_beta=None, troposphere=True,
+                       glonass=None, cache=None):
+    """
+    stack_epoch_positions düzenindeki (epoch x uydu) tüm uydu-epoch çiftleri için yükseklik/azimut
+    açılarını ve atmosfer gecikmelerini tek geçişte hesaplar. Alıcı geometrisi receiver_geometry ile
+    önbelleklenir; sabit alıcıda tüm epoch'lar için bir kez hesaplanır.
+
+    Args:
+        sat_xyz, mask: stack_epoch_positions çıktısı.
+        receiver_xyz (list | ndarray): Alıcı konumu (3) ya da epoch başına konumlar (epoch x 3).
+        sow (ndarray): Epoch başına GPS haftanın saniyesi.
+        ion_alpha, ion_beta (list): Klobuchar katsayıları (None ise iyonosfer düzeltmesi yapılmaz).
+        troposphere (bool): Saastamoinen düzeltmesi yapılsın mı.
+        glonass (ndarray): epoch x uydu, GLONASS uyduları için True (iyonosfer frekans ölçeklemesi).
+
+    Returns:
+        dict: "iono", "tropo" (m), "elevation", "azimuth" (rad); maskeli elemanlar 0.
+    """
+    sat_xyz = np.asarray(sat_xyz, dtype=np.float64)
+    mask = np.asarray(mask, dtype=bool)
+    num_epochs = mask.shape[0]
+    receiver_xyz = np.asarray(receiver_xyz, dtype=np.float64)
+
+    with instrumentation.timer("atmosphere.delays"):
+        if receiver_xyz.ndim == 1:
+            geometries = [receiver_geometry(receiver_xyz, cache)] * num_epochs
+        else:
+            geometries = [receiver_geometry(xyz, cache) for xyz in receiver_xyz]
+
+        elevation = np.zeros(mask.shape)
+        azimuth = np.zeros(mask.shape)
+        lat = np.zeros((num_epochs, 1))
+        lon = np.zeros((num_epochs, 1))
+        # Aynı geometriyi paylaşan epoch'lar tek matris çarpımıyla işlenir
+        groups = {}
+        for epoch_idx, geometry in enumerate(geometries):
+            groups.setdefault(id(geometry), (geometry, []))[1].append(epoch_idx)
+        for geometry, epoch_indices in groups.values():
+            elevation[epoch_indices], azimuth[epoch_indices] = elevation_azimuth(sat_xyz[epoch_indices], geometry)
+            lat[epoch_indices], lon[epoch_indices] = geometry["lat"], geometry["lon"]
+
+        iono = np.zeros(mask.shape)
+        if ion_alpha is not None and ion_beta is not None:
+            iono = klobuchar_delay(elevation, azimuth, lat, lon, np.asarray(sow, dtype=np.float64)[:, None],
+                                   np.asarray(ion_alpha), np.asarray(ion_beta))
+            if glonass is not None:
+                iono = np.where(glonass, iono * GLONASS_IONO_SCALE, iono)
+
+        tropo = np.zeros(mask.shape)
+        if troposphere:
+            for geometry, epoch_indices in groups.values():
+                tropo[epoch_indices] = saastamoinen_delay(elevation[epoch_indices], geometry["lat"],
+                                                          geometry["height"])
+
+    return {"iono": np.where(mask, iono, 0.0), "tropo": np.where(mask, tropo, 0.0),
+            "elevation": np.where(mask, elevation, 0.0), "azimuth": np.where(mask, azimuth, 0.0)}
@@ -0,0 +1,206 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+import nav_reader
+import obs_reader
+import spp_processing
+import synthetic_rinex
+from brdc_calculator import calculate_satellite_position
+
+# Sonuç dosyalarının varsayılan klasörü (sürümler arası karşılaştırma için)
+RESULTS_DIRECTORY = "benchmark_results"
+
+# Karşılaştırmada bu orandan fazla yavaşlama gerileme (regression) sayılır
+REGRESSION_TOLERANCE = 0.10
+
+# calculate_satellite_position aşamasında yapılan çağrı sayısı
+POSITION_CALLS = 20000
+
+
+# Function to return the current git commit of the repository, or None
+def _git_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Function to time a stage: best/median wall time over repeat runs and the peak traced memory of one run
+def measure(function, items, unit, repeat=3):
+    """
+    Bir aşamayı ölçer. Bellek tepe değeri tracemalloc ile ayrı bir çalıştırmada ölçülür (izleme
+    süreyi etkilediği için zamanlama çalıştırmalarında kapalıdır).
+
+    Args:
+        function: Argümansız çağrılan aşama fonksiyonu.
+        items (int | function): İşlenen öğe sayısı ya da fonksiyonun dönüşünden sayıyı veren fonksiyon.
+        unit (str): Öğe birimi (ör. "epochs").
+
+    Returns:
+        dict: "items", "unit", "seconds_min", "seconds_median", "throughput" (öğe/s), "peak_memory_mb".
+    """
+    tracemalloc.start()
+    try:
+        result = function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    if callable(items):
+        items = items(result)
+    del result
+
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+
+    return {
+        "items": items,
+        "unit": unit,
+        "seconds_min": min(times),
+        "seconds_median": statistics.median(times),
+        "throughput": items / min(times) if min(times) > 0 else None,
+        "peak_memory_mb": peak / 2 ** 20
+    }
+
+
+# Function to run the SPP loop (batched satellite positions + batched solution) over decoded epochs
+def _spp_loop(epochs, ephemeris_index, XYZ0):
+    return spp_processing.process_epochs(epochs, ephemeris_index, XYZ0)["solution"]
+
+
+# Function to run the benchmark stages on an observation/navigation file pair
+def run_benchmark(obs_file_path, nav_file_path, repeat=3):
+    """
+    decode_obs_body_data, decode_obs_body_columnar_parallel (tüm çekirdekler), decode_nav_body_data,
+    calculate_satellite_position ve SPP döngüsü aşamalarını ölçer.
+
+    Returns:
+        dict: Aşama adı -> measure sonucu.
+    """
+    stages = {}
+    stages["decode_obs_body_data"] = measure(lambda: obs_reader.decode_obs_body_data(obs_file_path),
+                                             len, "epochs", repeat)
+    stages["decode_obs_body_columnar_parallel"] = measure(
+        lambda: obs_reader.decode_obs_body_columnar_parallel(obs_file_path), lambda columnar: len(columnar["time"]),
+        "epochs", repeat)
+    stages["decode_nav_body_data"] = measure(lambda: nav_reader.decode_nav_body_data(nav_file_path),
+                                             len, "records", repeat)
+
+    nav_body_data = nav_reader.decode_nav_body_data(nav_file_path)
+    gps_records = [record for record in nav_body_data if record["prn"].startswith('G')]
+    queries = [(gps_records[i % len(gps_records)], gps_records[i % len(gps_records)]["toe"] + (i % 240) * 30.0 - 3600.0)
+               for i in range(POSITION_CALLS)]
+    stages["calculate_satellite_position"] = measure(
+        lambda: [calculate_satellite_position(record, t_gps) for record, t_gps in queries],
+        len(queries), "calls", repeat)
+
+    obs_header_data = obs_reader.decode_obs_header_data(obs_file_path)
+    XYZ0 = obs_header_data['approx_position_xyz']
+    ephemeris_index = nav_reader.build_ephemeris_index(nav_body_data)
+    epochs = obs_reader.decode_obs_body_data(obs_file_path)
+    stages["spp_loop"] = measure(lambda: _spp_loop(epochs, ephemeris_index, XYZ0),
+                                 lambda solution: len(solution["xyz"]), "epochs", repeat)
+    return stages
+
+
+# Function to compare two benchmark result dicts and return per-stage ratios
+def compare_results(baseline, current, tolerance=REGRESSION_TOLERANCE):
+    """
+    İki sonuç dosyasını aşama aşama karşılaştırır. Süre oranı (current / baseline, en iyi süre)
+    1 + tolerance'tan büyükse aşama gerilemiş sayılır.
+
+    Returns:
+        dict: Aşama adı -> {"time_ratio", "memory_ratio", "regression"}.
+    """
+    comparison = {}
+    for stage, result in current["stages"].items():
+        previous = baseline["stages"].get(stage)
+        if previous is None:
+            continue
+        # Öğe sayıları farklıysa öğe başına süre karşılaştırılır
+        time_ratio = (result["seconds_min"] / result["items"]) / (previous["seconds_min"] / previous["items"])
+        memory_ratio = (result["peak_memory_mb"] / previous["peak_memory_mb"]
+                        if previous["peak_memory_mb"] > 0 else None)
+        comparison[stage] = {"time_ratio": time_ratio, "memory_ratio": memory_ratio,
+                             "regression": time_ratio > 1 + tolerance}
+    return comparison
+
+
+# Function to print a results table
+def print_results(results, comparison=None):
+    print(f"{'stage':30} {'items':>9} {'best (s)':>10} {'throughput':>18} {'peak MB':>9}"
+          + (f" {'time x':>8} {'mem x':>7}" if comparison else ""))
+    for stage, result in results["stages"].items():
+        line = (f"{stage:30} {result['items']:9d} {result['seconds_min']:10.4f} "
+                f"{result['throughput']:11.1f} {result['unit'] + '/s':>6} {result['peak_memory_mb']:9.2f}")
+        if comparison and stage in comparison:
+            ratios = comparison[stage]
+            memory_ratio = f"{ratios['memory_ratio']:7.2f}" if ratios['memory_ratio'] is not None else f"{'-':>7}"
+            line += f" {ratios['time_ratio']:8.2f} {memory_ratio}" + ("  REGRESSION" if ratios["regression"] else "")
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the RINEX readers, orbit model and SPP loop "
+                                                 "on synthetic RINEX 3.05 files")
+    parser.add_argument("--duration", type=float, default=3600.0, help="session length (s)")
+    parser.add_argument("--interval", type=float, default=1.0, help="sampling interval (s)")
+    parser.add_argument("--satellites", type=int, default=synthetic_rinex.MAX_GPS_SATELLITES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--data-dir", help="keep the generated files here (default: temporary directory)")
+    parser.add_argument("--output", help=f"results file (default: {RESULTS_DIRECTORY}/<date>_<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    config = {"duration": args.duration, "interval": args.interval, "satellites": args.satellites,
+              "repeat": args.repeat}
+    with tempfile.TemporaryDirectory() as temp_directory:
+        data_directory = args.data_dir or temp_directory
+        started = time.perf_counter()
+        obs_file_path, nav_file_path = synthetic_rinex.generate_rinex(data_directory, args.duration, args.interval,
+                                                                      args.satellites)
+        config["generate_seconds"] = time.perf_counter() - started
+        config["obs_file_bytes"] = os.path.getsize(obs_file_path)
+        config["nav_file_bytes"] = os.path.getsize(nav_file_path)
+        stages = run_benchmark(obs_file_path, nav_file_path, args.repeat)
+
+    commit = _git_commit()
+    results = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "config": config,
+        "stages": stages
+    }
+
+    comparison = None
+    if args.compare:
+        with open(args.compare, "r") as file:
+            comparison = compare_results(json.load(file), results)
+        results["compared_to"] = args.compare
+        results["comparison"] = comparison
+    print_results(results, comparison)
+
+    output_path = args.output or os.path.join(
+        RESULTS_DIRECTORY, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{commit or 'nogit'}.json")
+    if os.path.dirname(output_path):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"Sonuçlar kaydedildi: {output_path}")
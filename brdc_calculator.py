@@ -1,5 +1,7 @@
 import numpy as np
 import gps_timer
+import instrumentation
+from bisect import bisect_right
 
 def calculate_satellite_position(nav_body_data, t_gps):
     """
@@ -63,11 +65,14 @@ def calculate_satellite_position(nav_body_data, t_gps):
     
     # Kepler denklemi: Dışmerkez anomali (Ek) iteratif olarak çözülüyor.
     Ek = Mk
-    for _ in range(10):
+    for iteration in range(10):
         Ek_prev = Ek
         Ek = Mk + e * np.sin(Ek)
         if abs(Ek - Ek_prev) < 1e-12:
             break
+    if instrumentation.enabled:
+        instrumentation.count("brdc.positions")
+        instrumentation.count("brdc.kepler_iterations", iteration + 1)
     
     # Gerçek anomali (vk)
     vk = np.arctan2(np.sqrt(1 - e**2) * np.sin(Ek), np.cos(Ek) - e)
@@ -100,3 +105,543 @@ def calculate_satellite_position(nav_body_data, t_gps):
     Z = y_prime * np.sin(ik)
     
     return X, Y, Z, dts
+
+
+# Toplu hesapta kullanılan efemeris alanları (nav_reader.decode_nav_body_data anahtarları)
+EPHEMERIS_KEYS = ("sqrtA", "e", "i0", "OMEGA0", "omega", "M0", "dn", "OMEGA", "idot", "toe",
+                  "cuc", "cus", "crc", "crs", "cic", "cis", "a0", "a1", "a2")
+
+
+def stack_ephemerides(nav_records, keys=EPHEMERIS_KEYS):
+    """
+    Efemeris sözlüklerinin listesini, her alan için bir dizi içeren sözlüğe çevirir.
+
+    Parametreler:
+      nav_records: decode_nav_body_data kayıtları (her satır bir uydu/epoch sorgusu olabilir).
+      keys: Alınacak alanlar (GLONASS kayıtları için GLONASS_EPHEMERIS_KEYS).
+
+    Dönüş:
+      dict: keys anahtarlarıyla float64 diziler.
+    """
+    return {key: np.array([record[key] for record in nav_records], dtype=np.float64)
+            for key in keys}
+
+
+def calculate_satellite_positions(ephemerides, t_gps, max_iterations=30, tolerance=1e-12):
+    """
+    calculate_satellite_position'ın vektörel (toplu) sürümü.
+
+    Parametreler:
+      ephemerides: EPHEMERIS_KEYS anahtarlarıyla diziler (ör. stack_ephemerides çıktısı).
+      t_gps: Sinyal gönderim zamanları (GPS haftasının saniyesi); efemeris dizileriyle
+             aynı şekle yayınlanabilir (broadcast) olmalı.
+      max_iterations, tolerance: Kepler denklemi için eleman bazında yakınsama ölçütü.
+
+    Dönüş:
+      X, Y, Z, dts: Aynı şekilde diziler (metre, saniye).
+    """
+    # Sabitler
+    mu = 3.986004418e14      # Yerçekimi parametresi (m^3/s^2)
+    OMEGA_e = 7.2921151467e-5  # Dünyanın dönüş hızı (rad/s)
+
+    t_gps = np.asarray(t_gps, dtype=np.float64)
+    arrays = np.broadcast_arrays(t_gps, *(np.asarray(ephemerides[key], dtype=np.float64)
+                                         for key in EPHEMERIS_KEYS))
+    shape = arrays[0].shape
+    t_gps = arrays[0].ravel()
+    (sqrtA, e, i0, OMEGA0, omega, M0, dn, OMEGA, idot, toe,
+     cuc, cus, crc, crs, cic, cis, a0, a1, a2) = (array.ravel() for array in arrays[1:])
+
+    A = sqrtA ** 2
+    n = np.sqrt(mu / A**3) + dn  # Düzeltilmiş ortalama hareket
+
+    # Zaman farkı (hafta geçişi düzeltmesiyle)
+    tk = t_gps - toe
+    tk = np.where(tk > 302400, tk - 604800, tk)
+    tk = np.where(tk < -302400, tk + 604800, tk)
+
+    dts = a0 + a1 * tk + a2 * tk**2
+    Mk = M0 + n * tk
+
+    # Kepler denklemi: sadece henüz yakınsamamış elemanlar güncellenir
+    Ek = Mk.copy()
+    active = np.arange(Ek.size)
+    kepler_iterations = 0
+    for _ in range(max_iterations):
+        Ek_prev = Ek[active]
+        Ek_new = Mk[active] + e[active] * np.sin(Ek_prev)
+        Ek[active] = Ek_new
+        kepler_iterations += active.size
+        active = active[np.abs(Ek_new - Ek_prev) >= tolerance]
+        if active.size == 0:
+            break
+    if instrumentation.enabled:
+        instrumentation.count("brdc.positions", Ek.size)
+        instrumentation.count("brdc.kepler_iterations", kepler_iterations)
+
+    sin_Ek = np.sin(Ek)
+    cos_Ek = np.cos(Ek)
+    vk = np.arctan2(np.sqrt(1 - e**2) * sin_Ek, cos_Ek - e)
+
+    phik = vk + omega
+    sin_2phik = np.sin(2 * phik)
+    cos_2phik = np.cos(2 * phik)
+    Uk = phik + cus * sin_2phik + cuc * cos_2phik
+    rk = A * (1 - e * cos_Ek) + crs * sin_2phik + crc * cos_2phik
+    ik = i0 + idot * tk + cis * sin_2phik + cic * cos_2phik
+
+    Omegak = OMEGA0 + (OMEGA - OMEGA_e) * tk - OMEGA_e * toe
+
+    x_prime = rk * np.cos(Uk)
+    y_prime = rk * np.sin(Uk)
+    cos_Omegak = np.cos(Omegak)
+    sin_Omegak = np.sin(Omegak)
+    cos_ik = np.cos(ik)
+
+    X = x_prime * cos_Omegak - y_prime * cos_ik * sin_Omegak
+    Y = x_prime * sin_Omegak + y_prime * cos_ik * cos_Omegak
+    Z = y_prime * np.sin(ik)
+
+    return X.reshape(shape), Y.reshape(shape), Z.reshape(shape), dts.reshape(shape)
+
+
+# GLONASS efemeris alanları (nav_reader.decode_nav_body_data 'R' kayıtları; konum/hız/ivme km birimli)
+GLONASS_EPHEMERIS_KEYS = ("toe", "clock_bias", "GammaN", "X", "Y", "Z", "X_dot", "Y_dot", "Z_dot",
+                          "X_acc", "Y_acc", "Z_acc")
+
+# PZ-90 sabitleri (GLONASS ICD)
+GLONASS_MU = 398600.4418e9          # Yerçekimi parametresi (m^3/s^2)
+GLONASS_AE = 6378136.0              # Ekvator yarıçapı (m)
+GLONASS_J2 = 1082625.75e-9          # İkinci derece zonal harmonik
+GLONASS_OMEGA_E = 7.292115e-5       # Dünyanın dönüş hızı (rad/s)
+
+# Runge-Kutta adımı (s): durumlar tb'den itibaren bu aralıklı düğümlerde önbelleğe alınır
+GLONASS_STEP = 60.0
+
+
+def _glonass_derivatives(state, acceleration):
+    """
+    PZ-90 (Dünya'ya bağlı) çerçevede GLONASS hareket denklemleri: merkezi çekim, J2,
+    merkezkaç ve Coriolis terimleri ile yayınlanan ay-güneş ivmeleri.
+
+    state: (..., 6) konum ve hız (m, m/s); acceleration: (..., 3) ivme (m/s^2).
+    """
+    x, y, z, vx, vy, vz = np.moveaxis(state, -1, 0)
+    r2 = x * x + y * y + z * z
+    r = np.sqrt(r2)
+    mu_r3 = GLONASS_MU / (r2 * r)
+    j2_term = 1.5 * GLONASS_J2 * GLONASS_MU * GLONASS_AE ** 2 / (r2 * r2 * r)
+    z2_r2 = 5 * z * z / r2
+    w2 = GLONASS_OMEGA_E ** 2
+
+    derivative = np.empty_like(state)
+    derivative[..., 0] = vx
+    derivative[..., 1] = vy
+    derivative[..., 2] = vz
+    derivative[..., 3] = -mu_r3 * x - j2_term * x * (1 - z2_r2) + w2 * x + 2 * GLONASS_OMEGA_E * vy + acceleration[..., 0]
+    derivative[..., 4] = -mu_r3 * y - j2_term * y * (1 - z2_r2) + w2 * y - 2 * GLONASS_OMEGA_E * vx + acceleration[..., 1]
+    derivative[..., 5] = -mu_r3 * z - j2_term * z * (3 - z2_r2) + acceleration[..., 2]
+    return derivative
+
+
+def _glonass_rk4_step(state, acceleration, h):
+    """Tüm durumları tek bir 4. derece Runge-Kutta adımıyla ilerletir (h skaler ya da (...,) dizi)."""
+    h = np.asarray(h, dtype=np.float64)[..., None]
+    k1 = _glonass_derivatives(state, acceleration)
+    k2 = _glonass_derivatives(state + 0.5 * h * k1, acceleration)
+    k3 = _glonass_derivatives(state + 0.5 * h * k2, acceleration)
+    k4 = _glonass_derivatives(state + h * k3, acceleration)
+    return state + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+
+def _glonass_grids(initial_states, accelerations, num_nodes, step):
+    """
+    Her efemerisi tb'den ileri ve geri num_nodes adım birlikte (lockstep) entegre eder.
+
+    Dönüş:
+      (efemeris x 2*num_nodes+1 x 6) dizi; [:, num_nodes] düğümü tb anıdır.
+    """
+    grids = np.empty((len(initial_states), 2 * num_nodes + 1, 6))
+    grids[:, num_nodes] = initial_states
+    forward = initial_states
+    backward = initial_states
+    for node in range(1, num_nodes + 1):
+        forward = _glonass_rk4_step(forward, accelerations, step)
+        backward = _glonass_rk4_step(backward, accelerations, -step)
+        grids[:, num_nodes + node] = forward
+        grids[:, num_nodes - node] = backward
+    return grids
+
+
+def calculate_glonass_positions(ephemerides, t_gps, cache=None, step=GLONASS_STEP):
+    """
+    GLONASS uydu konumlarını ve saat hatalarını, tüm uydu/zaman çiftleri için birlikte hesaplar.
+
+    Her efemeris tb'den itibaren step aralıklı düğümlere bir kez entegre edilir ve düğümler
+    cache sözlüğünde saklanır; her sorgu en yakın düğümden tek bir Runge-Kutta adımıyla
+    (|dt| <= step/2) hesaplanır. Bu yüzden aynı cache ile yapılan ardışık epoch sorgularının
+    maliyeti sorgu zamanı sayısıyla değil, sadece yeni efemeris sayısıyla artar.
+
+    Parametreler:
+      ephemerides: GLONASS_EPHEMERIS_KEYS anahtarlarıyla diziler (ör. stack_ephemerides çıktısı);
+                   "toe" tb'nin GPS haftası saniyesidir.
+      t_gps: Sinyal gönderim zamanları (GPS haftasının saniyesi); efemeris dizileriyle aynı
+             şekle yayınlanabilir olmalı.
+      cache: Düğüm durumlarını tutan sözlük (None ise yalnızca bu çağrı için kullanılır).
+      step: Runge-Kutta adımı (s).
+
+    Dönüş:
+      X, Y, Z, dts: Aynı şekilde diziler (metre, saniye). Koordinatlar PZ-90 çerçevesindedir.
+    """
+    if cache is None:
+        cache = {}
+
+    t_gps = np.asarray(t_gps, dtype=np.float64)
+    arrays = np.broadcast_arrays(t_gps, *(np.asarray(ephemerides[key], dtype=np.float64)
+                                         for key in GLONASS_EPHEMERIS_KEYS))
+    shape = arrays[0].shape
+    t_gps = arrays[0].ravel()
+    (toe, clock_bias, GammaN, X, Y, Z, X_dot, Y_dot, Z_dot,
+     X_acc, Y_acc, Z_acc) = (array.ravel() for array in arrays[1:])
+
+    if t_gps.size == 0:
+        empty = np.empty(shape)
+        return empty, empty.copy(), empty.copy(), empty.copy()
+
+    # Zaman farkı (hafta geçişi düzeltmesiyle)
+    tk = t_gps - toe
+    tk = np.where(tk > 302400, tk - 604800, tk)
+    tk = np.where(tk < -302400, tk + 604800, tk)
+
+    # -TauN + GammaN * (t - tb)
+    dts = clock_bias + GammaN * tk
+
+    # Başlangıç durumları ve ivmeler (km -> m)
+    states = np.stack([X, Y, Z, X_dot, Y_dot, Z_dot], axis=-1) * 1000.0
+    accelerations = np.stack([X_acc, Y_acc, Z_acc], axis=-1) * 1000.0
+    nodes = np.rint(tk / step).astype(np.int64)
+
+    # Her farklı efemeris bir kez; önbellekte olmayan ya da düğümleri yetmeyenler birlikte entegre edilir
+    keys, first, inverse = np.unique(np.column_stack([toe, states]), axis=0,
+                                     return_index=True, return_inverse=True)
+    inverse = inverse.ravel()
+    keys = [tuple(key) for key in keys.tolist()]
+    needed = np.zeros(len(keys), dtype=np.int64)
+    np.maximum.at(needed, inverse, np.abs(nodes))
+    missing = [i for i, key in enumerate(keys)
+               if key not in cache or (len(cache[key]) - 1) // 2 < needed[i]]
+    if instrumentation.enabled:
+        instrumentation.count("brdc.glonass_cache_hits", len(keys) - len(missing))
+        instrumentation.count("brdc.glonass_cache_misses", len(missing))
+    if missing:
+        num_nodes = max(int(needed[missing].max()), int(np.ceil(900.0 / step)))
+        grids = _glonass_grids(states[first[missing]], accelerations[first[missing]], num_nodes, step)
+        for i, grid in zip(missing, grids):
+            cache[keys[i]] = grid
+
+    # En yakın düğümden sorgu zamanına tek adım
+    centers = []
+    offset = 0
+    for key in keys:
+        centers.append(offset + (len(cache[key]) - 1) // 2)
+        offset += len(cache[key])
+    node_states = np.concatenate([cache[key] for key in keys])
+    start = node_states[np.asarray(centers, dtype=np.int64)[inverse] + nodes]
+    state = _glonass_rk4_step(start, accelerations, tk - nodes * step)
+
+    return (state[:, 0].reshape(shape), state[:, 1].reshape(shape), state[:, 2].reshape(shape),
+            dts.reshape(shape))
+
+
+# calculate_glonass_position'ın varsayılan düğüm önbelleği (süreç başına)
+_glonass_nodes = {}
+
+
+def calculate_glonass_position(nav_body_data, t_gps, cache=None):
+    """
+    calculate_satellite_position'ın GLONASS karşılığı: tek bir efemeris kaydı ve zaman için
+    X, Y, Z (metre) ve dts (saniye) döndürür. Aynı cache ile tekrarlanan çağrılar
+    entegrasyon düğümlerini yeniden kullanır; cache verilmezse modül önbelleği kullanılır.
+    """
+    if cache is None:
+        cache = _glonass_nodes
+    X, Y, Z, dts = calculate_glonass_positions({key: nav_body_data[key] for key in GLONASS_EPHEMERIS_KEYS},
+                                               t_gps, cache)
+    return float(X), float(Y), float(Z), float(dts)
+
+
+# Chebyshev yörünge tablosu varsayılanları: 30 dakikalık parçalarda 8. derece polinom GPS
+# yörüngesini mikrometre düzeyinde temsil eder; doğrulama hatası ORBIT_TABLE_TOLERANCE'ı
+# aşan parçalar ikiye bölünerek yeniden uydurulur
+ORBIT_TABLE_SEGMENT = 1800.0    # Parça uzunluğu (s)
+ORBIT_TABLE_DEGREE = 8
+ORBIT_TABLE_TOLERANCE = 1e-3    # Konum ve c * dts için en büyük hata (m)
+ORBIT_TABLE_MAX_SPLITS = 8
+
+# Işık hızı (m/s); saat hatası toleransı metreye çevrilerek kontrol edilir
+c = 299792458.0
+
+
+def _orbit_table_key(nav_body_data):
+    """Efemeris kaydının tablo anahtarı: (prn, sürekli GPS saniyesi cinsinden toe)."""
+    return nav_body_data["prn"], (nav_body_data.get("GPS_week") or 0) * 604800 + nav_body_data["toe"]
+
+
+def _exact_positions(records, tk, glonass_cache):
+    """records[i] efemerisinin toe + tk[i, :] anlarındaki kesin X, Y, Z, dts değerleri (i x nokta x 4)."""
+    values = np.empty(tk.shape + (4,))
+    is_glonass = np.array([record["prn"][0] == 'R' for record in records], dtype=bool)
+    for selected, keys, function in ((~is_glonass, EPHEMERIS_KEYS, calculate_satellite_positions),
+                                     (is_glonass, GLONASS_EPHEMERIS_KEYS, None)):
+        rows = np.flatnonzero(selected)
+        if rows.size == 0:
+            continue
+        ephemerides = {key: value[:, None] for key, value in
+                       stack_ephemerides([records[row] for row in rows], keys).items()}
+        t = ephemerides["toe"] + tk[rows]
+        if function is None:
+            X, Y, Z, dts = calculate_glonass_positions(ephemerides, t, glonass_cache)
+        else:
+            X, Y, Z, dts = function(ephemerides, t)
+        values[rows] = np.stack([X, Y, Z, dts], axis=-1)
+    return values
+
+
+def _horner(coeffs, x):
+    """Kuvvet tabanındaki (..., 4, derece+1) katsayıları x noktalarında (..., nokta) değerlendirir."""
+    result = np.zeros(x.shape + (coeffs.shape[-2],))
+    for power in range(coeffs.shape[-1] - 1, -1, -1):
+        result = result * x[..., None] + coeffs[..., None, :, power]
+    return result
+
+
+def build_orbit_tables(ephemeris_index, t_start=None, t_end=None, segment_length=ORBIT_TABLE_SEGMENT,
+                       degree=ORBIT_TABLE_DEGREE, tolerance=ORBIT_TABLE_TOLERANCE, margin=60.0):
+    """
+    Her efemerisin yörüngesini ve saat hatasını oturum aralığında bir kez örnekleyip parçalı
+    Chebyshev polinomlarıyla temsil eder. Polinomlar Chebyshev düğümlerinde uydurulur, değerlendirme
+    için kuvvet tabanına (Horner) çevrilir ve düğümler arasındaki noktalarda kesin modelle
+    karşılaştırılır; hata toleransı aşan parçalar ikiye bölünür.
+
+    Parametreler:
+      ephemeris_index: nav_reader.build_ephemeris_index çıktısı (GPS ve GLONASS).
+      t_start, t_end: Oturum aralığı (sürekli GPS saniyesi, hafta * 604800 + saniye). None ise
+                      her efemerisin tüm fit aralığı kapsanır.
+      segment_length: Parça uzunluğu (s); degree: polinom derecesi.
+      tolerance: Konum ve c * dts için izin verilen en büyük hata (metre).
+      margin: Oturum aralığının iki yanına eklenen pay (s); sinyal yolculuk süresini kapsar.
+
+    Dönüş:
+      dict: {(prn, toe): {"start", "width", "coeffs", "max_error"}}; coeffs parça başına
+      [X, Y, Z, dts] kuvvet katsayılarıdır. calculate_satellite_position_table ile kullanılır.
+    """
+    # Chebyshev düğümleri, kontrol noktaları (düğümlerin arası ve uçlar) ve kuvvet tabanına geçiş
+    nodes = np.cos(np.pi * (np.arange(degree + 1) + 0.5) / (degree + 1))
+    checks = np.concatenate([[-1.0, 1.0], np.cos(np.pi * np.arange(1, degree + 1) / (degree + 1))])
+    cheb_to_power = np.zeros((degree + 1, degree + 1))
+    for k in range(degree + 1):
+        cheb_to_power[:k + 1, k] = np.polynomial.chebyshev.cheb2poly(np.eye(degree + 1)[k])[:k + 1]
+    fit_matrix = cheb_to_power @ np.linalg.inv(np.polynomial.chebyshev.chebvander(nodes, degree))
+
+    # Oturumla kesişen her efemeris için tk aralığı, eşit uzunlukta parçalara bölünür
+    records = []
+    ranges = []
+    segments = []
+    for prn, entry in ephemeris_index.items():
+        for toe, record, half_fit in zip(entry["toe"], entry["records"], entry["half_fit"]):
+            low = -half_fit - margin if t_start is None else max(t_start - margin - toe, -half_fit - margin)
+            high = half_fit + margin if t_end is None else min(t_end + margin - toe, half_fit + margin)
+            if low >= high:
+                continue
+            num_segments = max(1, int(np.ceil((high - low) / segment_length)))
+            width = (high - low) / num_segments
+            segments.extend((len(records), low + k * width, width) for k in range(num_segments))
+            records.append(record)
+            ranges.append((low, high))
+
+    # Tüm parçalar birlikte uydurulur ve doğrulanır
+    fitted = [[] for _ in records]
+    max_errors = [0.0] * len(records)
+    glonass_cache = {}
+    for split in range(ORBIT_TABLE_MAX_SPLITS + 1):
+        if not segments:
+            break
+        rows = np.array([segment[0] for segment in segments], dtype=np.int64)
+        half = np.array([segment[2] for segment in segments]) / 2
+        centre = np.array([segment[1] for segment in segments]) + half
+        segment_records = [records[row] for row in rows]
+
+        values = _exact_positions(segment_records, centre[:, None] + half[:, None] * nodes, glonass_cache)
+        coeffs = np.einsum('kj,sjc->sck', fit_matrix, values)
+
+        exact = _exact_positions(segment_records, centre[:, None] + half[:, None] * checks, glonass_cache)
+        error = _horner(coeffs, np.broadcast_to(checks, (len(segments), len(checks)))) - exact
+        error = np.maximum(np.linalg.norm(error[..., :3], axis=-1), c * np.abs(error[..., 3])).max(axis=1)
+
+        failed = []
+        for segment, row, segment_centre, segment_half, segment_coeffs, segment_error in zip(
+                segments, rows, centre, half, coeffs, error):
+            if segment_error > tolerance:
+                failed.append(segment)
+                continue
+            # Horner için katsayılar en yüksek dereceden başlayarak saklanır
+            fitted[row].append((segment_centre - segment_half, float(segment_centre), float(segment_half),
+                                segment_coeffs[:, ::-1].tolist()))
+            max_errors[row] = max(max_errors[row], float(segment_error))
+
+        if failed and split == ORBIT_TABLE_MAX_SPLITS:
+            raise ValueError(f"Orbit table tolerance of {tolerance} m not reached for {len(failed)} segments")
+        segments = [(row, low + width / 2 * k, width / 2) for row, low, width in failed for k in range(2)]
+
+    tables = {}
+    for record, (low, high), record_segments, max_error in zip(records, ranges, fitted, max_errors):
+        record_segments.sort(key=lambda segment: segment[0])
+        tables[_orbit_table_key(record)] = {
+            "start": [float(segment[0]) for segment in record_segments],
+            "end": float(high),
+            "centre": [segment[1] for segment in record_segments],
+            "half": [segment[2] for segment in record_segments],
+            "coeffs": [segment[3] for segment in record_segments],
+            "max_error": max_error
+        }
+    return tables
+
+
+def calculate_satellite_position_table(orbit_tables, nav_body_data, t_gps):
+    """
+    calculate_satellite_position / calculate_glonass_position ile aynı çağrı biçiminde, konumu
+    build_orbit_tables polinomlarından hesaplar. Kayıt tabloda yoksa ya da zaman tablonun
+    kapsamı dışındaysa kesin modele geri dönülür.
+
+    Dönüş:
+      X, Y, Z: Uydunun ECEF koordinatları (metre).
+      dts: Uydu saat hatası (saniye).
+    """
+    table = orbit_tables.get(_orbit_table_key(nav_body_data))
+    tk = t_gps - nav_body_data["toe"]
+    if tk > 302400:
+        tk -= 604800
+    elif tk < -302400:
+        tk += 604800
+
+    if table is None or not table["start"][0] <= tk <= table["end"]:
+        instrumentation.count("brdc.orbit_table_misses")
+        if nav_body_data["prn"][0] == 'R':
+            return calculate_glonass_position(nav_body_data, t_gps)
+        return calculate_satellite_position(nav_body_data, t_gps)
+
+    if instrumentation.enabled:
+        instrumentation.count("brdc.orbit_table_hits")
+    segment = bisect_right(table["start"], tk) - 1
+    x = (tk - table["centre"][segment]) / table["half"][segment]
+    result = []
+    for component in table["coeffs"][segment]:
+        value = 0.0
+        for coefficient in component:
+            value = value * x + coefficient
+        result.append(value)
+    return result[0], result[1], result[2], result[3]
+
+
+# Birleşik tablo dizilerinde tablo başına ayrılan tk aralığı (s); tk haftanın yarısıyla sınırlıdır
+_TABLE_KEY_SPAN = 2 * 604800.0
+
+# Son dizi değerlendirmesinde kullanılan tablolar ve birleşik dizileri (tablolar değişince yeniden kurulur)
+_stacked_orbit_tables = {}
+
+
+def stack_orbit_tables(orbit_tables):
+    """
+    build_orbit_tables çıktısını dizi değerlendirmesi için birleşik dizilere çevirir. Tüm
+    tabloların parçaları art arda dizilir; parça başlangıçları tablo_indeksi * _TABLE_KEY_SPAN + tk
+    anahtarıyla sıralı olduğundan her sorgunun parçası tek bir searchsorted ile bulunur.
+
+    Dönüş:
+      dict: "index" ({(prn, toe): tablo indeksi}), "keys" (parça başlangıç anahtarları), "first"
+      (tablonun ilk parçası), "end" (tablonun son tk değeri), "centre", "half" ve "coeffs"
+      (parça x 4 x derece+1, en yüksek dereceden başlayarak).
+    """
+    index = {}
+    keys, first, end, centre, half, coeffs = [], [], [], [], [], []
+    for table_idx, (key, table) in enumerate(orbit_tables.items()):
+        index[key] = table_idx
+        first.append(len(keys))
+        end.append(table["end"])
+        keys.extend(table_idx * _TABLE_KEY_SPAN + _TABLE_KEY_SPAN / 2 + start for start in table["start"])
+        centre.extend(table["centre"])
+        half.extend(table["half"])
+        coeffs.extend(table["coeffs"])
+    degree = len(coeffs[0][0]) - 1 if coeffs else ORBIT_TABLE_DEGREE
+    return {
+        "index": index,
+        "keys": np.array(keys, dtype=np.float64),
+        "first": np.array(first, dtype=np.int64),
+        "end": np.array(end, dtype=np.float64),
+        "centre": np.array(centre, dtype=np.float64),
+        "half": np.array(half, dtype=np.float64),
+        "coeffs": np.array(coeffs, dtype=np.float64).reshape(len(keys), 4, degree + 1)
+    }
+
+
+def calculate_satellite_positions_table(orbit_tables, nav_records, t_gps, glonass_cache=None):
+    """
+    calculate_satellite_position_table'ın vektörel (toplu) sürümü: her sorgunun parçası birleşik
+    parça başlangıçlarında searchsorted ile bulunur ve polinomlar tüm sorgular için birlikte
+    (Horner) değerlendirilir. Tabloda olmayan ya da kapsam dışındaki sorgular toplu kesin modelle
+    (calculate_satellite_positions / calculate_glonass_positions) hesaplanır.
+
+    Parametreler:
+      orbit_tables: build_orbit_tables çıktısı; birleşik dizileri bir kez kurulur (stack_orbit_tables).
+      nav_records: Sorgu başına efemeris kaydı (decode_nav_body_data kayıtları).
+      t_gps: Sinyal gönderim zamanları (GPS haftasının saniyesi), nav_records ile aynı uzunlukta.
+      glonass_cache: Kesin GLONASS hesabının düğüm önbelleği (None ise modül önbelleği).
+
+    Dönüş:
+      X, Y, Z, dts: Sorgu başına diziler (metre, saniye).
+    """
+    if _stacked_orbit_tables.get("tables") is not orbit_tables:
+        _stacked_orbit_tables.update(tables=orbit_tables, stacked=stack_orbit_tables(orbit_tables))
+    stacked = _stacked_orbit_tables["stacked"]
+
+    t_gps = np.asarray(t_gps, dtype=np.float64)
+    table_idx = np.array([stacked["index"].get(_orbit_table_key(record), -1) for record in nav_records],
+                         dtype=np.int64)
+    tk = t_gps - np.array([record["toe"] for record in nav_records], dtype=np.float64)
+    tk = np.where(tk > 302400, tk - 604800, np.where(tk < -302400, tk + 604800, tk))
+
+    # Parça: anahtarı sorgunun anahtarından büyük olmayan son parça; başka tabloya düşerse kapsam dışıdır
+    found = table_idx >= 0
+    safe_idx = np.where(found, table_idx, 0)
+    segment = np.searchsorted(stacked["keys"], safe_idx * _TABLE_KEY_SPAN + _TABLE_KEY_SPAN / 2 + tk,
+                              side='right') - 1
+    hit = found & (segment >= stacked["first"][safe_idx]) & (tk <= stacked["end"][safe_idx])
+    rows = np.flatnonzero(hit)
+    segment = segment[rows]
+
+    values = np.empty((len(tk), 4))
+    x = (tk[rows] - stacked["centre"][segment]) / stacked["half"][segment]
+    segment_coeffs = stacked["coeffs"][segment]
+    result = np.zeros((len(rows), 4))
+    for power in range(segment_coeffs.shape[-1]):
+        result = result * x[:, None] + segment_coeffs[:, :, power]
+    values[rows] = result
+
+    misses = np.flatnonzero(~hit)
+    if instrumentation.enabled:
+        instrumentation.count("brdc.orbit_table_hits", len(rows))
+        instrumentation.count("brdc.orbit_table_misses", len(misses))
+    if misses.size:
+        is_glonass = np.array([nav_records[row]["prn"][0] == 'R' for row in misses], dtype=bool)
+        for selected, keys in ((~is_glonass, EPHEMERIS_KEYS), (is_glonass, GLONASS_EPHEMERIS_KEYS)):
+            miss_rows = misses[selected]
+            if miss_rows.size == 0:
+                continue
+            ephemerides = stack_ephemerides([nav_records[row] for row in miss_rows], keys)
+            if keys is GLONASS_EPHEMERIS_KEYS:
+                exact = calculate_glonass_positions(ephemerides, t_gps[miss_rows],
+                                                    _glonass_nodes if glonass_cache is None else glonass_cache)
+            else:
+                exact = calculate_satellite_positions(ephemerides, t_gps[miss_rows])
+            values[miss_rows] = np.stack(exact, axis=-1)
+
+    return values[:, 0], values[:, 1], values[:, 2], values[:, 3]
@@ -1,5 +1,7 @@
 from datetime import datetime
 
+import numpy as np
+
 def utc_to_gps_sow(epoch):
     """
     UTC zamanını GPS haftası ve hafta içindeki saniyeye dönüştürür.
@@ -18,3 +20,132 @@ def utc_to_gps_sow(epoch):
     return gps_week, gps_sow
   
 
+
+# Zaman sabitleri
+NS_PER_SECOND = 1_000_000_000
+SECONDS_PER_WEEK = 604800
+NS_PER_WEEK = SECONDS_PER_WEEK * NS_PER_SECOND
+
+# GPS başlangıcı (1980-01-06) 1970-01-01'den itibaren gün olarak
+GPS_EPOCH_DAYS = 3657
+
+# Yayın mesajlarındaki 10 bitlik hafta numarası her 1024 haftada bir sıfırlanır
+WEEK_ROLLOVER = 1024
+
+# Artık saniye tablosu: (UTC yılı, ayı, günü, o tarihten itibaren GPS - UTC farkı (s))
+LEAP_SECONDS = ((1981, 7, 1, 1), (1982, 7, 1, 2), (1983, 7, 1, 3), (1985, 7, 1, 4), (1988, 1, 1, 5),
+                (1990, 1, 1, 6), (1991, 1, 1, 7), (1992, 7, 1, 8), (1993, 7, 1, 9), (1994, 7, 1, 10),
+                (1996, 1, 1, 11), (1997, 7, 1, 12), (1999, 1, 1, 13), (2006, 1, 1, 14), (2009, 1, 1, 15),
+                (2012, 7, 1, 16), (2015, 7, 1, 17), (2017, 1, 1, 18))
+
+# GLONASS zamanı UTC(SU) + 3 saattir
+GLONASS_UTC_OFFSET_NS = 3 * 3600 * NS_PER_SECOND
+
+# GPS zamanıyla aynı ölçekte sayılan RINEX zaman sistemleri; BeiDou zamanı (BDT) GPS'in 14 s gerisindedir
+GPS_ALIGNED_TIME_SYSTEMS = ("GPS", "GAL", "QZS", "IRN")
+BDT_GPS_OFFSET_NS = 14 * NS_PER_SECOND
+
+
+# Function to count days since 1970-01-01 for a proleptic Gregorian date (ints or integer arrays)
+def days_from_civil(year, month, day):
+    # Yıl Mart'ta başlatılır; böylece artık gün yılın sonuna düşer (sadece tam sayı işlemleri)
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * ((month + 9) % 12) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+# Artık saniye geçişlerinin UTC anları (GPS başlangıcından itibaren ns, UTC ölçeğinde) ve farkları
+_LEAP_UTC_NS = np.array([(days_from_civil(year, month, day) - GPS_EPOCH_DAYS) * 86400 * NS_PER_SECOND
+                         for year, month, day, _ in LEAP_SECONDS], dtype=np.int64)
+_LEAP_OFFSETS = np.array([0] + [offset for *_, offset in LEAP_SECONDS], dtype=np.int64)
+
+
+# Function to return GPS - UTC (s) for UTC times given in ns since the GPS epoch
+def leap_seconds(utc_ns):
+    return _LEAP_OFFSETS[np.searchsorted(_LEAP_UTC_NS, utc_ns, side='right')]
+
+
+# Function to convert UTC times to GPS times (both ns since the GPS epoch)
+def utc_to_gps_ns(utc_ns):
+    return utc_ns + leap_seconds(utc_ns) * NS_PER_SECOND
+
+
+# Function to convert GPS times to UTC times (both ns since the GPS epoch)
+def gps_to_utc_ns(gps_ns):
+    # Tablo UTC ölçeğinde olduğu için geçiş anları GPS ölçeğine taşınarak aranır
+    offsets = _LEAP_OFFSETS[np.searchsorted(_LEAP_UTC_NS + _LEAP_OFFSETS[1:] * NS_PER_SECOND, gps_ns, side='right')]
+    return gps_ns - offsets * NS_PER_SECOND
+
+
+# Function to convert times counted in another time system (ns since the GPS epoch) to GPS times
+def _to_gps_ns(time_ns, time_system):
+    if time_system in GPS_ALIGNED_TIME_SYSTEMS:
+        return time_ns
+    if time_system == "GLO":
+        return utc_to_gps_ns(time_ns - GLONASS_UTC_OFFSET_NS)
+    if time_system == "UTC":
+        return utc_to_gps_ns(time_ns)
+    if time_system == "BDT":
+        return time_ns + BDT_GPS_OFFSET_NS
+    raise ValueError(f"Unsupported time system: {time_system}")
+
+
+# Function to convert calendar fields to integer GPS nanoseconds since the GPS epoch (1980-01-06)
+def gps_time_ns(year, month, day, hour, minute, second, time_system="GPS"):
+    """
+    Takvim alanlarını GPS başlangıcından (1980-01-06) itibaren geçen tam sayı nanosaniyeye çevirir.
+    Alanlar time_system zaman sistemindeyse (gps_time_ns_array) GPS zamanına taşınır.
+
+    Returns:
+        int: GPS zamanı (ns).
+    """
+    days = days_from_civil(year, month, day) - GPS_EPOCH_DAYS
+    seconds = ((days * 24 + hour) * 60 + minute) * 60
+    time_ns = seconds * NS_PER_SECOND + round(second * NS_PER_SECOND)
+    return time_ns if time_system == "GPS" else int(_to_gps_ns(time_ns, time_system))
+
+
+# Function to convert calendar fields to integer GPS nanoseconds in one call over whole arrays
+def gps_time_ns_array(year, month, day, hour, minute, second=0.0, second_ns=None, time_system="GPS"):
+    """
+    gps_time_ns'in dizi (vektörel) sürümü: tüm epoch alanlarını tek çağrıda GPS başlangıcından
+    itibaren int64 nanosaniyeye çevirir. Hesap tam sayılarla yapılır; saniyeler second_ns ile
+    tam sayı nanosaniye olarak verilirse hiç yuvarlama olmaz (10/20 Hz epoch'lar ayrı kalır).
+
+    Args:
+        year, month, day, hour, minute: Tam sayı diziler (ya da skalerler).
+        second (float | array): Saniye (ns'ye yuvarlanır); second_ns verilmişse kullanılmaz.
+        second_ns (int | array): Dakika içindeki tam sayı nanosaniye.
+        time_system (str): Takvim alanlarının RINEX zaman sistemi: "GPS" (ve onunla hizalı "GAL",
+            "QZS", "IRN"), "BDT", "UTC" ya da "GLO" (UTC + 3 saat).
+
+    Returns:
+        numpy.ndarray: int64 GPS zamanı (ns).
+    """
+    year, month, day, hour, minute = (np.asarray(value, dtype=np.int64) for value in (year, month, day, hour, minute))
+    if second_ns is None:
+        second_ns = np.rint(np.asarray(second, dtype=np.float64) * NS_PER_SECOND).astype(np.int64)
+    days = days_from_civil(year, month, day) - GPS_EPOCH_DAYS
+    time_ns = ((days * 24 + hour) * 60 + minute) * 60 * NS_PER_SECOND + np.asarray(second_ns, dtype=np.int64)
+    return _to_gps_ns(time_ns, time_system)
+
+
+# Function to split GPS nanoseconds into GPS week and seconds of week (ints or arrays)
+def gps_week_sow(time_ns):
+    """
+    GPS zamanını (ns) hafta ve hafta içi saniyeye ayırır. Hafta tam (rollover'sız) hafta
+    numarasıdır; saniye kesirli olabilir. Skaler tam sayılar için numpy kullanılmaz.
+
+    Returns:
+        tuple: (gps_week, gps_sow)
+    """
+    gps_week = time_ns // NS_PER_WEEK
+    return gps_week, (time_ns - gps_week * NS_PER_WEEK) / NS_PER_SECOND
+
+
+# Function to resolve a 10-bit broadcast week number to the full GPS week nearest a reference week
+def full_gps_week(week, reference_week):
+    return week + WEEK_ROLLOVER * np.rint((np.asarray(reference_week) - week) / WEEK_ROLLOVER).astype(np.int64)
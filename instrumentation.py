@@ -0,0 +1,109 @@
+import json
+import os
+import time
+from contextlib import nullcontext
+
+# Ölçüm açık mı: kapalıyken timer() hazır bir boş bağlam döndürür, count()/add_time() hemen döner.
+# Sık çağrılan döngülerde çağrı yerine önce "if instrumentation.enabled:" kontrol edilir.
+# SPP_INSTRUMENT=1 ortam değişkeniyle ya da enable() ile açılır.
+enabled = os.environ.get("SPP_INSTRUMENT", "") not in ("", "0")
+
+# Aşama adı -> [çağrı sayısı, toplam süre (s)]
+_timings = {}
+
+# Sayaç adı -> değer
+_counters = {}
+
+_NULL_TIMER = nullcontext()
+
+
+# Zamanlayıcı bağlamı: with bloğunun süresini aşamaya ekler
+class _Timer:
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        add_time(self.stage, time.perf_counter() - self.started)
+        return False
+
+
+# Function to turn instrumentation on
+def enable():
+    global enabled
+    enabled = True
+
+
+# Function to turn instrumentation off (collected values are kept until reset)
+def disable():
+    global enabled
+    enabled = False
+
+
+# Function to clear all collected timings and counters
+def reset():
+    _timings.clear()
+    _counters.clear()
+
+
+# Function to time a block: with instrumentation.timer("nav.decode_body"): ...
+def timer(stage):
+    return _Timer(stage) if enabled else _NULL_TIMER
+
+
+# Function to add an already measured duration to a stage
+def add_time(stage, seconds, calls=1):
+    if not enabled:
+        return
+    timing = _timings.get(stage)
+    if timing is None:
+        _timings[stage] = [calls, seconds]
+    else:
+        timing[0] += calls
+        timing[1] += seconds
+
+
+# Function to increase a counter
+def count(name, value=1):
+    if enabled:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+# Function to return the collected values without resetting them (picklable, for worker processes)
+def snapshot():
+    return {"timings": {stage: list(timing) for stage, timing in _timings.items()}, "counters": dict(_counters)}
+
+
+# Function to add a snapshot (e.g. from a worker process) to the collected values
+def merge(other):
+    for stage, (calls, seconds) in other["timings"].items():
+        timing = _timings.setdefault(stage, [0, 0.0])
+        timing[0] += calls
+        timing[1] += seconds
+    for name, value in other["counters"].items():
+        _counters[name] = _counters.get(name, 0) + value
+
+
+# Function to build the per-stage report
+def report():
+    """
+    Toplanan ölçümleri makine tarafından okunabilir bir sözlük olarak döndürür.
+
+    Returns:
+        dict: "enabled", "stages" (aşama -> {"calls", "seconds", "mean_seconds"}, toplam süreye göre
+        sıralı) ve "counters" (sayaç -> değer).
+    """
+    stages = {}
+    for stage, (calls, seconds) in sorted(_timings.items(), key=lambda item: -item[1][1]):
+        stages[stage] = {"calls": calls, "seconds": seconds, "mean_seconds": seconds / calls if calls else None}
+    return {"enabled": enabled, "stages": stages, "counters": dict(sorted(_counters.items()))}
+
+
+# Function to write the report as JSON
+def write_report(file_path):
+    with open(file_path, "w") as file:
+        json.dump(report(), file, indent=2)
@@ -1,22 +1,39 @@
 import tkinter as tk
 from tkinter import filedialog
 from tkinter import messagebox
+import io
 import re
 import os
 import subprocess
+import time
+import numpy as np
+import gps_timer
+import instrumentation
+from bisect import bisect_left
+from datetime import datetime
 from tkinter import ttk
+from rinex_io import open_rinex
 
 
 # Function to convert RINEX to 3.05 format using gfzrnx.exe
-def convert_to_305(file_path):
+# (RINEX 2.10/2.11 dosyaları doğrudan okunabildiği için dönüşüm isteğe bağlıdır)
+def convert_to_305(file_path, force=False):
     file_directory, file_name = os.path.split(file_path)
     base_name, ext = os.path.splitext(file_name)
     converted_file_name = f"{base_name}_3.05{ext}"
     converted_file_path = os.path.join(file_directory, converted_file_name)
-    gfzrnx_command = f'gfzrnx -finp "{file_path}" -fout "{converted_file_path}" -f 3.05'
+
+    # Güncel bir dönüştürülmüş dosya zaten varsa tekrar dönüştürme
+    if (not force and os.path.exists(converted_file_path) and os.path.getsize(converted_file_path) > 0
+            and os.path.getmtime(converted_file_path) >= os.path.getmtime(file_path)):
+        return converted_file_path
+
+    gfzrnx_command = ['gfzrnx', '-finp', file_path, '-fout', converted_file_path, '-f', '3.05']
     
     try:
-        subprocess.run(gfzrnx_command, check=True, shell=True)
+        subprocess.run(gfzrnx_command, check=True)
+    except FileNotFoundError:
+        raise Exception("Conversion failed: gfzrnx was not found on PATH")
     except subprocess.CalledProcessError as e:
         raise Exception(f"Conversion failed: {str(e)}")
     
@@ -39,7 +56,7 @@ def decode_nav_header_data(file_path):
         "leap_seconds": None,
     }
 
-    with open(file_path, 'r') as file:
+    with open_rinex(file_path) as file:
         for line in file:
             label = line[60:].strip()
 
@@ -62,8 +79,13 @@ def decode_nav_header_data(file_path):
                     float(line[30:42].strip()),
                     float(line[42:54].strip())
                 ]
+            elif "ION ALPHA" in label:
+                # RINEX 2: 2X,4D12.4
+                header_data["ion_alpha"] = [float(convert_to_e(line[i:i+12].strip())) for i in range(2, 50, 12)]
+            elif "ION BETA" in label:
+                header_data["ion_beta"] = [float(convert_to_e(line[i:i+12].strip())) for i in range(2, 50, 12)]
             elif "DELTA-UTC: A0,A1,T,W" in label:
-                header_data["delta_utc"] = list(map(float, re.findall(r'[-+]?\d*\.\d+E[-+]?\d+', convert_to_e(line[5:60]))))
+                header_data["delta_utc"] = list(map(float, re.findall(r'[-+]?\d*\.\d+E[-+]?\d+', convert_to_e(line[3:60]))))
             elif "LEAP SECONDS" in label:
                 header_data["leap_seconds"] = int(line[:6].strip())
             elif "END OF HEADER" in label:
@@ -71,9 +93,33 @@ def decode_nav_header_data(file_path):
 
     return header_data
 
+# RINEX 2 navigasyon dosya tipi -> uydu sistemi (N: GPS, G: GLONASS, H: SBAS)
+RINEX2_NAV_SYSTEMS = {'N': 'G', 'G': 'R', 'H': 'S'}
+
+# Function to rewrite RINEX 2 navigation records in the RINEX 3 column layout
+def _nav_v2_lines(file, system_code):
+    record_lines = 8 if system_code == 'G' else 4
+    remaining = 0
+    for line in file:
+        if remaining:
+            # Devam satırları: 3X,4D19.12 -> 4X,4D19.12
+            yield ' ' + line.replace('D', 'E').replace('d', 'E')
+            remaining -= 1
+        elif line.strip():
+            # İlk satır: I2,5I3,F5.1,3D19.12 -> A1,I2.2,1X,I4,5(1X,I2.2),3D19.12
+            year = int(line[3:5])
+            year += 2000 if year < 80 else 1900
+            yield (f"{system_code}{int(line[0:2]):02d} {year:4d} {int(line[6:8]):02d} {int(line[9:11]):02d} "
+                   f"{int(line[12:14]):02d} {int(line[15:17]):02d} {int(float(line[17:22])):02d}"
+                   + line[22:].replace('D', 'E').replace('d', 'E'))
+            remaining = record_lines - 1
+
 # Function to parse NAV RINEX body
 def decode_nav_body_data(file_path):
+    started = time.perf_counter()
     body_data = []
+    gps_records = []
+    gps_rows = []
 
 
     def convert_to_e(line):
@@ -82,16 +128,33 @@ def decode_nav_body_data(file_path):
     def parse_float(value):
         return float(value) if value else None
 
-    with open(file_path, 'r') as file:
+    with open_rinex(file_path) as file:
         header_parsed = False
+        version = 3.0
+        file_type = 'N'
+        # Başlıktaki LEAP SECONDS; yoksa GLONASS (UTC) zamanları kaydın tarihindeki artık saniyeyle çevrilir
+        leap_seconds = None
+        # İleriye bakmak için okunup kayda ait çıkmayan satır (sıkıştırılmış akışlarda seek yok)
+        pending_line = None
         while True:
-            line = file.readline()
+            if pending_line is not None:
+                line, pending_line = pending_line, None
+            else:
+                line = file.readline()
             if not line:
                 break
 
             if not header_parsed:
+                if "RINEX VERSION / TYPE" in line[60:]:
+                    version = float(line[:9])
+                    file_type = line[20:21]
+                if "LEAP SECONDS" in line[60:]:
+                    leap_seconds = int(line[:6])
                 if "END OF HEADER" in line:
                     header_parsed = True
+                    if version < 3:
+                        # RINEX 2 kayıtlarını RINEX 3 sütun düzenine çevirerek aynı ayrıştırıcıyla oku
+                        file = io.StringIO(''.join(_nav_v2_lines(file, RINEX2_NAV_SYSTEMS.get(file_type, 'G'))))
                 continue
 
             if line[0] in ('G', 'R', 'J', 'C', 'S', 'I'):  # Identify satellite data
@@ -99,79 +162,258 @@ def decode_nav_body_data(file_path):
                 observation = {}
 
                 # First line data
-                if identifier == 'G':
+                if identifier == 'G':  # GPS data
+                    # Kaydın 8 satırı toplanır; alanlar dosya sonunda tüm GPS kayıtları için birlikte
+                    # çözülür (_gps_nav_array), kayıt sırası korunur
+                    record_lines = [line] + [file.readline() for _ in range(7)]
+                    record = ''.join(record_lines)
+                    if len(record) != 8 * 81 or record.count('\n') != 8:
+                        # Satırları 80 sütun olmayan kayıtlar 80 sütuna tamamlanır
+                        record = ''.join(record_line.rstrip('\r\n')[:80].ljust(80) + '\n'
+                                         for record_line in record_lines)
+                    gps_records.append(record.encode('latin-1'))
+                    gps_rows.append(len(body_data))
+                    body_data.append(None)
+                    continue
+
+                if identifier == 'R':  # GLONASS data (konum/hız/ivme km, km/s, km/s^2)
                     observation["prn"] = line[0:4].strip()
                     observation["epoch"] = line[4:23].strip()
-                
-                if identifier == 'G':  # GPS data
-                    observation["a0"] = parse_float(convert_to_e(line[23:42].strip()))
-                    observation["a1"] = parse_float(convert_to_e(line[42:61].strip()))
-                    observation["a2"] = parse_float(convert_to_e(line[61:80].strip()))
+                    observation["clock_bias"] = parse_float(convert_to_e(line[23:42].strip()))  # -TauN
+                    observation["GammaN"] = parse_float(convert_to_e(line[42:61].strip()))
+                    observation["msg_frame_time"] = parse_float(convert_to_e(line[61:80].strip()))
+
+                    # Referans zamanı tb (UTC) -> GPS haftası ve saniyesi
+                    year, month, day, hour, minute, second = (int(float(value)) for value in observation["epoch"].split())
+                    days = (datetime(year, month, day) - datetime(1980, 1, 6)).days
+                    record_leap_seconds = leap_seconds
+                    if record_leap_seconds is None:
+                        record_leap_seconds = int(gps_timer.leap_seconds(
+                            gps_timer.gps_time_ns(year, month, day, hour, minute, second)))
+                    observation["GPS_week"] = float(days // 7)
+                    observation["toe"] = float((days % 7) * 86400 + hour * 3600 + minute * 60 + second
+                                               + record_leap_seconds)
 
-                    # Continue reading the following lines
                     line = file.readline()
-                    observation["IODC"] = parse_float(convert_to_e(line[4:23].strip()))
-                    observation["crs"] = parse_float(convert_to_e(line[23:42].strip()))
-                    observation["dn"] = parse_float(convert_to_e(line[42:61].strip()))
-                    observation["M0"] = parse_float(convert_to_e(line[61:80].strip()))
-
+                    observation["X"] = parse_float(convert_to_e(line[4:23].strip()))
+                    observation["X_dot"] = parse_float(convert_to_e(line[23:42].strip()))
+                    observation["X_acc"] = parse_float(convert_to_e(line[42:61].strip()))
+                    observation["SV_health"] = parse_float(convert_to_e(line[61:80].strip()))
 
                     line = file.readline()
-                    observation["cuc"] = parse_float(convert_to_e(line[4:23].strip()))
-                    observation["e"] = parse_float(convert_to_e(line[23:42].strip()))
-                    observation["cus"] = parse_float(convert_to_e(line[42:61].strip()))
-                    observation["sqrtA"] = parse_float(convert_to_e(line[61:80].strip()))
-
+                    observation["Y"] = parse_float(convert_to_e(line[4:23].strip()))
+                    observation["Y_dot"] = parse_float(convert_to_e(line[23:42].strip()))
+                    observation["Y_acc"] = parse_float(convert_to_e(line[42:61].strip()))
+                    observation["freq_num"] = parse_float(convert_to_e(line[61:80].strip()))
 
                     line = file.readline()
-                    observation["toe"] = parse_float(convert_to_e(line[4:23].strip()))
-                    observation["cic"] = parse_float(convert_to_e(line[23:42].strip()))
-                    observation["OMEGA0"] = parse_float(convert_to_e(line[42:61].strip()))
-                    observation["cis"] = parse_float(convert_to_e(line[61:80].strip()))
-
-
-                    line = file.readline()
-                    observation["i0"] = parse_float(convert_to_e(line[4:23].strip()))
-                    observation["crc"] = parse_float(convert_to_e(line[23:42].strip()))
-                    observation["omega"] = parse_float(convert_to_e(line[42:61].strip()))
-                    observation["OMEGA"] = parse_float(convert_to_e(line[61:80].strip()))
-
+                    observation["Z"] = parse_float(convert_to_e(line[4:23].strip()))
+                    observation["Z_dot"] = parse_float(convert_to_e(line[23:42].strip()))
+                    observation["Z_acc"] = parse_float(convert_to_e(line[42:61].strip()))
+                    observation["age"] = parse_float(convert_to_e(line[61:80].strip()))
 
+                    # RINEX 3.05: isteğe bağlı 5. satır (durum bayrakları, L1/L2 gecikme farkı, URAI, sağlık bayrakları)
                     line = file.readline()
-                    observation["idot"] = parse_float(convert_to_e(line[4:23].strip()))
-                    observation["L2_code"] = parse_float(line[23:42].strip())
-                    observation["GPS_week"] = parse_float(line[42:61].strip())
-                    observation["L2_P_flag"] = parse_float(line[61:80].strip())
-
+                    if line.startswith('    ') and line.strip():
+                        observation["status_flags"] = parse_float(convert_to_e(line[4:23].strip()))
+                        observation["L1L2_delay"] = parse_float(convert_to_e(line[23:42].strip()))
+                        observation["URAI"] = parse_float(convert_to_e(line[42:61].strip()))
+                        observation["health_flags"] = parse_float(convert_to_e(line[61:80].strip()))
+                    else:
+                        pending_line = line
 
-                    line = file.readline()
-                    observation["SV_accuracy"] = parse_float(convert_to_e(line[4:23].strip()))
-                    observation["SV_health"] = parse_float(line[23:42].strip())
-                    observation["TGD"] = parse_float(convert_to_e(line[42:61].strip()))
-                    observation["IODC_clock"] = parse_float(line[61:80].strip())
+                # Additional code for BDS, Galileo, etc.
 
+                body_data.append(observation)
 
-                    line = file.readline()
-                    observation["trans_time"] = parse_float(convert_to_e(line[4:23].strip()))
-
-
-                    fit_interval = line[23:42].strip()
-                    observation["fit_interval"] = parse_float(convert_to_e(fit_interval)) if fit_interval else None
-
-
-                    spare1 = line[42:61].strip()
-                    observation["spare1"] = parse_float(convert_to_e(spare1)) if spare1 else None
-
-
-                    spare2 = line[61:80].strip()
-                    observation["spare2"] = parse_float(convert_to_e(spare2)) if spare2 else None
-
+    if gps_records:
+        for row, record in zip(gps_rows, nav_array_to_records(_gps_nav_array(gps_records))):
+            body_data[row] = record
 
-                # Additional code for GLONASS, BDS, etc.
+    instrumentation.add_time("nav.decode_body", time.perf_counter() - started)
+    instrumentation.count("nav.records_parsed", len(body_data))
+    return body_data
 
-                body_data.append(observation)
 
-    return body_data
+# GPS efemeris kaydındaki 19 karakterlik alanlar, dosyadaki sırayla (8 satır, 31 alan)
+GPS_NAV_FIELDS = ("a0", "a1", "a2",
+                  "IODC", "crs", "dn", "M0",
+                  "cuc", "e", "cus", "sqrtA",
+                  "toe", "cic", "OMEGA0", "cis",
+                  "i0", "crc", "omega", "OMEGA",
+                  "idot", "L2_code", "GPS_week", "L2_P_flag",
+                  "SV_accuracy", "SV_health", "TGD", "IODC_clock",
+                  "trans_time", "fit_interval", "spare1", "spare2")
+
+# decode_nav_body_array çıktısının yapılandırılmış (structured) dizi tipi
+GPS_NAV_DTYPE = np.dtype([("prn", "U3"), ("epoch", "U19")] + [(field, np.float64) for field in GPS_NAV_FIELDS])
+
+# Function to decode GPS records (8 lines x 81 bytes each, 80 columns + newline) into a GPS_NAV_DTYPE array
+def _gps_nav_array(records):
+    num_records = len(records)
+    # D/d üsleri tampon başına bir kez E'ye çevrilir
+    record_chars = np.frombuffer(b''.join(records).replace(b'D', b'E').replace(b'd', b'E'),
+                                 dtype='S1').reshape(num_records, 8, 81)
+
+    # İlk satırın 23-80, devam satırlarının 4-80 sütunları: 3 + 7 x 4 = 31 alan x 19 karakter
+    field_chars = np.concatenate([record_chars[:, 0, 23:80],
+                                  record_chars[:, 1:, 4:80].reshape(num_records, -1)], axis=1)
+    field_chars = field_chars.reshape(num_records, len(GPS_NAV_FIELDS), 19)
+
+    # Boş alanlar NaN olur
+    blank = (field_chars.view(np.uint8) == ord(' ')).all(axis=2)
+    fields = np.ascontiguousarray(field_chars).view('S19')[..., 0].copy()
+    fields[blank] = b'nan'
+    values = fields.astype(np.float64)
+
+    nav_array = np.empty(num_records, dtype=GPS_NAV_DTYPE)
+    nav_array["prn"] = np.char.strip(record_chars[:, 0, 0:4].copy().view('S4')[:, 0].astype('U4'))
+    nav_array["epoch"] = np.char.strip(record_chars[:, 0, 4:23].copy().view('S19')[:, 0].astype('U19'))
+    for column, field in enumerate(GPS_NAV_FIELDS):
+        nav_array[field] = values[:, column]
+    _resolve_broadcast_weeks(nav_array)
+    return nav_array
+
+# Function to turn the GPS week of each record into the full (rollover-free) week nearest its epoch (toc)
+def _resolve_broadcast_weeks(nav_array):
+    # Bazı alıcı/dönüştürücüler hafta alanını yayındaki gibi 10 bit (1024'e göre) yazar; kaydın
+    # epoch'unun (toc, GPS zamanı) haftası referans alınarak tam hafta numarasına çevrilir
+    has_week = ~np.isnan(nav_array["GPS_week"])
+    if not has_week.any():
+        return
+    epoch_fields = np.array([[float(value) for value in epoch.split()] for epoch in nav_array["epoch"][has_week]])
+    year, month, day, hour, minute = epoch_fields[:, :5].T.astype(np.int64)
+    toc_week, _ = gps_timer.gps_week_sow(gps_timer.gps_time_ns_array(year, month, day, hour, minute, epoch_fields[:, 5]))
+    nav_array["GPS_week"][has_week] = gps_timer.full_gps_week(nav_array["GPS_week"][has_week], toc_week)
+
+# Function to parse all GPS records of a NAV RINEX body in one pass into a structured array
+def decode_nav_body_array(file_path):
+    """
+    decode_nav_body_data'nın toplu (bulk) sürümü: gövde tek seferde okunur, D üsleri tampon
+    başına bir kez E'ye çevrilir ve 19 karakterlik alanlar tek bir dizi dönüşümüyle çözülür.
+
+    Returns:
+        numpy.ndarray: GPS_NAV_DTYPE tipinde, GPS kaydı başına bir satır (boş alanlar NaN).
+    """
+    started = time.perf_counter()
+    with open_rinex(file_path, binary=True) as file:
+        data = file.read()
+
+    # Başlık: sürüm ve dosya tipi; gövde END OF HEADER satırından sonra başlar
+    version = 3.0
+    file_type = 'N'
+    header_end = data.find(b"END OF HEADER")
+    body_start = data.find(b'\n', header_end) + 1 if header_end >= 0 else 0
+    for line in data[:body_start].decode('latin-1').splitlines():
+        if "RINEX VERSION / TYPE" in line[60:]:
+            version = float(line[:9])
+            file_type = line[20:21]
+    body = data[body_start:]
+    if version < 3:
+        body = ''.join(_nav_v2_lines(io.StringIO(body.decode('latin-1')),
+                                     RINEX2_NAV_SYSTEMS.get(file_type, 'G'))).encode('latin-1')
+
+    # Kayıt başlangıçları: 'G' ile başlayan satırlar; her kayıt 8 satır. Satırları 80 karakter
+    # olan kayıtlar (3.x dosyalarında olağan durum) doğrudan alınır, diğerleri 80 sütuna tamamlanır
+    body = b'\n' + body.replace(b'\r', b'')
+    records = []
+    for match in re.finditer(rb'\nG', body):
+        start = match.start() + 1
+        record = body[start:start + 8 * 81]
+        if len(record) != 8 * 81 or record.count(b'\n') != 8 or record[-1] != 10:
+            record = b''.join([line[:80].ljust(80) + b'\n'
+                               for line in (body[start:start + 16 * 81].split(b'\n', 8)[:8] + [b''] * 8)[:8]])
+        records.append(record)
+    nav_array = _gps_nav_array(records)
+
+    instrumentation.add_time("nav.decode_array", time.perf_counter() - started)
+    instrumentation.count("nav.records_parsed", len(nav_array))
+    return nav_array
+
+# Function to convert a decode_nav_body_array result to decode_nav_body_data-style dicts
+def nav_array_to_records(nav_array):
+    keys = ("prn", "epoch") + GPS_NAV_FIELDS
+    has_blank = np.zeros(len(nav_array), dtype=bool)
+    for field in GPS_NAV_FIELDS:
+        has_blank |= np.isnan(nav_array[field])
+
+    records = []
+    for row, blank in zip(nav_array.tolist(), has_blank.tolist()):
+        record = dict(zip(keys, row))
+        if blank:
+            for field in GPS_NAV_FIELDS:
+                value = record[field]
+                if value != value:
+                    record[field] = None
+        records.append(record)
+    return records
+
+# Fit interval alanı boş/0 ise kullanılacak varsayılan süre (saat)
+DEFAULT_FIT_INTERVAL_HOURS = 4.0
+
+# GLONASS efemerisleri 30 dakikada bir yayınlanır; tb'nin +/-15 dakikası içinde kullanılır
+GLONASS_FIT_INTERVAL_HOURS = 0.5
+
+# Function to build a PRN-keyed ephemeris index with toe-sorted arrays for bisect lookup
+def build_ephemeris_index(nav_body_data):
+    ephemeris_index = {}
+    for record in nav_body_data:
+        if not record.get("prn") or record.get("toe") is None:
+            continue
+        # toe'yu hafta numarasıyla birlikte sürekli GPS saniyesine çevir
+        toe = (record.get("GPS_week") or 0) * 604800 + record["toe"]
+        ephemeris_index.setdefault(record["prn"], []).append((toe, record))
+
+    for prn, entries in ephemeris_index.items():
+        entries.sort(key=lambda entry: entry[0])
+        half_fits = []
+        for _, record in entries:
+            if record["prn"][0] == 'R':
+                fit_interval = GLONASS_FIT_INTERVAL_HOURS
+            else:
+                fit_interval = record.get("fit_interval") or DEFAULT_FIT_INTERVAL_HOURS
+            half_fits.append(fit_interval * 3600 / 2)
+        ephemeris_index[prn] = {
+            "toe": [toe for toe, _ in entries],
+            "records": [record for _, record in entries],
+            "half_fit": half_fits,
+            "max_half_fit": max(half_fits)
+        }
+
+    return ephemeris_index
+
+# Function to select the best ephemeris of a PRN for a GPS time (week + seconds of week).
+# Returns the healthy record with the closest toe whose fit interval covers the time, or None.
+def select_ephemeris(ephemeris_index, prn, gps_week, gps_sow):
+    entry = ephemeris_index.get(prn)
+    if entry is None:
+        return None
+
+    t = gps_week * 604800 + gps_sow
+    toes = entry["toe"]
+    records = entry["records"]
+    lower = bisect_left(toes, t) - 1
+    upper = lower + 1
+
+    # En yakın toe'dan başlayarak dışa doğru tara
+    while lower >= 0 or upper < len(toes):
+        if upper >= len(toes) or (lower >= 0 and t - toes[lower] <= toes[upper] - t):
+            candidate = lower
+            lower -= 1
+        else:
+            candidate = upper
+            upper += 1
+
+        distance = abs(t - toes[candidate])
+        if distance > entry["max_half_fit"]:
+            break
+        record = records[candidate]
+        if record.get("SV_health"):
+            continue
+        if distance <= entry["half_fit"][candidate]:
+            return record
+
+    return None
 
 
 # Function to format values for output
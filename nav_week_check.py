@@ -0,0 +1,105 @@
+import argparse
+import os
+import sys
+import tempfile
+
+import gps_timer
+import nav_reader
+
+# Kontrolde kullanılan örnek navigasyon dosyası (RINEX 3.05, tam GPS haftası yazılı)
+CHECK_NAV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Rinex Files", "base123i.24p")
+
+# (10 bitlik hafta, referans hafta, beklenen tam hafta) - rollover sınırının iki yanı
+WEEK_CASES = [
+    (1023, 1023, 1023),
+    (0, 1024, 1024),
+    (1023, 1024, 1023),
+    (0, 2047, 2048),
+    (264, 2312, 2312),
+]
+
+
+# Function to rewrite the GPS week field of every GPS record as the 10-bit broadcast week
+def _write_rollover_copy(file_path, target_path):
+    week_index = nav_reader.GPS_NAV_FIELDS.index("GPS_week") - 3
+    week_line = week_index // 4 + 1
+    week_column = 4 + (week_index % 4) * 19
+    with open(file_path, "r", encoding="latin-1") as file:
+        lines = file.readlines()
+
+    in_body = False
+    record_line = None
+    for line_number, line in enumerate(lines):
+        if not in_body:
+            in_body = "END OF HEADER" in line
+            continue
+        if line.startswith('G'):
+            record_line = 0
+        elif record_line is not None:
+            record_line += 1
+        if record_line == week_line:
+            week = int(float(line[week_column:week_column + 19].replace('D', 'E')))
+            lines[line_number] = (line[:week_column] + f"{float(week % gps_timer.WEEK_ROLLOVER):19.12E}"
+                                  + line[week_column + 19:])
+            record_line = None
+
+    with open(target_path, "w", encoding="latin-1", newline='') as file:
+        file.writelines(lines)
+
+
+# Function to run the week rollover checks and return the failures
+def run_checks(nav_file=CHECK_NAV_FILE):
+    """
+    full_gps_week'i rollover sınırında dener; ardından örnek dosyanın GPS hafta alanlarını 10 bit
+    olarak yazıp decode_nav_body_data / decode_nav_body_array çıktısının asıl dosyadaki tam
+    haftalarla aynı olduğunu ve select_ephemeris'in kayıtları bulduğunu kontrol eder.
+
+    Returns:
+        list: Başarısız kontrollerin açıklamaları (boşsa tüm kontroller geçti).
+    """
+    failures = []
+    for week, reference_week, expected in WEEK_CASES:
+        resolved = int(gps_timer.full_gps_week(week, reference_week))
+        if resolved != expected:
+            failures.append(f"full_gps_week({week}, {reference_week}) = {resolved}, expected {expected}")
+
+    expected_records = [record for record in nav_reader.decode_nav_body_data(nav_file) if record["prn"][0] == 'G']
+    with tempfile.TemporaryDirectory() as directory:
+        rollover_file = os.path.join(directory, os.path.basename(nav_file))
+        _write_rollover_copy(nav_file, rollover_file)
+        records = [record for record in nav_reader.decode_nav_body_data(rollover_file) if record["prn"][0] == 'G']
+        nav_array = nav_reader.decode_nav_body_array(rollover_file)
+
+    weeks = [record["GPS_week"] for record in expected_records]
+    if any(week < gps_timer.WEEK_ROLLOVER for week in weeks):
+        failures.append(f"{os.path.basename(nav_file)}: weeks before the first rollover cannot be checked")
+    if [record["GPS_week"] for record in records] != weeks:
+        failures.append("decode_nav_body_data: 10-bit weeks not resolved to the full GPS week")
+    if nav_array["GPS_week"].tolist() != weeks:
+        failures.append("decode_nav_body_array: 10-bit weeks not resolved to the full GPS week")
+
+    ephemeris_index = nav_reader.build_ephemeris_index(records)
+    for record in expected_records:
+        if record.get("SV_health"):
+            continue
+        # Gözlem tarafı tam haftayı verir
+        selected = nav_reader.select_ephemeris(ephemeris_index, record["prn"], int(record["GPS_week"]), record["toe"])
+        if selected is None:
+            failures.append(f"select_ephemeris: no record for {record['prn']} at week {record['GPS_week']:.0f}")
+            break
+
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that 10-bit broadcast GPS weeks in navigation files "
+                                                 "are resolved to full GPS weeks")
+    parser.add_argument("--nav-file", default=CHECK_NAV_FILE, help="RINEX navigation file with GPS records")
+    args = parser.parse_args()
+
+    failures = run_checks(args.nav_file)
+    for failure in failures:
+        print("HATA:", failure)
+    if not failures:
+        print(f"Tüm kontroller geçti ({len(WEEK_CASES)} hafta, {os.path.basename(args.nav_file)})")
+    sys.exit(1 if failures else 0)
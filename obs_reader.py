@@ -1,26 +1,78 @@
+import hashlib
+import io
+import json
+import mmap
+import multiprocessing
 import subprocess
 import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import numpy as np
+import gps_timer
+import instrumentation
+from rinex_io import GZIP_MAGIC, LZW_MAGIC, open_rinex
 
 # Function to convert RINEX to 3.05 format using gfzrnx.exe
-def convert_to_305(file_path):
+# (RINEX 2.10/2.11 dosyaları doğrudan okunabildiği için dönüşüm isteğe bağlıdır)
+def convert_to_305(file_path, force=False):
     file_directory, file_name = os.path.split(file_path)
     base_name, ext = os.path.splitext(file_name)
     converted_file_name = f"{base_name}_3.05{ext}"
     converted_file_path = os.path.join(file_directory, converted_file_name)
-    gfzrnx_command = f'gfzrnx -finp "{file_path}" -fout "{converted_file_path}" -f 3.05'
+
+    # Güncel bir dönüştürülmüş dosya zaten varsa tekrar dönüştürme
+    if (not force and os.path.exists(converted_file_path) and os.path.getsize(converted_file_path) > 0
+            and os.path.getmtime(converted_file_path) >= os.path.getmtime(file_path)):
+        return converted_file_path
+
+    gfzrnx_command = ['gfzrnx', '-finp', file_path, '-fout', converted_file_path, '-f', '3.05']
     
     try:
-        subprocess.run(gfzrnx_command, check=True, shell=True)
+        subprocess.run(gfzrnx_command, check=True)
+    except FileNotFoundError:
+        raise Exception("Conversion failed: gfzrnx was not found on PATH")
     except subprocess.CalledProcessError as e:
         raise Exception(f"Conversion failed: {str(e)}")
     
     return converted_file_path
 
+# RINEX 2 dosyalarında gözlem kodları eşlenen uydu sistemleri
+RINEX2_SYSTEMS = ('G', 'R', 'E', 'S')
+
+# RINEX 2 -> RINEX 3 gözlem kodu eşlemesinde varsayılan izleme (attribute) karakterleri
+RINEX2_ATTRIBUTES = {
+    'G': {'1': 'C', '2': 'W', '5': 'X'},
+    'R': {'1': 'C', '2': 'P'},
+    'S': {'1': 'C', '5': 'X'}
+}
+
+# Function to map a RINEX 2 observation code (e.g. 'P2') to its RINEX 3 code (e.g. 'C2W')
+def rinex2_obs_code(system_code, obs_type):
+    obs_kind, band = obs_type[0], obs_type[1:2]
+    if obs_kind == 'P':
+        # P-kodu: GPS'te W, GLONASS'ta P izlemesi
+        return f"C{band}{'P' if system_code == 'R' else 'W'}"
+    if obs_kind == 'C' and band == '2':
+        # L2 C/A kodu: GPS'te L2C (X), GLONASS'ta C/A (C)
+        return f"C2{'C' if system_code == 'R' else 'X'}"
+    if obs_kind == 'C':
+        return f"C{band}{'C' if band == '1' and system_code != 'E' else 'X'}"
+    attribute = RINEX2_ATTRIBUTES.get(system_code, {}).get(band, 'X')
+    return f"{obs_kind}{band}{attribute}"
+
 # Global sözlük: RINEX verilerini saklamak için
 rinex_data_store = {}
 
 # Function to decode OBS RINEX header
 def decode_obs_header_data(file_path):
+    # file_path bir yol ya da dosya nesnesi olabilir; .gz/.Z ve Hatanaka (CRINEX) okunurken açılır
+    with open_rinex(file_path) as file:
+        return _read_obs_header(file)
+
+# Function to read the OBS RINEX header from an open file, stopping after END OF HEADER
+def _read_obs_header(file):
     obs_header_data = {
         "rinex_version": None,
         "file_type": None,
@@ -61,362 +113,1263 @@ def decode_obs_header_data(file_path):
         "glonass_slot_frq": []
     }
 
-    with open(file_path, 'r') as file:
-        for line in file:
-            label = line[60:].strip()
-            if "RINEX VERSION / TYPE" in label:
-                obs_header_data["rinex_version"] = float(line[0:20].strip())
-                obs_header_data["file_type"] = line[20:40]
-                obs_header_data["satellite_system"] = line[40:60].strip()
-            elif "MARKER NAME" in label:
-                obs_header_data["marker_name"] = line[0:60].strip()
-            elif "MARKER NUMBER" in label:
-                obs_header_data["marker_number"] = line[0:20].strip()
-            elif "MARKER TYPE" in label:
-                obs_header_data["marker_type"] = line[0:60].strip()
-            elif "OBSERVER / AGENCY" in label:
-                obs_header_data["observer"] = line[0:20]
-                obs_header_data["agency"] = line[20:60]
-            elif "REC # / TYPE / VERS" in label:
-                obs_header_data["rec_num"] = line[0:20].strip()
-                obs_header_data["rec_type"] = line[20:40]
-                obs_header_data["rec_version"] = line[40:60]
-            elif "ANT # / TYPE" in label:
-                obs_header_data["antenna_num_type"] = [line[0:20].strip(), line[20:40].strip()]
-            elif "APPROX POSITION XYZ" in label:
-                obs_header_data["approx_position_xyz"] = [float(line[0:14].strip()), float(line[14:28].strip()), float(line[28:42].strip())]
-            elif "ANTENNA: DELTA H/E/N" in label:
-                obs_header_data["antenna_delta_hen"] = [float(line[0:14].strip()), float(line[14:28].strip()), float(line[28:42].strip())]
-            elif "ANTENNA: DELTA X/Y/Z" in label:
-                obs_header_data["antenna_delta_xyz"] = [float(line[0:14].strip()), float(line[14:28].strip()), float(line[28:42].strip())]
-            elif "ANTENNA: PHASECENTER" in label:
-                obs_header_data["antenna_phasecenter"] = [line[0:1], line[3:6], float(line[7:20].strip()), float(line[20:34].strip()), float(line[34:60].strip())]
-            elif "ANTENNA: B.SIGHT XYZ" in label:
-                obs_header_data["antenna_bsight_xyz"] = [float(line[0:14].strip()), float(line[14:28].strip()), float(line[28:42].strip())]
-            elif "ANTENNA: ZERODIR AZI" in label:
-                obs_header_data["antenna_zerodir_azi"] = float(line[0:14].strip())
-            elif "ANTENNA: ZERODIR XYZ" in label:
-                obs_header_data["antenna_zerodir_xyz"] = [float(line[0:14].strip()), float(line[14:28].strip()), float(line[28:42].strip())]
-            elif "CENTER OF MASS: XYZ" in label:
-                obs_header_data["center_of_mass_xyz"] = [float(line[0:14]), float(line[14:28]), float(line[28:42])]
-            elif "SYS / # / OBS TYPES" in label:
-                sys = line[0:1].strip()
-                num_obs = int(line[2:6].strip())
-                obs_types = [line[i:i+4].strip() for i in range(7, 60, 4)]  # 1X, A3 formatında gözlem kodlarını almak için
-
-                # Use continuation lines if the observation types span multiple lines
-                while len(obs_types) < num_obs:
-                    line = next(file)
-                    obs_types.extend([line[i:i+4].strip() for i in range(6, 60, 4)])
+    for line in file:
+        label = line[60:].strip()
+        if "END OF HEADER" in label:
+            break
+        elif "RINEX VERSION / TYPE" in label:
+            obs_header_data["rinex_version"] = float(line[0:20].strip())
+            obs_header_data["file_type"] = line[20:40]
+            obs_header_data["satellite_system"] = line[40:60].strip()
+        elif "MARKER NAME" in label:
+            obs_header_data["marker_name"] = line[0:60].strip()
+        elif "MARKER NUMBER" in label:
+            obs_header_data["marker_number"] = line[0:20].strip()
+        elif "MARKER TYPE" in label:
+            obs_header_data["marker_type"] = line[0:60].strip()
+        elif "OBSERVER / AGENCY" in label:
+            obs_header_data["observer"] = line[0:20]
+            obs_header_data["agency"] = line[20:60]
+        elif "REC # / TYPE / VERS" in label:
+            obs_header_data["rec_num"] = line[0:20].strip()
+            obs_header_data["rec_type"] = line[20:40]
+            obs_header_data["rec_version"] = line[40:60]
+        elif "ANT # / TYPE" in label:
+            obs_header_data["antenna_num_type"] = [line[0:20].strip(), line[20:40].strip()]
+        elif "APPROX POSITION XYZ" in label:
+            obs_header_data["approx_position_xyz"] = [float(line[0:14].strip()), float(line[14:28].strip()), float(line[28:42].strip())]
+        elif "ANTENNA: DELTA H/E/N" in label:
+            obs_header_data["antenna_delta_hen"] = [float(line[0:14].strip()), float(line[14:28].strip()), float(line[28:42].strip())]
+        elif "ANTENNA: DELTA X/Y/Z" in label:
+            obs_header_data["antenna_delta_xyz"] = [float(line[0:14].strip()), float(line[14:28].strip()), float(line[28:42].strip())]
+        elif "ANTENNA: PHASECENTER" in label:
+            obs_header_data["antenna_phasecenter"] = [line[0:1], line[3:6], float(line[7:20].strip()), float(line[20:34].strip()), float(line[34:60].strip())]
+        elif "ANTENNA: B.SIGHT XYZ" in label:
+            obs_header_data["antenna_bsight_xyz"] = [float(line[0:14].strip()), float(line[14:28].strip()), float(line[28:42].strip())]
+        elif "ANTENNA: ZERODIR AZI" in label:
+            obs_header_data["antenna_zerodir_azi"] = float(line[0:14].strip())
+        elif "ANTENNA: ZERODIR XYZ" in label:
+            obs_header_data["antenna_zerodir_xyz"] = [float(line[0:14].strip()), float(line[14:28].strip()), float(line[28:42].strip())]
+        elif "CENTER OF MASS: XYZ" in label:
+            obs_header_data["center_of_mass_xyz"] = [float(line[0:14]), float(line[14:28]), float(line[28:42])]
+        elif "SYS / # / OBS TYPES" in label:
+            sys = line[0:1].strip()
+            num_obs = int(line[2:6].strip())
+            obs_types = [line[i:i+4].strip() for i in range(7, 60, 4)]  # 1X, A3 formatında gözlem kodlarını almak için
+
+            # Use continuation lines if the observation types span multiple lines
+            while len(obs_types) < num_obs:
+                line = next(file)
+                obs_types.extend([line[i:i+4].strip() for i in range(6, 60, 4)])
+
+            obs_header_data["sys_obs_types"][sys] = {
+                "num_obs": num_obs,
+                "obs_types": obs_types
+            }
+        elif "# / TYPES OF OBSERV" in label:
+            # RINEX 2: tüm sistemler için ortak, 2 karakterlik gözlem kodları (I6, 9(4X,A2))
+            num_obs = int(line[0:6].strip())
+            obs_types = [line[i:i+6].strip() for i in range(6, 60, 6) if line[i:i+6].strip()]
 
+            # Use continuation lines if the observation types span multiple lines
+            while len(obs_types) < num_obs:
+                line = next(file)
+                obs_types.extend([line[i:i+6].strip() for i in range(6, 60, 6) if line[i:i+6].strip()])
+
+            # Kodları her sistem için RINEX 3 karşılıklarına çevir (sıra dosyadaki sırayla aynı)
+            for sys in RINEX2_SYSTEMS:
                 obs_header_data["sys_obs_types"][sys] = {
                     "num_obs": num_obs,
-                    "obs_types": obs_types
-                }
-            elif "TIME OF FIRST OBS" in label:
-                year = int(line[0:6].strip())
-                month = int(line[6:12].strip())
-                day = int(line[12:18].strip())
-                hour = int(line[18:24].strip())
-                minute = int(line[24:30].strip())
-                second = float(line[30:43].strip())
-                time_system = line[48:51].strip()
-                obs_header_data["time_of_first_obs"] = {
-                    "year": year,
-                    "month": month,
-                    "day": day,
-                    "hour": hour,
-                    "minute": minute,
-                    "second": second,
-                    "time_system": time_system
-                }                
-            elif "TIME OF LAST OBS" in label:
-                year = int(line[0:6].strip())
-                month = int(line[6:12].strip())
-                day = int(line[12:18].strip())
-                hour = int(line[18:24].strip())
-                minute = int(line[24:30].strip())
-                second = float(line[30:43].strip())
-                time_system = line[48:51].strip()
-                obs_header_data["time_of_last_obs"] = {
-                    "year": year,
-                    "month": month,
-                    "day": day,
-                    "hour": hour,
-                    "minute": minute,
-                    "second": second,
-                    "time_system": time_system
+                    "obs_types": [rinex2_obs_code(sys, obs_type) for obs_type in obs_types]
                 }
-            elif "INTERVAL" in label:
-                obs_header_data["interval"] = float(line[0:10].strip())
-            elif "RCV CLOCK OFFS APPL" in label:
-                obs_header_data["rec_clock_offs_appl"] = int((line[0:6]).strip())
-            elif "SYS / DCBS APPLIED" in label:
-                system = line[0:1].strip()
-                program = line[1:19].strip()
-                source = line[20:60].strip()
-                obs_header_data["sys_dcbs_applied"].append({
-                    "system": system,
-                    "program": program,
-                    "source": source
-                })
-            elif "SYS / PCVS APPLIED" in label:
-                system = line[0:1].strip()
-                program = line[1:19].strip()
-                source = line[20:60].strip()
-                obs_header_data["sys_pcvs_applied"].append({
-                    "system": system,
-                    "program": program,
-                    "source": source
-                })
-            elif "SYS / SCALE FACTOR" in label:
-                system = line[0:1].strip()
-                factor = int(line[2:6].strip())
-                num_obs_types = int(line[8:10].strip() or 0)
-                obs_types = line[11:60].split()
-
-                # Use continuation lines if the observation types span multiple lines
-                if num_obs_types > 12:
-                    while len(obs_types) < num_obs_types:
-                        line = next(file)
-                        obs_types.extend(line[11:60].split())
-
-                obs_header_data["sys_scale_factor"].append({
-                    "system": system,
-                    "factor": factor,
-                    "num_obs_types": num_obs_types,
-                    "obs_types": obs_types
-                })
-            elif "SYS / PHASE SHIFT" in label:
-                system = line[0:1].strip()
-                obs_code = line[2:5].strip()
-                try:
-                    correction = float(line[6:14].strip())
-                    correction = f"{correction:8.5f}"  # F8.5 formatında correction'ı ayarla
-                except ValueError:
-                    correction = None  # Bu durumda boş veri varsa None olarak ayarla
-                num_satellites = int(line[15:18].strip() or 0)
-                satellites = line[19:60].split()
-
-                # Use continuation lines if the number of satellites span multiple lines
-                while len(satellites) < num_satellites:
+        elif "TIME OF FIRST OBS" in label:
+            year = int(line[0:6].strip())
+            month = int(line[6:12].strip())
+            day = int(line[12:18].strip())
+            hour = int(line[18:24].strip())
+            minute = int(line[24:30].strip())
+            second = float(line[30:43].strip())
+            time_system = line[48:51].strip()
+            obs_header_data["time_of_first_obs"] = {
+                "year": year,
+                "month": month,
+                "day": day,
+                "hour": hour,
+                "minute": minute,
+                "second": second,
+                "time_system": time_system
+            }                
+        elif "TIME OF LAST OBS" in label:
+            year = int(line[0:6].strip())
+            month = int(line[6:12].strip())
+            day = int(line[12:18].strip())
+            hour = int(line[18:24].strip())
+            minute = int(line[24:30].strip())
+            second = float(line[30:43].strip())
+            time_system = line[48:51].strip()
+            obs_header_data["time_of_last_obs"] = {
+                "year": year,
+                "month": month,
+                "day": day,
+                "hour": hour,
+                "minute": minute,
+                "second": second,
+                "time_system": time_system
+            }
+        elif "INTERVAL" in label:
+            obs_header_data["interval"] = float(line[0:10].strip())
+        elif "RCV CLOCK OFFS APPL" in label:
+            obs_header_data["rec_clock_offs_appl"] = int((line[0:6]).strip())
+        elif "SYS / DCBS APPLIED" in label:
+            system = line[0:1].strip()
+            program = line[1:19].strip()
+            source = line[20:60].strip()
+            obs_header_data["sys_dcbs_applied"].append({
+                "system": system,
+                "program": program,
+                "source": source
+            })
+        elif "SYS / PCVS APPLIED" in label:
+            system = line[0:1].strip()
+            program = line[1:19].strip()
+            source = line[20:60].strip()
+            obs_header_data["sys_pcvs_applied"].append({
+                "system": system,
+                "program": program,
+                "source": source
+            })
+        elif "SYS / SCALE FACTOR" in label:
+            system = line[0:1].strip()
+            factor = int(line[2:6].strip())
+            num_obs_types = int(line[8:10].strip() or 0)
+            obs_types = line[11:60].split()
+
+            # Use continuation lines if the observation types span multiple lines
+            if num_obs_types > 12:
+                while len(obs_types) < num_obs_types:
                     line = next(file)
-                    satellites.extend(line[19:60].split())
-
-                obs_header_data["sys_phase_shift"].append({
-                    "system": system,
-                    "obs_code": obs_code,
-                    "correction": correction,
-                    "num_satellites": num_satellites,
-                    "satellites": satellites
-                })
+                    obs_types.extend(line[11:60].split())
+
+            obs_header_data["sys_scale_factor"].append({
+                "system": system,
+                "factor": factor,
+                "num_obs_types": num_obs_types,
+                "obs_types": obs_types
+            })
+        elif "SYS / PHASE SHIFT" in label:
+            system = line[0:1].strip()
+            obs_code = line[2:5].strip()
+            try:
+                correction = float(line[6:14].strip())
+                correction = f"{correction:8.5f}"  # F8.5 formatında correction'ı ayarla
+            except ValueError:
+                correction = None  # Bu durumda boş veri varsa None olarak ayarla
+            num_satellites = int(line[15:18].strip() or 0)
+            satellites = line[19:60].split()
 
-            elif "GLONASS SLOT / FRQ #" in label:
-                num_satellites = int(line[0:3].strip())
-                satellites = []
-                freq_numbers = []
+            # Use continuation lines if the number of satellites span multiple lines
+            while len(satellites) < num_satellites:
+                line = next(file)
+                satellites.extend(line[19:60].split())
 
-                # İlk 8 uydu için
+            obs_header_data["sys_phase_shift"].append({
+                "system": system,
+                "obs_code": obs_code,
+                "correction": correction,
+                "num_satellites": num_satellites,
+                "satellites": satellites
+            })
+
+        elif "GLONASS SLOT / FRQ #" in label:
+            num_satellites = int(line[0:3].strip())
+            satellites = []
+            freq_numbers = []
+
+            # I3,1X,8(A1,I2.2,1X,I2,1X): satır başına en fazla 8 uydu, devam satırları 4X ile başlar
+            while True:
                 for i in range(8):
-                    if i < num_satellites:
-                        # Her bir uydu ve frekans numarasını al
-                        # 4X boşluk, 1 karakter uydu numarası, 2 karakter frekans numarası
-                        satellite = line[4 + i*8:5 + i*8].strip()  # A1
-                        freq_number = line[6 + i*8:8 + i*8].strip()  # I2.2
-                        if satellite and freq_number:
-                            satellites.append(satellite)
-                            try:
-                                freq_numbers.append(int(freq_number))
-                            except ValueError:
-                                freq_numbers.append(None)
-
-                # Daha fazla uydu varsa, devam satırlarını oku
-                while len(satellites) < num_satellites:
+                    satellite = line[4 + i*7:7 + i*7].strip()  # A1,I2.2
+                    freq_number = line[8 + i*7:10 + i*7].strip()  # I2
+                    if len(satellites) < num_satellites and satellite:
+                        satellites.append(satellite)
+                        try:
+                            freq_numbers.append(int(freq_number))
+                        except ValueError:
+                            freq_numbers.append(None)
+                if len(satellites) >= num_satellites:
+                    break
+                line = next(file)
+
+            obs_header_data["glonass_slot_frq"].append({
+                "num_satellites": num_satellites,
+                "satellites": satellites,
+                "freq_numbers": freq_numbers
+            })
+        elif "# OF SATELLITES" in label:
+            num_of_satellites = int(line[0:6].strip())
+            obs_header_data["num_of_satellites"] = num_of_satellites
+        elif "LEAP SECONDS" in label:
+            current_leap_seconds = int(line[0:6].strip())
+            # Gelecek/geçmiş artık saniye, hafta ve gün alanları isteğe bağlıdır
+            future_past_leap_seconds = int(line[6:12]) if line[6:12].strip() else None
+            week_number = int(line[12:18]) if line[12:18].strip() else None
+            day_number = int(line[18:24]) if line[18:24].strip() else None
+            time_system_identifier = line[24:27].strip()
+            obs_header_data["leap_seconds"] = {
+                "current_leap_seconds": current_leap_seconds,
+                "future_past_leap_seconds": future_past_leap_seconds,
+                "week_number": week_number,
+                "day_number": day_number,
+                "time_system_identifier": time_system_identifier
+            }
+        elif "PRN / # OF OBS" in label:
+            prn_obs_data = []
+
+            while True:
+                prn_id = line[3:6].strip()
+                observation_counts = [int(line[6 + i*6:12 + i*6].strip()) for i in range(9) if line[6 + i*6:12 + i*6].strip()]
+
+                # Eğer 9'dan fazla gözlem türü varsa, devam satırlarını oku
+                while len(observation_counts) % 9 == 0 and len(observation_counts) > 0:
                     line = next(file)
-                    for i in range(4):  # Her devam satırı için 4 uydu bilgisi okunur
-                        if len(satellites) < num_satellites:
-                            satellite = line[4 + i*8:5 + i*8].strip()  # A1
-                            freq_number = line[6 + i*8:8 + i*8].strip()  # I2.2
-                            if satellite and freq_number:
-                                satellites.append(satellite)
-                                try:
-                                    freq_numbers.append(int(freq_number))
-                                except ValueError:
-                                    freq_numbers.append(None)
-
-                obs_header_data["glonass_slot_frq"].append({
-                    "num_satellites": num_satellites,
-                    "satellites": satellites,
-                    "freq_numbers": freq_numbers
+                    observation_counts.extend([int(line[6 + i*6:12 + i*6].strip()) for i in range(9) if line[6 + i*6:12 + i*6].strip()])
+
+                prn_obs_data.append({
+                    "prn_id": prn_id,
+                    "observation_counts": observation_counts
                 })
-            elif "# OF SATELLITES" in label:
-                num_of_satellites = int(line[0:6].strip())
-                obs_header_data["num_of_satellites"] = num_of_satellites
-            elif "LEAP SECONDS" in label:
-                current_leap_seconds = int(line[0:6].strip())
-                future_past_leap_seconds = int(line[6:12].strip())
-                week_number = int(line[12:18].strip())
-                day_number = int(line[18:24].strip())
-                time_system_identifier = line[24:27].strip()
-                obs_header_data["leap_seconds"] = {
-                    "current_leap_seconds": current_leap_seconds,
-                    "future_past_leap_seconds": future_past_leap_seconds,
-                    "week_number": week_number,
-                    "day_number": day_number,
-                    "time_system_identifier": time_system_identifier
-                }
-            elif "PRN / # OF OBS" in label:
-                prn_obs_data = []
 
-                while True:
-                    prn_id = line[3:6].strip()
-                    observation_counts = [int(line[6 + i*6:12 + i*6].strip()) for i in range(9) if line[6 + i*6:12 + i*6].strip()]
+                # Bir sonraki satırda PRN / # OF OBS etiketi yoksa döngüyü kır
+                line = next(file)
+                if "PRN / # OF OBS" not in line:
+                    break
 
-                    # Eğer 9'dan fazla gözlem türü varsa, devam satırlarını oku
-                    while len(observation_counts) % 9 == 0 and len(observation_counts) > 0:
-                        line = next(file)
-                        observation_counts.extend([int(line[6 + i*6:12 + i*6].strip()) for i in range(9) if line[6 + i*6:12 + i*6].strip()])
+            obs_header_data["prn_obs"] = prn_obs_data
+            # PRN / # OF OBS bloğundan sonra okunan satır başlığın sonu olabilir
+            if "END OF HEADER" in line[60:]:
+                break
 
-                    prn_obs_data.append({
-                        "prn_id": prn_id,
-                        "observation_counts": observation_counts
-                    })
+    return obs_header_data
 
-                    # Bir sonraki satırda PRN / # OF OBS etiketi yoksa döngüyü kır
-                    line = next(file)
-                    if "PRN / # OF OBS" not in line:
-                        break
+# Tek sistemli dosyalarda TIME OF FIRST OBS zaman sistemi boşsa kullanılan sistem (RINEX); diğerlerinde GPS
+_DEFAULT_TIME_SYSTEMS = {'R': "GLO", 'E': "GAL", 'J': "QZS", 'C': "BDT", 'I': "IRN"}
 
-                obs_header_data["prn_obs"] = prn_obs_data
+# Function to return the time system of the epoch times of a file from its header (gps_timer time system code)
+def obs_time_system(obs_header_data):
+    first_obs = obs_header_data.get("time_of_first_obs") or {}
+    if first_obs.get("time_system"):
+        return first_obs["time_system"]
+    return _DEFAULT_TIME_SYSTEMS.get((obs_header_data.get("satellite_system") or 'G')[0], "GPS")
 
-    return obs_header_data
+# Varsayılan uydu sistemleri: gövdeden sadece bu sistemlerin gözlemleri okunur (GPS only);
+# okuyucuların systems argümanıyla başka sistemler de (ör. ('G', 'R')) seçilebilir
+OBS_SYSTEMS = ('G',)
 
-# Function to decode OBS RINEX data with dynamic observation types for GPS
-def decode_obs_body_data(file_path):
-    obs_header_data = decode_obs_header_data(file_path)
-    obs_body_data = []
+# Function to decode a RINEX 3 epoch record line ('>' line)
+def _decode_epoch_line(line):
+    second_str = line[19:30].strip()
+    epoch = {
+        "year": int(line[2:6]),
+        "month": int(line[7:9]),
+        "day": int(line[10:12]),
+        "hour": int(line[13:15]),
+        "minute": int(line[16:18]),
+        "second": float(second_str),
+        "epoch_flag": int(line[31:32]),
+        "num_satellites": int(line[33:36]),
+        "receiver_clock_offset": None
+    }
+    # Alıcı saat ofseti varsa
+    if len(line) > 40 and line[41:56].strip():
+        epoch["receiver_clock_offset"] = float(line[41:56].strip())
+
+    # Saniyeyi string'den tam sayı nanosaniyeye çevir (float yuvarlaması olmadan); GPS zamanı
+    # toplu okumada tüm epoch'lar için tek çağrıda (gps_timer.gps_time_ns_array) hesaplanır
+    whole, _, fraction = second_str.partition('.')
+    epoch["second_ns"] = int(whole) * 1_000_000_000 + int((fraction + '000000000')[:9])
+    return epoch
 
-    with open(file_path, 'r') as file:
-        header_end = False
-        epoch_recording = False
-        num_satellites_in_epoch = 0
-        satellites_read = 0
+# Function to read epoch records from an open file positioned after the header.
+# Yields (epoch, satellite_lines) where satellite_lines is a list of (prn, obs_line)
+# for the satellites of the requested systems (and PRNs, when prns is given).
+def _read_epoch_records(file, systems=OBS_SYSTEMS, prns=None):
+    for line in file:
+        if not line.startswith('>'):
+            continue
+        if not _has_record_time(line, 3):
+            # Zamanı boş olay kayıtları (flag 2-5) atlanır; build_epoch_index de bunları listelemez
+            for _ in islice(file, int(line[32:35] or 0)):
+                pass
+            continue
+        epoch = _decode_epoch_line(line)
+        satellite_lines = []
 
-        for line in file:
-            if "END OF HEADER" in line:
-                header_end = True
+        # Olay (event) epoch'larında (flag 2-5) takip eden satırlar gözlem değil
+        is_event = 2 <= epoch["epoch_flag"] <= 5
+        for _ in range(epoch["num_satellites"]):
+            line = next(file, None)
+            if line is None:
+                break
+            if is_event:
                 continue
-            if not header_end:
+            prn = line[0:3].strip()
+            if not prn or prn[0] not in systems or (prns is not None and prn not in prns):
                 continue
+            satellite_lines.append((prn, line[3:].rstrip('\n')))
 
-            # Epoch record (starts with '>')
-            if line.startswith('>'):
-                # Yeni bir epoch başlıyor
-                year = int(line[2:6])
-                month = int(line[7:9])
-                day = int(line[10:12])
-                hour = int(line[13:15])
-                minute = int(line[16:18])
-                second = int(float(line[19:30]))
-                epoch_flag = int(line[31:32])
-                num_satellites_in_epoch = int(line[33:36])
-                # Alıcı saat ofseti varsa
-                if len(line) > 40:
-                    receiver_clock_offset = float(line[41:56].strip())
-                else:
-                    receiver_clock_offset = None
-
-                obs_body_data.append({
-                    "epoch": {
-                        "year": year,
-                        "month": month,
-                        "day": day,
-                        "hour": hour,
-                        "minute": minute,
-                        "second": second,
-                        "epoch_flag": epoch_flag,
-                        "num_satellites": num_satellites_in_epoch,
-                        "receiver_clock_offset": receiver_clock_offset
-                    },
-                    "observations": []
-                })
-                epoch_recording = True
-                satellites_read = 0
+        yield epoch, satellite_lines
+
+# Function to decode a RINEX 2 epoch record line and its satellite list continuation lines
+def _decode_epoch_lines_v2(line, file):
+    year = int(line[1:3])
+    second_str = line[15:26].strip()
+    epoch = {
+        "year": year + (2000 if year < 80 else 1900),
+        "month": int(line[4:6]),
+        "day": int(line[7:9]),
+        "hour": int(line[10:12]),
+        "minute": int(line[13:15]),
+        "second": float(second_str),
+        "epoch_flag": int(line[28:29]),
+        "num_satellites": int(line[29:32]),
+        "receiver_clock_offset": None
+    }
+    if line[68:80].strip():
+        epoch["receiver_clock_offset"] = float(line[68:80].strip())
+
+    whole, _, fraction = second_str.partition('.')
+    epoch["second_ns"] = int(whole) * 1_000_000_000 + int((fraction + '000000000')[:9])
+
+    # Uydu listesi: satır başına en fazla 12 uydu (12(A1,I2)), devam satırları 32X ile başlar
+    satellites = []
+    if not 2 <= epoch["epoch_flag"] <= 5:
+        sat_text = line[32:68].rstrip('\n').ljust(36)
+        while len(sat_text) < 3 * epoch["num_satellites"]:
+            line = next(file)
+            sat_text += line[32:68].rstrip('\n').ljust(36)
+        satellites = [sat_text[i:i+3] for i in range(0, 3 * epoch["num_satellites"], 3)]
+    return epoch, satellites
+
+# Function to read RINEX 2 epoch records; yields the same (epoch, satellite_lines) as
+# _read_epoch_records, with each satellite's 80-column observation lines joined into one line
+def _read_epoch_records_v2(file, num_types, default_system, systems=OBS_SYSTEMS, prns=None):
+    lines_per_satellite = max(1, (num_types + 4) // 5)
+    for line in file:
+        # Epoch satırı: 1X,I2.2,4(1X,I2),F11.7,2X,I1,I3
+        if len(line) < 32 or line[0] != ' ' or not line[1:3].strip().isdigit() or line[3] != ' ':
+            continue
+        epoch, satellites = _decode_epoch_lines_v2(line, file)
+        satellite_lines = []
+
+        if 2 <= epoch["epoch_flag"] <= 5:
+            # Olay (event) kayıtları: takip eden satırlar başlık kaydıdır
+            for _ in range(epoch["num_satellites"]):
+                next(file, None)
+            yield epoch, satellite_lines
+            continue
+
+        for satellite in satellites:
+            parts = []
+            for _ in range(lines_per_satellite):
+                line = next(file, None)
+                if line is None:
+                    break
+                parts.append(line.rstrip('\n').ljust(80))
+            system_code = satellite[0] if satellite[0] != ' ' else default_system
+            if system_code not in systems:
+                continue
+            prn = f"{system_code}{int(satellite[1:3]):02d}"
+            if prns is not None and prn not in prns:
                 continue
+            satellite_lines.append((prn, ''.join(parts).rstrip()))
 
-            if epoch_recording:
-                # Her uydu satırını okuyoruz
-                prn = line[0:3].strip()
-                if not prn:
-                    # Boş satırlarda sorun çıkmasın
-                    continue
+        yield epoch, satellite_lines
+
+# Function to pass on only the lines of the epoch records in a GPS time window (ns, inclusive);
+# records before the window are skipped without being decoded and reading stops after the window
+def _window_lines(file, obs_header_data, t_start=None, t_end=None):
+    rinex_version, lines_per_satellite = _record_layout(obs_header_data)
+    time_system = obs_time_system(obs_header_data)
+    remaining = 0
+    record_time = None
+    for line in file:
+        if remaining:
+            remaining -= 1
+            yield line
+            continue
+        count = _record_line_count(line, rinex_version, lines_per_satellite)
+        if count:
+            # Zamanı boş olan olay kayıtları bir önceki kaydın zamanını alır (okuyucu bunları atlar)
+            line_time = _record_time(line, rinex_version, time_system)
+            record_time = line_time if line_time is not None else record_time
+            if t_end is not None and record_time is not None and record_time > t_end:
+                return
+            if t_start is not None and (record_time is None or record_time < t_start):
+                for _ in islice(file, count - 1):
+                    pass
+                continue
+            remaining = count - 1
+        yield line
+
+# Function to pick the epoch record reader for the RINEX version of a file
+def _epoch_records(file, obs_header_data, systems=OBS_SYSTEMS, prns=None, t_start=None, t_end=None):
+    if prns is not None:
+        prns = frozenset(prns)
+    if t_start is not None or t_end is not None:
+        file = _window_lines(file, obs_header_data, t_start, t_end)
+    if (obs_header_data["rinex_version"] or 3) < 3:
+        system_info = next(iter(obs_header_data["sys_obs_types"].values()), {"num_obs": 0})
+        default_system = (obs_header_data["satellite_system"] or 'G')[0]
+        if default_system == 'M':
+            default_system = 'G'
+        records = _read_epoch_records_v2(file, system_info["num_obs"], default_system, systems, prns)
+    else:
+        records = _read_epoch_records(file, systems, prns)
+    return _counted_epoch_records(records) if instrumentation.enabled else records
+
+# Function to count parsed epochs and satellite records as they are read (instrumentation)
+def _counted_epoch_records(records):
+    for epoch, satellite_lines in records:
+        instrumentation.count("obs.epochs_parsed")
+        instrumentation.count("obs.satellite_records_parsed", len(satellite_lines))
+        yield epoch, satellite_lines
+
+# Function to decode the selected 16-character observation blocks of one satellite line;
+# fields lists the (ascending) block positions to decode, the other blocks are never sliced
+def _decode_obs_fields(obs_line, fields):
+    num_types = len(fields)
+    values = [np.nan] * num_types
+    lli = [-1] * num_types
+    snr = [-1] * num_types
+    length = len(obs_line)
+
+    for i, field in enumerate(fields):
+        start_idx = field * 16
+        if start_idx >= length:
+            # Satırın sonuna geldik, daha fazla veri yok
+            break
+        observation_field = obs_line[start_idx:start_idx + 16]
+
+        # İlk 14 karakter gözlem değeri, 15. karakter LLI, 16. karakter SNR/SSI
+        obs_value_str = observation_field[0:14].strip()
+        if obs_value_str:
+            try:
+                values[i] = float(obs_value_str)
+            except ValueError:
+                pass
+        flag = observation_field[14:15]
+        if flag.isdigit():
+            lli[i] = int(flag)
+        flag = observation_field[15:16]
+        if flag.isdigit():
+            snr[i] = int(flag)
+
+    return values, lli, snr
+
+# Function to build the union of the selected obs codes of the decoded systems and, per system,
+# the positions of its selected blocks in the observation lines and their columns in that union
+def _obs_columns(obs_header_data, systems=OBS_SYSTEMS, obs_codes=None):
+    obs_types = []
+    columns = {}
+    for system_code, (system_types, fields) in _obs_types_by_system(obs_header_data, systems, obs_codes).items():
+        for obs_type in system_types:
+            if obs_type not in obs_types:
+                obs_types.append(obs_type)
+        columns[system_code] = (fields, [obs_types.index(obs_type) for obs_type in system_types])
+    return obs_types, columns
+
+# Function to pack epoch records from _read_epoch_records into columnar arrays
+def _build_columnar(epoch_records, obs_types, columns, time_system="GPS"):
+    epoch_fields = {key: [] for key in ("year", "month", "day", "hour", "minute", "second",
+                                        "epoch_flag", "num_satellites", "receiver_clock_offset")}
+    second_ns = []
+    prn_index = {}
+    row_epoch = array('q')
+    row_sat = array('q')
+    row_order = array('h')
+    row_values = array('d')
+    row_lli = array('b')
+    row_snr = array('b')
+    num_codes = len(obs_types)
+    # Kodları birleşik sütunlarla aynı sırada olan sistemlerde yerleştirme adımı atlanır
+    in_place = {system_code: sat_columns == list(range(num_codes)) for system_code, (_, sat_columns) in columns.items()}
+
+    for epoch_idx, (epoch, satellite_lines) in enumerate(epoch_records):
+        for key in epoch_fields:
+            epoch_fields[key].append(epoch[key])
+        second_ns.append(epoch["second_ns"])
+
+        for record_order, (prn, obs_line) in enumerate(satellite_lines):
+            fields, sat_columns = columns[prn[0]]
+            values, lli, snr = _decode_obs_fields(obs_line, fields)
+            if not in_place[prn[0]]:
+                # Sistemin kodlarını birleşik sütunlara yerleştir
+                full_values = [np.nan] * num_codes
+                full_lli = [-1] * num_codes
+                full_snr = [-1] * num_codes
+                for i, column in enumerate(sat_columns):
+                    full_values[column] = values[i]
+                    full_lli[column] = lli[i]
+                    full_snr[column] = snr[i]
+                values, lli, snr = full_values, full_lli, full_snr
+
+            row_epoch.append(epoch_idx)
+            row_sat.append(prn_index.setdefault(prn, len(prn_index)))
+            row_order.append(record_order)
+            row_values.extend(values)
+            row_lli.extend(lli)
+            row_snr.extend(snr)
+
+    # PRN eksenini sırala ve satırları yeni indekslere taşı
+    prns = sorted(prn_index)
+    order = np.empty(len(prn_index), dtype=np.int64)
+    for new_idx, prn in enumerate(prns):
+        order[prn_index[prn]] = new_idx
+
+    num_epochs = len(second_ns)
+    num_sats = len(prns)
+    epoch_rows = np.frombuffer(row_epoch, dtype=np.int64)
+    sat_rows = order[np.frombuffer(row_sat, dtype=np.int64)]
+
+    present = np.zeros((num_epochs, num_sats), dtype=bool)
+    order = np.full((num_epochs, num_sats), -1, dtype=np.int16)
+    obs = np.full((num_epochs, num_sats, num_codes), np.nan)
+    lli = np.full((num_epochs, num_sats, num_codes), -1, dtype=np.int8)
+    snr = np.full((num_epochs, num_sats, num_codes), -1, dtype=np.int8)
+    present[epoch_rows, sat_rows] = True
+    order[epoch_rows, sat_rows] = np.frombuffer(row_order, dtype=np.int16)
+    num_rows = len(row_epoch)
+    obs[epoch_rows, sat_rows] = np.frombuffer(row_values, dtype=np.float64).reshape(num_rows, num_codes)
+    lli[epoch_rows, sat_rows] = np.frombuffer(row_lli, dtype=np.int8).reshape(num_rows, num_codes)
+    snr[epoch_rows, sat_rows] = np.frombuffer(row_snr, dtype=np.int8).reshape(num_rows, num_codes)
+
+    clock_offsets = [np.nan if value is None else value for value in epoch_fields["receiver_clock_offset"]]
+    return {
+        "obs_types": obs_types,
+        "prns": prns,
+        "prn_index": {prn: i for i, prn in enumerate(prns)},
+        "time": gps_timer.gps_time_ns_array(epoch_fields["year"], epoch_fields["month"], epoch_fields["day"],
+                                            epoch_fields["hour"], epoch_fields["minute"],
+                                            second_ns=np.array(second_ns, dtype=np.int64), time_system=time_system),
+        "epoch": {
+            "year": np.array(epoch_fields["year"], dtype=np.int16),
+            "month": np.array(epoch_fields["month"], dtype=np.int8),
+            "day": np.array(epoch_fields["day"], dtype=np.int8),
+            "hour": np.array(epoch_fields["hour"], dtype=np.int8),
+            "minute": np.array(epoch_fields["minute"], dtype=np.int8),
+            "second": np.array(epoch_fields["second"], dtype=np.float64),
+            "epoch_flag": np.array(epoch_fields["epoch_flag"], dtype=np.int8),
+            "num_satellites": np.array(epoch_fields["num_satellites"], dtype=np.int16),
+            "receiver_clock_offset": np.array(clock_offsets, dtype=np.float64)
+        },
+        "present": present,
+        "order": order,
+        "obs": obs,
+        "lli": lli,
+        "snr": snr
+    }
+
+# Function to decode OBS RINEX body into columnar NumPy arrays.
+def decode_obs_body_columnar(file_path, systems=OBS_SYSTEMS, obs_codes=None, prns=None, t_start=None, t_end=None):
+    """
+    Gözlem dosyasının gövdesini sütun tabanlı (columnar) dizilere çözer.
+
+    Args:
+        systems (tuple): Okunacak uydu sistemleri.
+        obs_codes (tuple): Okunacak gözlem kodları, ör. ("C1C",) (None: başlıktaki tüm kodlar).
+            İstenmeyen kodların 16 karakterlik alanları hiç çözülmez; "obs" dizisinin kod ekseni
+            sadece seçilen kodlardan oluşur.
+        prns (list): Okunacak uydular, ör. ["G01", "G05"] (None: sistemlerin tüm uyduları).
+        t_start, t_end (int): GPS zaman penceresi (ns, iki uç dahil). Pencere öncesindeki kayıtlar
+            çözülmeden atlanır, pencereden sonra okuma durur (epoch'lar zamana göre sıralı varsayılır).
+
+    Returns:
+        dict: "obs_types" (gözlem kodları), "prns" (sıralı PRN listesi), "prn_index",
+        "time" (int64, GPS epoch'undan itibaren nanosaniye; başlıktaki zaman sisteminden GPS
+        zamanına çevrilmiş), "epoch" (dosyadaki epoch alanlarının dizileri), "present" (epoch x uydu, bool), "order" (epoch x uydu, int16: uydunun epoch
+        kaydındaki sırası, eksik -1), "obs" (epoch x uydu x kod, float64, eksik değer NaN), "lli" ve
+        "snr" (int8, eksik değer -1).
+    """
+    return decode_obs_columnar(file_path, systems, obs_codes, prns, t_start, t_end)[1]
+
+# Function to decode the OBS RINEX header and the body (columnar) in a single pass over the file
+def decode_obs_columnar(file_path, systems=OBS_SYSTEMS, obs_codes=None, prns=None, t_start=None, t_end=None):
+    """
+    decode_obs_body_columnar ile aynı diziler; dosya bir kez açılır ve okunan başlık da döndürülür.
+
+    Returns:
+        tuple: (obs_header_data, columnar)
+    """
+    with instrumentation.timer("obs.decode_columnar"), open_rinex(file_path) as file:
+        obs_header_data = _read_obs_header(file)
+        obs_types, columns = _obs_columns(obs_header_data, systems, obs_codes)
+        columnar = _build_columnar(_epoch_records(file, obs_header_data, systems, prns, t_start, t_end), obs_types,
+                                   columns, obs_time_system(obs_header_data))
+    return obs_header_data, columnar
+
+# Function to build the old-style satellite dict (observation_data / aux_data)
+def _satellite_info(prn, obs_types, values, lli, snr):
+    satellite_info = {
+        "prn": prn,
+        "observation_data": {},
+        "aux_data": {}  # LLI ve SNR bilgileri burada tutulacak
+    }
+    for i, obs_type in enumerate(obs_types):
+        # Tamamen boş alanlar (değer, LLI ve SNR yok) atlanır
+        if values[i] != values[i] and lli[i] < 0 and snr[i] < 0:
+            continue
+        satellite_info["observation_data"][obs_type] = None if values[i] != values[i] else values[i]
+        satellite_info["aux_data"][obs_type] = {
+            "LLI": str(lli[i]) if lli[i] >= 0 else None,
+            "SNR": str(snr[i]) if snr[i] >= 0 else None
+        }
+    return satellite_info
+
+# Columnar veriyi eski liste-sözlük (list-of-dicts) yapısında gösteren ince görünüm
+class ObsBodyView:
+    """
+    decode_obs_body_columnar çıktısını eski decode_obs_body_data çıktısı gibi gösterir.
+    Her epoch sözlüğü erişildiği anda oluşturulur; veri kopyalanmaz. Uydular iter_obs_epochs gibi
+    dosyadaki sırayla ("order"; yoksa PRN sırasıyla) verilir.
+    """
 
-                # Uydu sistemine göre obs_types listesini al
-                system_code = prn[0]  # Örn: 'G' veya 'R'
-                if system_code != 'G': # Sadece GPS uydu verilerini okuyoruz isterseniz diğer sistemler için de ekleyebilirsiniz, ya da burayı silerek tüm sistemler için okuma yapabilirsiniz
+    def __init__(self, columnar):
+        self.columnar = columnar
+
+    def __len__(self):
+        return len(self.columnar["time"])
+
+    def __iter__(self):
+        for epoch_idx in range(len(self)):
+            yield self._epoch(epoch_idx)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._epoch(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("epoch index out of range")
+        return self._epoch(index)
+
+    def _epoch(self, epoch_idx):
+        data = self.columnar
+        fields = data["epoch"]
+        clock_offset = float(fields["receiver_clock_offset"][epoch_idx])
+        epoch = {
+            "year": int(fields["year"][epoch_idx]),
+            "month": int(fields["month"][epoch_idx]),
+            "day": int(fields["day"][epoch_idx]),
+            "hour": int(fields["hour"][epoch_idx]),
+            "minute": int(fields["minute"][epoch_idx]),
+            "second": float(fields["second"][epoch_idx]),
+            "epoch_flag": int(fields["epoch_flag"][epoch_idx]),
+            "num_satellites": int(fields["num_satellites"][epoch_idx]),
+            "receiver_clock_offset": None if np.isnan(clock_offset) else clock_offset,
+            "time": int(data["time"][epoch_idx])
+        }
+
+        observations = []
+        sat_indices = np.flatnonzero(data["present"][epoch_idx])
+        if "order" in data:
+            sat_indices = sat_indices[np.argsort(data["order"][epoch_idx, sat_indices], kind='stable')]
+        for sat_idx in sat_indices:
+            observations.append(_satellite_info(data["prns"][sat_idx], data["obs_types"],
+                                                data["obs"][epoch_idx, sat_idx].tolist(),
+                                                data["lli"][epoch_idx, sat_idx].tolist(),
+                                                data["snr"][epoch_idx, sat_idx].tolist()))
+
+        return {"epoch": epoch, "observations": observations}
+
+# Function to decode OBS RINEX data with dynamic observation types; the selection arguments are
+# those of decode_obs_body_columnar
+def decode_obs_body_data(file_path, systems=OBS_SYSTEMS, obs_codes=None, prns=None, t_start=None, t_end=None):
+    return ObsBodyView(decode_obs_body_columnar(file_path, systems, obs_codes, prns, t_start, t_end))
+
+# Function to build the old-style epoch dict straight from an epoch record
+def _epoch_to_dict(epoch, satellite_lines, obs_types_by_system, time_system="GPS"):
+    epoch_dict = {
+        "year": epoch["year"],
+        "month": epoch["month"],
+        "day": epoch["day"],
+        "hour": epoch["hour"],
+        "minute": epoch["minute"],
+        "second": epoch["second"],
+        "epoch_flag": epoch["epoch_flag"],
+        "num_satellites": epoch["num_satellites"],
+        "receiver_clock_offset": epoch["receiver_clock_offset"],
+        "time": gps_timer.gps_time_ns(epoch["year"], epoch["month"], epoch["day"],
+                                      epoch["hour"], epoch["minute"], 0, time_system) + epoch["second_ns"]
+    }
+    observations = []
+    for prn, obs_line in satellite_lines:
+        obs_types, fields = obs_types_by_system[prn[0]]
+        values, lli, snr = _decode_obs_fields(obs_line, fields)
+        observations.append(_satellite_info(prn, obs_types, values, lli, snr))
+    return {"epoch": epoch_dict, "observations": observations}
+
+# Function to list the selected obs types of each requested system from the header,
+# with the positions of their 16-character blocks in the observation lines: {system: (obs_types, fields)}
+def _obs_types_by_system(obs_header_data, systems, obs_codes=None):
+    obs_types_by_system = {}
+    for system_code in systems:
+        system_info = obs_header_data['sys_obs_types'].get(system_code, {"num_obs": 0, "obs_types": []})
+        system_types = system_info['obs_types'][:system_info['num_obs']]
+        fields = [i for i, obs_type in enumerate(system_types) if obs_codes is None or obs_type in obs_codes]
+        obs_types_by_system[system_code] = ([system_types[i] for i in fields], fields)
+    return obs_types_by_system
+
+# Function to stream OBS RINEX epochs one at a time, or in lists of batch_size epochs
+def iter_obs_epochs(file_path, batch_size=None, systems=OBS_SYSTEMS, obs_codes=None, prns=None, t_start=None,
+                    t_end=None):
+    """
+    Gözlem dosyasını okurken her epoch'u (decode_obs_body_data ile aynı yapıda) üretir.
+    Dosyanın tamamı belleğe alınmaz; batch_size verilirse en fazla batch_size epoch'luk
+    listeler üretilir. systems, obs_codes, prns ve t_start/t_end okunacak sistemleri, gözlem
+    kodlarını, uyduları ve zaman penceresini belirler (decode_obs_body_columnar).
+    """
+    with open_rinex(file_path) as file:
+        obs_header_data = _read_obs_header(file)
+        obs_types_by_system = _obs_types_by_system(obs_header_data, systems, obs_codes)
+        time_system = obs_time_system(obs_header_data)
+
+        epochs = (_epoch_to_dict(epoch, satellite_lines, obs_types_by_system, time_system)
+                  for epoch, satellite_lines in _epoch_records(file, obs_header_data, systems, prns, t_start, t_end))
+        if batch_size is None:
+            yield from epochs
+        else:
+            while True:
+                batch = list(islice(epochs, batch_size))
+                if not batch:
+                    break
+                yield batch
+
+# Function to stream OBS RINEX epochs as columnar batches of at most batch_size epochs
+def iter_obs_batches(file_path, batch_size, systems=OBS_SYSTEMS, obs_codes=None, prns=None, t_start=None,
+                     t_end=None):
+    """
+    decode_obs_body_columnar ile aynı yapıda (ve aynı seçim argümanlarıyla), batch_size epoch'luk
+    sütun tabanlı parçalar üretir. Her parçanın PRN ekseni sadece o parçada görülen uydulardan oluşur.
+    """
+    with open_rinex(file_path) as file:
+        obs_header_data = _read_obs_header(file)
+        obs_types, columns = _obs_columns(obs_header_data, systems, obs_codes)
+        records = _epoch_records(file, obs_header_data, systems, prns, t_start, t_end)
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                break
+            yield _build_columnar(batch, obs_types, columns, obs_time_system(obs_header_data))
+
+# Takip (follow) modunda dosyanın büyümesi için bekleme aralığı (s)
+FOLLOW_POLL_INTERVAL = 0.25
+
+# Takip modunda bir seferde okunan en fazla bayt (uzun bir dosyaya sonradan bağlanırken bellek sınırı)
+FOLLOW_READ_SIZE = 4 * 2 ** 20
+
+# Takip modunda checkpoint en fazla bu aralıkla (s) yazılır; okunacak tamamlanmış kayıt kalmayınca hemen yazılır
+FOLLOW_CHECKPOINT_INTERVAL = 1.0
+
+# Function to return the number of lines of the epoch record starting at lines[start],
+# or None when the record is not complete yet
+def _epoch_record_length(lines, start, rinex_version, lines_per_satellite):
+    length = _record_line_count(lines[start], rinex_version, lines_per_satellite) or 1
+    return length if start + length <= len(lines) else None
+
+# Function to return the number of lines of the epoch record starting with line, 0 if line starts no record
+def _record_line_count(line, rinex_version, lines_per_satellite):
+    if rinex_version >= 3:
+        if not line.startswith('>') or len(line) < 35:
+            return 0
+        return 1 + int(line[32:35])
+    if len(line) < 32 or line[0] != ' ' or not line[1:3].strip().isdigit() or line[3] != ' ':
+        return 0
+    flag, num_satellites = int(line[28:29]), int(line[29:32])
+    if 2 <= flag <= 5:
+        return 1 + num_satellites
+    # Epoch satırı + uydu listesi devam satırları + uydu başına gözlem satırları
+    return 1 + max(0, (num_satellites - 1) // 12) + num_satellites * lines_per_satellite
+
+# Function to read the header bytes (up to and including the END OF HEADER line), or None if incomplete
+def _read_header_bytes(file):
+    file.seek(0)
+    data = b''
+    while True:
+        label = data.find(b"END OF HEADER")
+        newline = data.find(b'\n', label) if label >= 0 else -1
+        if newline >= 0:
+            return data[:newline + 1]
+        chunk = file.read(65536)
+        if not chunk:
+            return None
+        data += chunk
+
+# Function to load a follow checkpoint if it still matches the file (same header, not truncated)
+def _load_follow_checkpoint(checkpoint_path, file):
+    if not checkpoint_path or not os.path.exists(checkpoint_path):
+        return None
+    try:
+        with open(checkpoint_path, 'r') as checkpoint_file:
+            state = json.load(checkpoint_file)
+    except (OSError, ValueError):
+        return None
+    if os.fstat(file.fileno()).st_size < state.get("offset", 0):
+        return None
+    file.seek(0)
+    header_bytes = file.read(state.get("header_length", 0))
+    if hashlib.sha1(header_bytes).hexdigest() != state.get("header_sha1"):
+        return None
+    return state
+
+# Function to write a follow checkpoint atomically
+def _save_follow_checkpoint(checkpoint_path, state):
+    temp_path = f"{checkpoint_path}.tmp"
+    with open(temp_path, 'w') as checkpoint_file:
+        json.dump(state, checkpoint_file)
+    os.replace(temp_path, checkpoint_path)
+
+# Function to start following a file from its header, or None while the header is incomplete
+def _new_follow_state(file, file_path):
+    header_bytes = _read_header_bytes(file)
+    if header_bytes is None:
+        return None
+    return {
+        "file_path": os.path.abspath(file_path),
+        "header_length": len(header_bytes),
+        "header_sha1": hashlib.sha1(header_bytes).hexdigest(),
+        "offset": len(header_bytes),
+        "epochs": 0,
+        "obs_header_data": decode_obs_header_lines([header_bytes.decode('latin-1')])
+    }
+
+# Function to return the record layout of a file from its header: (RINEX version, lines per satellite in v2)
+def _record_layout(obs_header_data):
+    system_info = next(iter(obs_header_data["sys_obs_types"].values()), {"num_obs": 0})
+    return obs_header_data["rinex_version"] or 3, max(1, (system_info["num_obs"] + 4) // 5)
+
+# Function to decode an OBS header given as text lines (e.g. received over a socket)
+def decode_obs_header_lines(lines):
+    return _read_obs_header(io.StringIO(''.join(lines)))
+
+# Function to split the complete epoch records off the front of a list of text lines
+def split_epoch_records(lines, obs_header_data):
+    """
+    Satır listesinin başındaki tamamlanmış epoch kayıtlarını ayırır; sondaki yarım kayıt
+    bir sonraki çağrıya kalır.
+
+    Returns:
+        tuple: (kayıtlar - her biri bir satır listesi, kullanılan satır sayısı)
+    """
+    rinex_version, lines_per_satellite = _record_layout(obs_header_data)
+    records = []
+    start = 0
+    while start < len(lines):
+        length = _epoch_record_length(lines, start, rinex_version, lines_per_satellite)
+        if length is None:
+            break
+        records.append(lines[start:start + length])
+        start += length
+    return records, start
+
+# Function to decode one complete epoch record (decode_obs_body_data structure), None for event records
+def decode_epoch_record(record_lines, obs_header_data, systems=OBS_SYSTEMS, obs_types_by_system=None,
+                        obs_codes=None, prns=None):
+    if obs_types_by_system is None:
+        obs_types_by_system = _obs_types_by_system(obs_header_data, systems, obs_codes)
+    for epoch, satellite_lines in _epoch_records(iter(record_lines), obs_header_data, systems, prns):
+        return _epoch_to_dict(epoch, satellite_lines, obs_types_by_system, obs_time_system(obs_header_data))
+    return None
+
+# Function to follow a growing OBS RINEX file, yielding epochs as complete records are appended
+def follow_obs_epochs(file_path, systems=OBS_SYSTEMS, checkpoint_path=None, poll_interval=FOLLOW_POLL_INTERVAL,
+                      idle_timeout=None, obs_codes=None, prns=None):
+    """
+    Alıcının gün boyunca sonuna eklediği (sıkıştırılmamış) gözlem dosyasını takip eder: sadece yeni
+    eklenen ve tamamlanmış epoch kayıtları çözülür, yarım kalan kayıt bir sonraki eklemeyi bekler.
+
+    Okunan bayt konumu, başlık (decode_obs_header_data çıktısı) ve epoch sayısı checkpoint_path'e
+    işlenen epoch'lardan sonra (üreteç bir sonraki epoch için devam ettiğinde) yazılır; yeniden
+    başlatılan süreç dosyayı baştan okumadan kaldığı yerden devam eder. Son checkpoint'ten sonra
+    üretilmiş epoch'lar yeniden başlatmada tekrar üretilebilir. Başlık değişmiş ya da dosya
+    kısalmışsa (yeni gün dosyası) okuma baştan başlar.
+
+    Args:
+        poll_interval (float): Dosya büyümesi için yoklama aralığı (s); ekleme-çözme gecikmesinin üst sınırı.
+        idle_timeout (float): Bu kadar saniye yeni epoch gelmezse takip biter (None: süresiz).
+        obs_codes, prns: Okunacak gözlem kodları ve uydular (decode_obs_body_columnar).
+
+    Yields:
+        tuple: (epoch_idx, epoch_data) - epoch_data iter_obs_epochs ile aynı yapıdadır.
+    """
+    with open(file_path, 'rb') as file:
+        state = _load_follow_checkpoint(checkpoint_path, file)
+        layout = None
+        pending = b''
+        last_epoch_time = last_save_time = time.monotonic()
+
+        try:
+            while True:
+                if state is None:
+                    state = _new_follow_state(file, file_path)
+                    layout = None
+                    pending = b''
+                if state is not None and layout is None:
+                    layout = _record_layout(state["obs_header_data"])
+                    obs_types_by_system = _obs_types_by_system(state["obs_header_data"], systems, obs_codes)
+                    time_system = obs_time_system(state["obs_header_data"])
+
+                # Yeni baytlar: dosya kısaldıysa yeni bir dosya yazılıyordur, baştan başla
+                new_data = b''
+                if state is not None:
+                    size = os.fstat(file.fileno()).st_size
+                    read_position = state["offset"] + len(pending)
+                    if size < read_position:
+                        state = None
+                        continue
+                    if size > read_position:
+                        file.seek(read_position)
+                        new_data = file.read(min(size - read_position, FOLLOW_READ_SIZE))
+                        pending += new_data
+
+                if not new_data:
+                    if idle_timeout is not None and time.monotonic() - last_epoch_time >= idle_timeout:
+                        return
+                    time.sleep(poll_interval)
                     continue
-                if system_code in obs_header_data['sys_obs_types']:
-                    obs_types = obs_header_data['sys_obs_types'][system_code]['obs_types']
-                else:
-                    # Eğer header'da bu sistem için obs_types yoksa boş liste
-                    obs_types = []
-
-                obs_line = line[3:].rstrip('\n')
-                length = len(obs_line)
-
-                satellite_info = {
-                    "prn": prn,
-                    "observation_data": {},
-                    "aux_data": {}  # LLI ve SNR bilgileri burada tutulacak
-                }
 
-                # obs_types sayısı kadar 16 karakterlik bloklar halinde oku
-                for i, obs_type in enumerate(obs_types):
-                    start_idx = i * 16
-                    if start_idx >= length:
-                        # Satırın sonuna geldik, daha fazla veri yok
+                # Sadece tamamlanmış satırlar çözülür; son (yarım) satır beklemede kalır
+                raw_lines = pending.split(b'\n')[:-1]
+                lines = [raw_line.rstrip(b'\r').decode('latin-1') + '\n' for raw_line in raw_lines]
+                rinex_version, lines_per_satellite = layout
+                start = consumed = 0
+                while start < len(lines):
+                    length = _epoch_record_length(lines, start, rinex_version, lines_per_satellite)
+                    if length is None:
                         break
-                    end_idx = start_idx + 16
-                    if end_idx > length:
-                        # Son blok 16 karakterden kısa olabilir
-                        end_idx = length
-
-                    observation_field = obs_line[start_idx:end_idx]
-
-                    # İlk 14 karakter gözlem değeri
-                    obs_value_str = observation_field[0:14].strip()
-                    # 15. karakter LLI
-                    LLI = observation_field[14:15].strip() if len(observation_field) >= 15 else None
-                    # 16. karakter SNR/SSI
-                    SNR = observation_field[15:16].strip() if len(observation_field) == 16 else None
-
-                    # Boşlukları None yap
-                    LLI = LLI if LLI else None
-                    SNR = SNR if SNR else None
-
-                    # Gözlem değerini float'a çevir
-                    if obs_value_str:
-                        try:
-                            obs_value = float(obs_value_str)
-                        except ValueError:
-                            obs_value = None
-                    else:
-                        obs_value = None
+                    record_lines = lines[start:start + length]
+                    record_bytes = sum(len(raw_line) + 1 for raw_line in raw_lines[start:start + length])
+                    start += length
+                    for epoch, satellite_lines in _epoch_records(iter(record_lines), state["obs_header_data"], systems,
+                                                                 prns):
+                        yield state["epochs"], _epoch_to_dict(epoch, satellite_lines, obs_types_by_system,
+                                                              time_system)
+                        state["epochs"] += 1
+                        last_epoch_time = time.monotonic()
+                    state["offset"] += record_bytes
+                    consumed += record_bytes
+                    if checkpoint_path and time.monotonic() - last_save_time >= FOLLOW_CHECKPOINT_INTERVAL:
+                        _save_follow_checkpoint(checkpoint_path, state)
+                        last_save_time = time.monotonic()
+                pending = pending[consumed:]
+                if checkpoint_path and consumed:
+                    _save_follow_checkpoint(checkpoint_path, state)
+                    last_save_time = time.monotonic()
+        finally:
+            # Takip durdurulduğunda (break, hata, idle_timeout) son konum kaydedilir
+            if checkpoint_path and state is not None:
+                _save_follow_checkpoint(checkpoint_path, state)
+
+# Function to return the time fields of an epoch record line: ((year, month, day, hour, minute), second)
+def _record_time_fields(line, rinex_version):
+    if rinex_version >= 3:
+        return (line[2:6], line[7:9], line[10:12], line[13:15], line[16:18]), line[19:30].strip()
+    return (line[1:3], line[4:6], line[7:9], line[10:12], line[13:15]), line[15:26].strip()
+
+# Function to return False for epoch record lines with blank time fields (allowed for event records, flag 2-5)
+def _has_record_time(line, rinex_version):
+    fields, second_str = _record_time_fields(line, rinex_version)
+    return bool(second_str) and all(field.strip() for field in fields)
+
+# Function to return the GPS time (ns) of an epoch record line, or None when its time fields are blank
+def _record_time(line, rinex_version, time_system="GPS"):
+    if not _has_record_time(line, rinex_version):
+        return None
+    fields, second_str = _record_time_fields(line, rinex_version)
+    year, month, day, hour, minute = (int(field) for field in fields)
+    if rinex_version < 3:
+        year += 2000 if year < 80 else 1900
+    whole, _, fraction = second_str.partition('.')
+    # Artık saniye geçişleri dakika başına denk geldiği için saniyeler çevrimden sonra eklenebilir
+    return (gps_timer.gps_time_ns(year, month, day, hour, minute, 0, time_system)
+            + int(whole) * 1_000_000_000 + int((fraction + '000000000')[:9]))
+
+# Function to index the epoch records of an observation file: byte offset and time of every record
+def build_epoch_index(file_path):
+    """
+    Gözlem dosyasını tek geçişte tarayıp her epoch kaydının ('>' satırı; RINEX 2'de epoch satırı)
+    bayt konumunu ve GPS zamanını kaydeder. Kayıtlar gözlem satırları çözülmeden, kayıt başındaki
+    uydu sayısıyla atlanır. Kayıt sırası iter_obs_epochs'un epoch sırasıyla aynıdır; zamanı boş olan
+    olay kayıtları okuyucular gibi atlanır (satırları önceki kaydın bayt aralığında kalır).
+
+    Sıkıştırılmış dosyalarda (gzip, .Z, Hatanaka) bayt konumuna atlanamadığı için ValueError verir.
+    Dosyanın yanında saklamak için rinex_cache.load_epoch_index kullanılır.
+
+    Returns:
+        dict: "header_length", "file_size", "offsets" (int64), "times" (int64, GPS ns) ve "flags"
+        (int8, epoch bayrağı).
+    """
+    with instrumentation.timer("obs.build_epoch_index"), open(file_path, 'rb') as file:
+        if file.read(2) in (GZIP_MAGIC, LZW_MAGIC):
+            raise ValueError(f"{file_path} is compressed; the epoch index needs an uncompressed RINEX file")
+        header_bytes = _read_header_bytes(file)
+        if header_bytes is None:
+            raise ValueError(f"{file_path} has no END OF HEADER line")
+        if b"COMPACT RINEX" in header_bytes[:80]:
+            raise ValueError(f"{file_path} is Hatanaka-compressed; the epoch index needs an uncompressed RINEX file")
+        obs_header_data = decode_obs_header_lines([header_bytes.decode('latin-1')])
+        rinex_version, lines_per_satellite = _record_layout(obs_header_data)
+        time_system = obs_time_system(obs_header_data)
+
+        offsets = array('q')
+        times = array('q')
+        flags = array('b')
+        offset = len(header_bytes)
+        file.seek(offset)
+        remaining = 0
+        for raw_line in file:
+            if remaining:
+                remaining -= 1
+            else:
+                line = raw_line.decode('latin-1')
+                count = _record_line_count(line, rinex_version, lines_per_satellite)
+                if count:
+                    record_time = _record_time(line, rinex_version, time_system)
+                    if record_time is not None:
+                        offsets.append(offset)
+                        times.append(record_time)
+                        flag = line[31:32] if rinex_version >= 3 else line[28:29]
+                        flags.append(int(flag) if flag.isdigit() else 0)
+                    remaining = count - 1
+            offset += len(raw_line)
+
+    return {
+        "header_length": len(header_bytes),
+        "file_size": offset,
+        "offsets": np.frombuffer(offsets, dtype=np.int64).copy(),
+        "times": np.frombuffer(times, dtype=np.int64).copy(),
+        "flags": np.frombuffer(flags, dtype=np.int8).copy()
+    }
+
+# Function to return the record range [first, last) of an index that falls in a GPS time window (ns, inclusive)
+def epoch_index_window(epoch_index, t_start=None, t_end=None):
+    times = epoch_index["times"]
+    first = 0 if t_start is None else int(np.searchsorted(times, t_start, side='left'))
+    last = len(times) if t_end is None else int(np.searchsorted(times, t_end, side='right'))
+    return first, max(first, last)
+
+# Function to read the header and the selected epoch records of an indexed file: (first, header, records)
+def _indexed_records(file_path, epoch_index, t_start, t_end, epoch_range, systems, prns=None):
+    if epoch_index is None:
+        epoch_index = build_epoch_index(file_path)
+    offsets = epoch_index["offsets"]
+    if epoch_range is not None:
+        first, last = max(0, epoch_range[0]), min(len(offsets), epoch_range[1])
+    else:
+        first, last = epoch_index_window(epoch_index, t_start, t_end)
+    with open(file_path, 'rb') as file:
+        obs_header_data = decode_obs_header_lines([file.read(epoch_index["header_length"]).decode('latin-1')])
+        if first >= last:
+            return first, obs_header_data, iter(())
+        end = offsets[last] if last < len(offsets) else epoch_index["file_size"]
+        file.seek(offsets[first])
+        data = file.read(end - offsets[first])
+    # Evrensel satır sonu: CRLF dosyalar open_rinex ile okunan dosyalarla aynı satırları verir
+    text = io.TextIOWrapper(io.BytesIO(data), encoding='latin-1')
+    return first, obs_header_data, _epoch_records(text, obs_header_data, systems, prns)
+
+# Function to decode only the epochs of a time window or an epoch number range, using an epoch index
+def iter_obs_window(file_path, t_start=None, t_end=None, epoch_range=None, epoch_index=None, systems=OBS_SYSTEMS,
+                    obs_codes=None, prns=None):
+    """
+    Dosyanın sadece istenen zaman aralığındaki (GPS ns, iki uç dahil; ör. gps_timer.gps_time_ns ile)
+    ya da epoch_range=(başlangıç, bitiş) numaralı epoch'larını okuyup iter_obs_epochs ile aynı
+    yapıda üretir. Dosyanın geri kalanı okunmaz ve çözülmez. obs_codes ve prns okunacak gözlem
+    kodlarını ve uyduları seçer (decode_obs_body_columnar).
 
-                    # Gözlem değerini observation_data altına koy
-                    satellite_info["observation_data"][obs_type] = obs_value
+    Args:
+        epoch_index (dict): build_epoch_index ya da rinex_cache.load_epoch_index çıktısı; verilmezse
+            bellekte oluşturulur (dosya bir kez taranır).
+
+    Yields:
+        tuple: (epoch_idx, epoch_data) - epoch_idx dosyadaki epoch numarasıdır.
+    """
+    first, obs_header_data, records = _indexed_records(file_path, epoch_index, t_start, t_end, epoch_range, systems,
+                                                       prns)
+    obs_types_by_system = _obs_types_by_system(obs_header_data, systems, obs_codes)
+    time_system = obs_time_system(obs_header_data)
+    for epoch_idx, (epoch, satellite_lines) in enumerate(records, first):
+        yield epoch_idx, _epoch_to_dict(epoch, satellite_lines, obs_types_by_system, time_system)
+
+# Function to decode a time window or an epoch number range into columnar arrays, using an epoch index
+def decode_obs_window_columnar(file_path, t_start=None, t_end=None, epoch_range=None, epoch_index=None,
+                               systems=OBS_SYSTEMS, obs_codes=None, prns=None):
+    """
+    iter_obs_window ile aynı seçimi decode_obs_body_columnar yapısında döndürür.
+    """
+    _, obs_header_data, records = _indexed_records(file_path, epoch_index, t_start, t_end, epoch_range, systems,
+                                                   prns)
+    obs_types, columns = _obs_columns(obs_header_data, systems, obs_codes)
+    return _build_columnar(records, obs_types, columns, obs_time_system(obs_header_data))
+
+# Paralel çözümlemede işçi başına parça sayısı; parçalar farklı hızda çözülse de işçiler boş kalmaz
+PARALLEL_CHUNKS_PER_WORKER = 4
+
+# Paralel çözümlemede parça başına en az gövde baytı; küçük dosyalar daha az parçaya bölünür
+PARALLEL_MIN_CHUNK_BYTES = 4 * 2 ** 20
+
+# Function to return True when a file cannot be memory-mapped as plain RINEX text (gzip, .Z or Hatanaka)
+def _is_compressed(file_path):
+    with open(file_path, 'rb') as file:
+        head = file.read(80)
+    return head[:2] in (GZIP_MAGIC, LZW_MAGIC) or b"COMPACT RINEX" in head
+
+# Function to split the body of an uncompressed observation file into byte ranges at epoch record boundaries
+def split_obs_body(file_path, num_chunks, epoch_index=None):
+    """
+    Gövdeyi yaklaşık eşit boyutlu, her biri bir epoch kaydıyla başlayan [başlangıç, bitiş) bayt
+    aralıklarına böler. RINEX 3'te sınırlar bellek eşlemeli (mmap) dosyada '>' epoch satırları
+    aranarak bulunur; RINEX 2'de epoch satırı gözlem satırlarından ayırt edilemediği için sınırlar
+    epoch indeksinden (verilmezse build_epoch_index ile oluşturulur) seçilir.
+
+    Returns:
+        tuple: (başlık bayt uzunluğu, aralık listesi)
+    """
+    with open(file_path, 'rb') as file:
+        header_bytes = _read_header_bytes(file)
+        if header_bytes is None:
+            raise ValueError(f"{file_path} has no END OF HEADER line")
+        header_length = len(header_bytes)
+        rinex_version, lines_per_satellite = _record_layout(decode_obs_header_lines([header_bytes.decode('latin-1')]))
+        size = os.fstat(file.fileno()).st_size
+        if size <= header_length or num_chunks <= 1:
+            return header_length, [(header_length, size)]
+        targets = [header_length + k * (size - header_length) // num_chunks for k in range(1, num_chunks)]
+
+        boundaries = [header_length]
+        if epoch_index is not None or rinex_version < 3:
+            offsets = (epoch_index if epoch_index is not None else build_epoch_index(file_path))["offsets"]
+            for position in np.searchsorted(offsets, targets):
+                if position < len(offsets) and offsets[position] > boundaries[-1]:
+                    boundaries.append(int(offsets[position]))
+        else:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                for target in targets:
+                    position = max(target, boundaries[-1] + 1) - 1
+                    while True:
+                        position = data.find(b'\n>', position)
+                        if position < 0:
+                            break
+                        line_end = data.find(b'\n', position + 1)
+                        line = data[position + 1:line_end if line_end >= 0 else size].decode('latin-1')
+                        # Olay kayıtlarındaki '>' ile başlayan başlık satırları sınır sayılmaz
+                        if (_record_line_count(line, rinex_version, lines_per_satellite)
+                                and _record_time(line, rinex_version) is not None):
+                            break
+                        position += 1
+                    if position < 0:
+                        break
+                    boundaries.append(position + 1)
+        boundaries.append(size)
+    return header_length, list(zip(boundaries[:-1], boundaries[1:]))
+
+# Function to decode one byte range of the body into columnar arrays (runs in a worker process)
+def _decode_obs_range(file_path, header_length, start, end, systems=OBS_SYSTEMS, obs_codes=None, prns=None,
+                      t_start=None, t_end=None):
+    with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        obs_header_data = decode_obs_header_lines([data[:header_length].decode('latin-1')])
+        body = data[start:end]
+    # Evrensel satır sonu: CRLF dosyalar open_rinex ile okunan dosyalarla aynı satırları verir
+    text = io.TextIOWrapper(io.BytesIO(body), encoding='latin-1')
+    obs_types, columns = _obs_columns(obs_header_data, systems, obs_codes)
+    return _build_columnar(_epoch_records(text, obs_header_data, systems, prns, t_start, t_end), obs_types, columns,
+                           obs_time_system(obs_header_data))
+
+# İşçi başlatıcı: 'fork' ile miras alınan ölçümler temizlenir, ölçüm açıksa işçide de açılır
+def _init_parse_worker(instrument):
+    instrumentation.reset()
+    if instrument:
+        instrumentation.enable()
+
+# İşçide bir aralığı çözer; ölçüm açıksa işçinin ölçümleri sonuçla birlikte ana sürece gönderilir
+def _decode_obs_range_task(*args):
+    columnar = _decode_obs_range(*args)
+    if not instrumentation.enabled:
+        return columnar, None
+    worker_report = instrumentation.snapshot()
+    instrumentation.reset()
+    return columnar, worker_report
+
+# Function to join the columnar arrays of consecutive epoch ranges (same obs types) in epoch order
+def _concatenate_columnar(pieces):
+    prns = sorted(set().union(*(piece["prns"] for piece in pieces)))
+    prn_index = {prn: i for i, prn in enumerate(prns)}
+    num_epochs = sum(len(piece["time"]) for piece in pieces)
+    num_codes = len(pieces[0]["obs_types"])
+
+    present = np.zeros((num_epochs, len(prns)), dtype=bool)
+    order = np.full((num_epochs, len(prns)), -1, dtype=np.int16)
+    obs = np.full((num_epochs, len(prns), num_codes), np.nan)
+    lli = np.full((num_epochs, len(prns), num_codes), -1, dtype=np.int8)
+    snr = np.full((num_epochs, len(prns), num_codes), -1, dtype=np.int8)
+    row = 0
+    for piece in pieces:
+        rows = slice(row, row + len(piece["time"]))
+        sat_columns = [prn_index[prn] for prn in piece["prns"]]
+        present[rows, sat_columns] = piece["present"]
+        order[rows, sat_columns] = piece["order"]
+        obs[rows, sat_columns] = piece["obs"]
+        lli[rows, sat_columns] = piece["lli"]
+        snr[rows, sat_columns] = piece["snr"]
+        row = rows.stop
+
+    return {
+        "obs_types": pieces[0]["obs_types"],
+        "prns": prns,
+        "prn_index": prn_index,
+        "time": np.concatenate([piece["time"] for piece in pieces]),
+        "epoch": {key: np.concatenate([piece["epoch"][key] for piece in pieces]) for key in pieces[0]["epoch"]},
+        "present": present,
+        "order": order,
+        "obs": obs,
+        "lli": lli,
+        "snr": snr
+    }
 
-                    # LLI ve SNR bilgilerini aux_data altına koy
-                    satellite_info["aux_data"][obs_type] = {
-                        "LLI": LLI,
-                        "SNR": SNR
-                    }
+# Function to decode a large observation file into columnar arrays with a process pool
+def decode_obs_body_columnar_parallel(file_path, num_workers=None, systems=OBS_SYSTEMS, obs_codes=None, prns=None,
+                                      t_start=None, t_end=None, epoch_index=None):
+    """
+    decode_obs_body_columnar'ın çok çekirdekli karşılığı: gövde split_obs_body ile epoch kaydı
+    sınırlarından bayt aralıklarına bölünür, her aralık bir işçi sürecinde bellek eşlemeli dosyadan
+    okunup sütun tabanlı dizilere çözülür ve parçalar epoch sırasıyla birleştirilir. Sonuç
+    decode_obs_body_columnar ile birebir aynıdır.
 
-                obs_body_data[-1]["observations"].append(satellite_info)
+    Sıkıştırılmış dosyalar (gzip, .Z, Hatanaka) bellek eşlenemediği için sıralı okuyucuyla çözülür.
 
-                satellites_read += 1
-                # Tüm uydular okunduysa bu epoch bitti
-                if satellites_read == num_satellites_in_epoch:
-                    epoch_recording = False
+    Args:
+        num_workers (int): İşçi süreç sayısı (None: çekirdek sayısı).
+        epoch_index (dict): build_epoch_index ya da rinex_cache.load_epoch_index çıktısı; RINEX 2
+            dosyalarında verilirse parça sınırları için dosya yeniden taranmaz.
+    """
+    if _is_compressed(file_path):
+        return decode_obs_body_columnar(file_path, systems, obs_codes, prns, t_start, t_end)
+    num_workers = num_workers or multiprocessing.cpu_count()
 
-    return obs_body_data
\ No newline at end of file
+    with instrumentation.timer("obs.decode_parallel"):
+        body_size = os.path.getsize(file_path)
+        num_chunks = max(1, min(num_workers * PARALLEL_CHUNKS_PER_WORKER, body_size // PARALLEL_MIN_CHUNK_BYTES))
+        header_length, ranges = split_obs_body(file_path, num_chunks, epoch_index)
+        tasks = [(file_path, header_length, start, end, systems, obs_codes, prns, t_start, t_end)
+                 for start, end in ranges]
+        if num_workers == 1 or len(tasks) == 1:
+            pieces = [_decode_obs_range(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(min(num_workers, len(tasks)), mp_context=multiprocessing.get_context(),
+                                     initializer=_init_parse_worker, initargs=(instrumentation.enabled,)) as executor:
+                pieces = []
+                for columnar, worker_report in executor.map(_decode_obs_range_task, *zip(*tasks)):
+                    if worker_report is not None:
+                        instrumentation.merge(worker_report)
+                    pieces.append(columnar)
+        instrumentation.count("obs.parallel_chunks", len(tasks))
+        return _concatenate_columnar(pieces)
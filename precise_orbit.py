@@ -0,0 +1,188 @@
+import numpy as np
+
+import instrumentation
+from gps_timer import SECONDS_PER_WEEK
+
+# Lagrange enterpolasyonunda kullanılan düğüm (SP3 epoch'u) sayısı: 10 düğüm, 9. derece polinom;
+# 15 dakikalık IGS yörüngelerinde milimetre düzeyinde doğruluk verir
+PRECISE_INTERPOLATION_NODES = 10
+
+# Kayan pencere önbelleğinde tutulan en fazla pencere; ardışık epoch'lar aynı pencereyi kullanır
+PRECISE_CACHE_WINDOWS = 4
+
+
+def _merge_products(products, fields):
+    """Ardışık dosyaların (ör. günlük SP3) ürünlerini tek bir uydu x epoch ızgarasında birleştirir."""
+    if len(products) == 1:
+        return products[0]
+    prns = sorted({prn for product in products for prn in product["prns"]})
+    prn_index = {prn: i for i, prn in enumerate(prns)}
+    times = np.unique(np.concatenate([product["times"] for product in products]))
+    merged = {"prns": prns, "prn_index": prn_index, "times": times}
+    for field in fields:
+        shape = products[0][field].shape[2:]
+        merged[field] = np.full((len(prns), len(times)) + shape, np.nan)
+    # Çakışan epoch'larda sonraki dosyanın değerleri kullanılır
+    for product in products:
+        rows = np.array([prn_index[prn] for prn in product["prns"]], dtype=np.int64)
+        columns = np.searchsorted(times, product["times"])
+        for field in fields:
+            merged[field][rows[:, None], columns] = product[field]
+    return merged
+
+
+def build_precise_orbits(sp3_data, clk_data=None, num_nodes=PRECISE_INTERPOLATION_NODES):
+    """
+    precise_reader çıktılarını enterpolasyona hazır tek bir ürüne birleştirir.
+
+    Parametreler:
+      sp3_data: decode_sp3_data çıktısı ya da ardışık dosyaların çıktılarından oluşan liste
+                (gün sınırında enterpolasyon için önceki/sonraki gün dosyaları eklenmelidir).
+      clk_data: decode_clk_data çıktısı ya da listesi; verilirse uydu saatleri CLK dosyasından,
+                verilmezse SP3 saat sütunundan alınır.
+      num_nodes: Lagrange düğüm sayısı.
+
+    Dönüş:
+      dict: "prns", "prn_index", "times", "xyz" (uydu x epoch x 3), "clock_times", "clock"
+      (uydu x saat epoch'u), "reference_time", "num_nodes" ve "window_cache" (kayan pencere
+      önbelleği). calculate_precise_position(s) ile kullanılır.
+    """
+    sp3_list = sp3_data if isinstance(sp3_data, (list, tuple)) else [sp3_data]
+    orbits = _merge_products(sp3_list, ("xyz", "clock"))
+    if len(orbits["times"]) < 2:
+        raise ValueError("At least two SP3 epochs are needed for interpolation")
+
+    clock_source = orbits
+    clk_list = [] if clk_data is None else clk_data if isinstance(clk_data, (list, tuple)) else [clk_data]
+    if clk_list:
+        clocks = _merge_products(clk_list, ("clock",))
+        # Saat ekseni yörünge ekseniyle aynı PRN sırasına getirilir
+        clock_source = {"times": clocks["times"],
+                        "clock": np.full((len(orbits["prns"]), len(clocks["times"])), np.nan)}
+        for prn, row in orbits["prn_index"].items():
+            if prn in clocks["prn_index"]:
+                clock_source["clock"][row] = clocks["clock"][clocks["prn_index"][prn]]
+
+    times = orbits["times"]
+    return {
+        "prns": orbits["prns"],
+        "prn_index": orbits["prn_index"],
+        "times": times,
+        "xyz": orbits["xyz"],
+        "clock_times": clock_source["times"],
+        "clock": clock_source["clock"],
+        # Haftanın saniyesi olarak verilen sorgu zamanları bu ana en yakın haftaya yerleştirilir
+        "reference_time": float(times[len(times) // 2]),
+        "num_nodes": min(num_nodes, len(times)),
+        "window_cache": {}
+    }
+
+
+def _continuous_time(precise_orbits, t_gps):
+    """Haftanın saniyesi ya da sürekli GPS saniyesi olarak verilen zamanları sürekli GPS saniyesine çevirir."""
+    t_gps = np.asarray(t_gps, dtype=np.float64)
+    reference = precise_orbits["reference_time"]
+    return t_gps + SECONDS_PER_WEEK * np.round((reference - t_gps) / SECONDS_PER_WEEK)
+
+
+def _window_coefficients(precise_orbits, start, cache):
+    """
+    start epoch'undan başlayan düğüm penceresindeki tüm uyduların konum polinomları
+    (uydu x 3 x düğüm, kuvvet tabanında, en yüksek derece başta) ve pencerenin merkez/yarı genişliği.
+    """
+    window = cache.get(start)
+    if window is not None:
+        return window
+
+    num_nodes = precise_orbits["num_nodes"]
+    node_times = precise_orbits["times"][start:start + num_nodes]
+    centre = (node_times[0] + node_times[-1]) / 2
+    half = (node_times[-1] - node_times[0]) / 2
+    # [-1, 1] aralığına ölçeklenmiş düğümlerde Vandermonde sistemi iyi koşulludur
+    vandermonde = np.vander((node_times - centre) / half, num_nodes)
+    nodes = precise_orbits["xyz"][:, start:start + num_nodes]
+    coeffs = np.linalg.solve(vandermonde, nodes.transpose(1, 0, 2).reshape(num_nodes, -1))
+    coeffs = coeffs.reshape(num_nodes, -1, 3).transpose(1, 2, 0)
+
+    window = (coeffs, centre, half)
+    cache[start] = window
+    # Kayan pencere: en eski pencere atılır
+    while len(cache) > PRECISE_CACHE_WINDOWS:
+        cache.pop(next(iter(cache)))
+    return window
+
+
+def calculate_precise_positions(precise_orbits, prns, t_gps, cache=None):
+    """
+    calculate_satellite_positions'ın hassas ürün karşılığı: verilen uydu/zaman çiftlerinin tümü
+    için konumu Lagrange enterpolasyonuyla, saat hatasını doğrusal enterpolasyonla hesaplar.
+
+    Her sorgu zamanı için en yakın num_nodes SP3 epoch'u (pencere) seçilir; pencerenin tüm
+    uydulara ait polinom katsayıları bir kez çözülüp cache'te tutulur. Ardışık epoch'lar aynı
+    pencereye düştüğü için katsayılar yeniden kullanılır ve sorgu başına sadece Horner
+    değerlendirmesi yapılır.
+
+    Parametreler:
+      precise_orbits: build_precise_orbits çıktısı.
+      prns: PRN dizisi (ör. ["G01", "G05"]); t_gps ile aynı şekle yayınlanabilir olmalı.
+      t_gps: Sinyal gönderim zamanları (GPS haftasının saniyesi ya da sürekli GPS saniyesi).
+      cache: Pencere önbelleği (None ise ürünün "window_cache" sözlüğü).
+
+    Dönüş:
+      X, Y, Z, dts: Aynı şekilde diziler (metre, saniye). Ürünün kapsamı dışındaki zamanlar ve
+      üründe olmayan uydular NaN döner.
+    """
+    if cache is None:
+        cache = precise_orbits["window_cache"]
+    prns, t_gps = np.broadcast_arrays(np.asarray(prns), _continuous_time(precise_orbits, t_gps))
+    shape = t_gps.shape
+    t_gps = t_gps.ravel()
+    prn_index = precise_orbits["prn_index"]
+    sat_idx = np.array([prn_index.get(prn, -1) for prn in prns.ravel().tolist()], dtype=np.int64)
+    known = sat_idx >= 0
+    sat_idx = np.where(known, sat_idx, 0)
+
+    # Konum: sorgu zamanını ortalayan düğüm penceresi
+    times = precise_orbits["times"]
+    num_nodes = precise_orbits["num_nodes"]
+    starts = np.clip(np.searchsorted(times, t_gps) - num_nodes // 2, 0, len(times) - num_nodes)
+    unique_starts, inverse = np.unique(starts, return_inverse=True)
+    hits = sum(1 for start in unique_starts.tolist() if start in cache)
+    windows = [_window_coefficients(precise_orbits, start, cache) for start in unique_starts.tolist()]
+    if instrumentation.enabled:
+        instrumentation.count("precise.positions", t_gps.size)
+        instrumentation.count("precise.window_hits", hits)
+        instrumentation.count("precise.window_misses", len(windows) - hits)
+
+    inverse = inverse.ravel()
+    coeffs = np.stack([window[0] for window in windows])[inverse, sat_idx]
+    centre = np.array([window[1] for window in windows])[inverse]
+    half = np.array([window[2] for window in windows])[inverse]
+    x = (t_gps - centre) / half
+    xyz = np.zeros((t_gps.size, 3))
+    for power in range(num_nodes):
+        xyz = xyz * x[:, None] + coeffs[..., power]
+
+    # Saat: komşu iki saat epoch'u arasında doğrusal enterpolasyon
+    clock_times = precise_orbits["clock_times"]
+    clock = precise_orbits["clock"]
+    lower = np.clip(np.searchsorted(clock_times, t_gps, side='right') - 1, 0, len(clock_times) - 2)
+    weight = (t_gps - clock_times[lower]) / (clock_times[lower + 1] - clock_times[lower])
+    clock_low, clock_high = clock[sat_idx, lower], clock[sat_idx, lower + 1]
+    dts = np.where(weight == 0.0, clock_low, clock_low + weight * (clock_high - clock_low))
+
+    # Ürünün kapsamı dışında enterpolasyon yapılmaz (dış değerleme hatası büyüktür)
+    valid = known & (t_gps >= times[0]) & (t_gps <= times[-1])
+    xyz[~valid] = np.nan
+    dts = np.where(valid & (t_gps >= clock_times[0]) & (t_gps <= clock_times[-1]), dts, np.nan)
+
+    return (xyz[:, 0].reshape(shape), xyz[:, 1].reshape(shape), xyz[:, 2].reshape(shape), dts.reshape(shape))
+
+
+def calculate_precise_position(precise_orbits, prn, t_gps, cache=None):
+    """
+    calculate_satellite_position_table ile aynı çağrı biçiminde (ürün, uydu, zaman) tek bir uydu
+    için X, Y, Z (metre) ve dts (saniye) döndürür; kapsam dışında NaN.
+    """
+    X, Y, Z, dts = calculate_precise_positions(precise_orbits, [prn], [t_gps], cache)
+    return float(X[0]), float(Y[0]), float(Z[0]), float(dts[0])
@@ -0,0 +1,147 @@
+import numpy as np
+
+import gps_timer
+import instrumentation
+from rinex_io import open_rinex
+
+# SP3 dosyalarında eksik konum (0.000000 km) ve eksik saat (999999.999999 µs ve üstü) değerleri
+SP3_MISSING_CLOCK = 999999.0
+
+# RINEX CLK dosyalarında okunan kayıt türü: uydu saatleri (AS)
+CLK_SATELLITE_RECORD = "AS"
+
+
+# Function to normalize a satellite id of an SP3 or CLK file ("G01", "G 1", " 1") to a PRN ("G01")
+def _normalize_prn(sat_id):
+    system_code = sat_id[0] if sat_id[0] != ' ' else 'G'
+    return f"{system_code}{int(sat_id[1:3]):02d}"
+
+
+# Function to convert calendar fields (GPS time scale) to continuous GPS seconds
+def _gps_seconds(year, month, day, hour, minute, second):
+    return gps_timer.gps_time_ns(year, month, day, hour, minute, second) / gps_timer.NS_PER_SECOND
+
+
+# Function to put per-epoch satellite values on a (satellite x epoch) grid
+def _satellite_grid(times, rows, prn_index, num_components):
+    values = np.full((len(prn_index), len(times), num_components), np.nan)
+    for epoch_idx, epoch_rows in enumerate(rows):
+        for prn, row in epoch_rows.items():
+            values[prn_index[prn], epoch_idx] = row
+    return values
+
+
+# Function to decode an SP3 (a/c/d) precise orbit file
+def decode_sp3_data(file_path):
+    """
+    SP3 dosyasındaki uydu konumlarını ve saatlerini uydu x epoch dizilerine okur. Velocity (V)
+    kayıtları ve EP/EV satırları atlanır. gzip ve .Z sıkıştırmalı dosyalar doğrudan okunabilir.
+
+    Returns:
+        dict: "header" ("version", "time_system", "num_epochs", "interval", "coordinate_system",
+        "agency"), "prns" (sıralı PRN listesi), "prn_index", "times" (float64, sürekli GPS saniyesi),
+        "xyz" (uydu x epoch x 3, metre) ve "clock" (uydu x epoch, saniye); eksik değerler NaN.
+    """
+    header = {"version": None, "time_system": "GPS", "num_epochs": None, "interval": None,
+              "coordinate_system": None, "agency": None}
+    times = []
+    rows = []
+    time_system_read = False
+    with instrumentation.timer("precise.decode_sp3"), open_rinex(file_path) as file:
+        for line in file:
+            if line.startswith('#') and not line.startswith('##'):
+                header["version"] = line[1:2]
+                header["num_epochs"] = int(line[32:39])
+                header["coordinate_system"] = line[46:51].strip()
+                header["agency"] = line[56:60].strip()
+            elif line.startswith('##'):
+                header["interval"] = float(line[24:38])
+            elif line.startswith('%c') and not time_system_read:
+                # İlk %c satırı dosyanın zaman sistemini taşır
+                header["time_system"] = line[9:12].strip() or "GPS"
+                time_system_read = True
+            elif line.startswith('*'):
+                times.append(_gps_seconds(int(line[3:7]), int(line[8:10]), int(line[11:13]), int(line[14:16]),
+                                          int(line[17:19]), float(line[20:31])))
+                rows.append({})
+            elif line.startswith('P') and rows:
+                x, y, z = float(line[4:18]), float(line[18:32]), float(line[32:46])
+                clock_str = line[46:60].strip()
+                clock = float(clock_str) if clock_str else SP3_MISSING_CLOCK
+                # Eksik konum 0.000000, eksik saat 999999.999999 olarak yazılır
+                position = (np.nan, np.nan, np.nan) if x == 0.0 and y == 0.0 and z == 0.0 else (
+                    x * 1000.0, y * 1000.0, z * 1000.0)
+                rows[-1][_normalize_prn(line[1:4])] = position + (
+                    np.nan if clock >= SP3_MISSING_CLOCK else clock * 1e-6,)
+    if header["time_system"] not in ("GPS", "GAL"):
+        raise ValueError(f"{file_path}: SP3 time system {header['time_system']} is not supported (GPS time expected)")
+
+    prns = sorted({prn for epoch_rows in rows for prn in epoch_rows})
+    prn_index = {prn: i for i, prn in enumerate(prns)}
+    values = _satellite_grid(times, rows, prn_index, 4)
+    return {
+        "header": header,
+        "prns": prns,
+        "prn_index": prn_index,
+        "times": np.array(times, dtype=np.float64),
+        "xyz": values[..., :3],
+        "clock": values[..., 3]
+    }
+
+
+# Function to decode the satellite clocks (AS records) of a RINEX clock file
+def decode_clk_data(file_path, systems=None):
+    """
+    RINEX CLK dosyasındaki uydu saat kayıtlarını (AS) uydu x epoch dizisine okur; alıcı (AR) ve
+    diğer kayıtlar atlanır. Epoch ekseni dosyadaki tüm AS epoch'larının birleşimidir.
+
+    Args:
+        systems (tuple): Okunacak uydu sistemleri (None: hepsi).
+
+    Returns:
+        dict: "header" ("version", "time_system"), "prns", "prn_index", "times" (float64, sürekli GPS
+        saniyesi) ve "clock" (uydu x epoch, saniye; eksik değerler NaN).
+    """
+    header = {"version": None, "time_system": "GPS"}
+    epoch_rows = {}
+    epoch_times = {}
+    with instrumentation.timer("precise.decode_clk"), open_rinex(file_path) as file:
+        for line in file:
+            label = line[60:].strip()
+            if label == "RINEX VERSION / TYPE":
+                header["version"] = float(line[0:9])
+            elif label == "TIME SYSTEM ID":
+                header["time_system"] = line[3:6].strip() or "GPS"
+            elif label == "END OF HEADER":
+                break
+
+        for line in file:
+            if not line.startswith(CLK_SATELLITE_RECORD):
+                continue
+            # Kayıt adı RINEX 3.04'te 9, öncekilerde 4 karakterdir; alanlar boşlukla ayrılır
+            fields = line.split()
+            prn = _normalize_prn(fields[1][:3])
+            if systems is not None and prn[0] not in systems:
+                continue
+            # Epoch zamanı her farklı epoch alanı için bir kez çevrilir
+            epoch_key = tuple(fields[2:8])
+            epoch_time = epoch_times.get(epoch_key)
+            if epoch_time is None:
+                epoch_time = epoch_times[epoch_key] = _gps_seconds(*(int(field) for field in epoch_key[:5]),
+                                                                   float(epoch_key[5]))
+            epoch_rows.setdefault(epoch_time, {})[prn] = (float(fields[9].replace('D', 'E')),)
+    if header["time_system"] not in ("GPS", "GAL"):
+        raise ValueError(f"{file_path}: clock time system {header['time_system']} is not supported "
+                         "(GPS time expected)")
+
+    times = sorted(epoch_rows)
+    prns = sorted({prn for rows in epoch_rows.values() for prn in rows})
+    prn_index = {prn: i for i, prn in enumerate(prns)}
+    values = _satellite_grid(times, [epoch_rows[epoch_time] for epoch_time in times], prn_index, 1)
+    return {
+        "header": header,
+        "prns": prns,
+        "prn_index": prn_index,
+        "times": np.array(times, dtype=np.float64),
+        "clock": values[..., 0]
+    }
@@ -0,0 +1,196 @@
+import hashlib
+import json
+import os
+import zipfile
+
+import numpy as np
+
+import instrumentation
+import nav_reader
+import obs_reader
+
+# Önbellek dosya biçimi sürümü: ayrıştırıcı çıktısı değişirse artırılır
+CACHE_FORMAT_VERSION = 8
+
+# Önbellek klasörünün varsayılan adı (kaynak dosyanın yanında)
+DEFAULT_CACHE_DIRECTORY = ".rinex_cache"
+
+# Columnar gözlem verisinde saklanan epoch alanları
+_EPOCH_FIELDS = ("year", "month", "day", "hour", "minute", "second",
+                 "epoch_flag", "num_satellites", "receiver_clock_offset")
+
+
+# Function to compute the SHA-1 of a file in chunks
+def _file_sha1(file_path):
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Function to return the cache file path of a source file
+def cache_path(file_path, kind, cache_dir=None):
+    directory, file_name = os.path.split(os.path.abspath(file_path))
+    cache_dir = cache_dir or os.path.join(directory, DEFAULT_CACHE_DIRECTORY)
+    return os.path.join(cache_dir, f"{file_name}.{kind}.npz")
+
+
+# Function to load a cache entry if it still matches the source file (size + mtime, then SHA-1)
+def _load_entry(file_path, path):
+    if not os.path.exists(path):
+        return None
+    try:
+        entry = dict(np.load(path, allow_pickle=False))
+        meta = json.loads(str(entry.pop("meta")))
+    except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+        # Yarım yazılmış ya da bozuk önbellek dosyası: kaynak yeniden çözülür
+        return None
+    if meta.get("format_version") != CACHE_FORMAT_VERSION:
+        return None
+
+    stat = os.stat(file_path)
+    if meta["source_size"] != stat.st_size:
+        return None
+    if meta["source_mtime_ns"] != stat.st_mtime_ns:
+        # Dosyaya dokunulmuş ama içerik aynı olabilir: özet (hash) ile kontrol et
+        if meta["source_sha1"] != _file_sha1(file_path):
+            return None
+        meta["source_mtime_ns"] = stat.st_mtime_ns
+        _save_entry(path, meta, entry)
+    return meta, entry
+
+
+# Function to write a cache entry atomically
+def _save_entry(path, meta, arrays):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as file:
+        np.savez(file, meta=np.array(json.dumps(meta)), **arrays)
+    os.replace(temp_path, path)
+
+
+# Function to build the cache metadata of a source file
+def _source_meta(file_path):
+    stat = os.stat(file_path)
+    return {
+        "format_version": CACHE_FORMAT_VERSION,
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "source_sha1": _file_sha1(file_path)
+    }
+
+
+# Function to load a decoded observation file (header + columnar body) through the cache
+def load_obs(file_path, cache_dir=None, systems=obs_reader.OBS_SYSTEMS, obs_codes=None):
+    """
+    Gözlem dosyasının başlığını ve sütun tabanlı gövdesini (decode_obs_body_columnar) önbellekten
+    yükler; önbellek yoksa ya da kaynak dosya değiştiyse yeniden çözüp önbelleğe yazar.
+    Her uydu sistemi ve gözlem kodu (obs_codes) seçimi ayrı bir önbellek dosyasında tutulur.
+
+    Returns:
+        tuple: (obs_header_data, columnar)
+    """
+    kind = "obs" if tuple(systems) == obs_reader.OBS_SYSTEMS else f"obs_{''.join(systems)}"
+    if obs_codes is not None:
+        kind += f"_{''.join(obs_codes)}"
+    path = cache_path(file_path, kind, cache_dir)
+    cached = _load_entry(file_path, path)
+    instrumentation.count("cache.hits" if cached is not None else "cache.misses")
+    if cached is not None:
+        meta, arrays = cached
+        prns = meta["prns"]
+        columnar = {
+            "obs_types": meta["obs_types"],
+            "prns": prns,
+            "prn_index": {prn: i for i, prn in enumerate(prns)},
+            "time": arrays["time"],
+            "epoch": {key: arrays[f"epoch_{key}"] for key in _EPOCH_FIELDS},
+            "present": arrays["present"],
+            "order": arrays["order"],
+            "obs": arrays["obs"],
+            "lli": arrays["lli"],
+            "snr": arrays["snr"]
+        }
+        return meta["header"], columnar
+
+    meta = _source_meta(file_path)
+    obs_header_data, columnar = obs_reader.decode_obs_columnar(file_path, systems, obs_codes)
+    meta.update(header=obs_header_data, obs_types=columnar["obs_types"], prns=columnar["prns"])
+    arrays = {key: columnar[key] for key in ("time", "present", "order", "obs", "lli", "snr")}
+    arrays.update({f"epoch_{key}": columnar["epoch"][key] for key in _EPOCH_FIELDS})
+    _save_entry(path, meta, arrays)
+    return obs_header_data, columnar
+
+
+# Function to load a decoded navigation file (header + body records) through the cache
+def load_nav(file_path, cache_dir=None):
+    """
+    Navigasyon dosyasının başlığını ve kayıtlarını (decode_nav_body_data ile aynı sözlükler)
+    önbellekten yükler; önbellek yoksa ya da kaynak dosya değiştiyse yeniden çözer.
+
+    Returns:
+        tuple: (nav_header_data, nav_body_data)
+    """
+    path = cache_path(file_path, "nav", cache_dir)
+    cached = _load_entry(file_path, path)
+    instrumentation.count("cache.hits" if cached is not None else "cache.misses")
+    if cached is not None:
+        meta, arrays = cached
+        keys = meta["keys"]
+        values = arrays["values"].tolist()
+        has_key = arrays["has_key"].tolist()
+        nav_body_data = []
+        for row, strings, row_has in zip(values, meta["strings"], has_key):
+            record = dict(strings)
+            for key, value, present in zip(keys, row, row_has):
+                if present:
+                    record[key] = None if value != value else value
+            nav_body_data.append(record)
+        return meta["header"], nav_body_data
+
+    meta = _source_meta(file_path)
+    nav_header_data = nav_reader.decode_nav_header_data(file_path)
+    nav_body_data = nav_reader.decode_nav_body_data(file_path)
+
+    # Sayısal alanlar tek bir float dizisinde, metin alanları (prn, epoch) metadata'da saklanır
+    keys = []
+    for record in nav_body_data:
+        for key, value in record.items():
+            if not isinstance(value, str) and key not in keys:
+                keys.append(key)
+    values = np.full((len(nav_body_data), len(keys)), np.nan)
+    has_key = np.zeros((len(nav_body_data), len(keys)), dtype=bool)
+    strings = []
+    for row, record in enumerate(nav_body_data):
+        strings.append({key: value for key, value in record.items() if isinstance(value, str)})
+        for column, key in enumerate(keys):
+            if key in record:
+                has_key[row, column] = True
+                if record[key] is not None:
+                    values[row, column] = record[key]
+
+    meta.update(header=nav_header_data, keys=keys, strings=strings)
+    _save_entry(path, meta, {"values": values, "has_key": has_key})
+    return nav_header_data, nav_body_data
+
+
+# Function to load the epoch byte-offset index of an observation file through the cache
+def load_epoch_index(file_path, cache_dir=None):
+    """
+    obs_reader.build_epoch_index çıktısını önbellekten yükler; önbellek yoksa ya da kaynak dosya
+    değiştiyse dosyayı bir kez tarayıp indeksi kaynak dosyanın yanına (önbellek klasörüne) yazar.
+    Sonuç obs_reader.iter_obs_window / decode_obs_window_columnar'ın epoch_index argümanıdır.
+    """
+    path = cache_path(file_path, "index", cache_dir)
+    cached = _load_entry(file_path, path)
+    instrumentation.count("cache.hits" if cached is not None else "cache.misses")
+    if cached is not None:
+        meta, arrays = cached
+        return {"header_length": meta["header_length"], "file_size": meta["file_size"], **arrays}
+
+    meta = _source_meta(file_path)
+    epoch_index = obs_reader.build_epoch_index(file_path)
+    meta.update(header_length=epoch_index["header_length"], file_size=epoch_index["file_size"])
+    _save_entry(path, meta, {key: epoch_index[key] for key in ("offsets", "times", "flags")})
+    return epoch_index
@@ -0,0 +1,393 @@
+import gzip
+import io
+from contextlib import contextmanager
+from itertools import chain
+
+# Sıkıştırma imzaları (dosyanın ilk iki baytı)
+GZIP_MAGIC = b'\x1f\x8b'
+LZW_MAGIC = b'\x1f\x9d'   # Unix compress (.Z)
+
+# Sıkıştırılmış veri parça boyutu (bayt)
+CHUNK_SIZE = 1 << 16
+
+# CRINEX (Hatanaka) gözlem alanları: değerler 3 ondalık, saat hatası RINEX 3'te 12, RINEX 2'de 9 ondalık
+_CRINEX_OBS_DECIMALS = 3
+
+
+# Bayt parçaları üreten bir üreteci (generator) okunabilir ham akışa çeviren ince sarmalayıcı
+class _GeneratorReader(io.RawIOBase):
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._pending = b''
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._pending:
+            self._pending = next(self._chunks, None)
+            if self._pending is None:
+                self._pending = b''
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+# Satır üreten bir üreteci okuyucuların kullandığı dosya arayüzüyle (iter, readline, read) gösterir
+class _LineStream:
+
+    def __init__(self, lines):
+        self._lines = iter(lines)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._lines)
+
+    def readline(self):
+        return next(self._lines, '')
+
+    def read(self):
+        return ''.join(self._lines)
+
+
+# Function to decompress a Unix compress (.Z, LZW) stream chunk by chunk
+def _unlzw_chunks(file):
+    """
+    .Z (LZW) verisini parça parça açar. Kodlar 9 bitten başlar ve tablo doldukça max_bits'e
+    kadar genişler; her 8 kodluk grup bits bayt kaplar ve kod genişliği değiştiğinde (ya da
+    CLEAR kodunda) içinde bulunulan grubun kalanı dolgu olarak atlanır.
+    """
+    header = file.read(3)
+    if len(header) < 3 or header[:2] != LZW_MAGIC:
+        raise ValueError("Not a .Z (LZW) compressed stream")
+    max_bits = header[2] & 0x1f
+    block_mode = header[2] & 0x80
+    if not 9 <= max_bits <= 16:
+        raise ValueError(f"Unsupported .Z code width: {max_bits} bits")
+    max_code = 1 << max_bits
+    first_code = 257 if block_mode else 256
+
+    table = [bytes([i]) for i in range(256)] + [b'']
+    bits = 9
+    mask = (1 << bits) - 1
+    next_code = first_code
+    previous = None
+    output = []
+    output_size = 0
+    buffer = b''
+
+    while True:
+        # Bir grup (8 kod = bits bayt) oku; dosya sonunda eksik grup kalabilir
+        while len(buffer) < bits:
+            data = file.read(CHUNK_SIZE)
+            if not data:
+                break
+            buffer += data
+        group, buffer = buffer[:bits], buffer[bits:]
+        if not group:
+            break
+        value = int.from_bytes(group, 'little')
+
+        for position in range(0, len(group) * 8 - bits + 1, bits):
+            code = (value >> position) & mask
+
+            if code == 256 and block_mode:
+                # CLEAR: tablo ve kod genişliği başa döner, grubun kalanı atlanır
+                del table[257:]
+                bits = 9
+                mask = (1 << bits) - 1
+                next_code = first_code
+                previous = None
+                break
+
+            if previous is None:
+                if code >= 256:
+                    raise ValueError("Corrupt .Z stream: first code is not a literal")
+                entry = table[code]
+            else:
+                if code < next_code:
+                    entry = table[code]
+                elif code == next_code:
+                    entry = previous + previous[:1]
+                else:
+                    raise ValueError("Corrupt .Z stream: invalid code")
+                if next_code < max_code:
+                    table.append(previous + entry[:1])
+                    next_code += 1
+
+            output.append(entry)
+            output_size += len(entry)
+            previous = entry
+
+            # Tablo bu genişliği aştıysa bir sonraki kod yeni grupta, bir bit daha geniştir
+            if next_code > mask and bits < max_bits:
+                bits += 1
+                mask = (1 << bits) - 1
+                break
+
+        if output_size >= CHUNK_SIZE:
+            yield b''.join(output)
+            output = []
+            output_size = 0
+
+    if output:
+        yield b''.join(output)
+
+
+# Function to apply a CRINEX text difference to the previous line
+def _repair(old, diff):
+    # ' ' değişmedi, '&' boşluk, diğer karakterler yeni değer demektir
+    chars = list(old)
+    for i, char in enumerate(diff):
+        if i < len(chars):
+            if char != ' ':
+                chars[i] = ' ' if char == '&' else char
+        else:
+            chars.append(' ' if char == '&' else char)
+    return ''.join(chars)
+
+
+# Function to format an integer in units of 10^-decimals as a fixed-point field
+def _format_fixed(value, decimals, width):
+    integer, fraction = divmod(abs(value), 10 ** decimals)
+    sign = '-' if value < 0 else ''
+    return f"{sign}{integer}.{fraction:0{decimals}d}".rjust(width)
+
+
+# Function to recover a value from its differences: state = (arc_order, order, values)
+def _undifference(received, arc_order, order, previous_values):
+    values = [received] + [0] * arc_order
+    if order < arc_order:
+        order += 1
+        for k in range(order):
+            values[k + 1] = values[k] + previous_values[k]
+    else:
+        for k in range(order):
+            values[k + 1] = values[k] + previous_values[k + 1]
+    return order, values
+
+
+# Function to update the number of obs types from a (C)RINEX header line
+def _count_obs_types(line, num_types):
+    label = line[60:]
+    if "# / TYPES OF OBSERV" in label and line[5:6] != ' ':
+        num_types[None] = int(line[:6])
+    elif "SYS / # / OBS TYPES" in label and line[0] != ' ':
+        num_types[line[0]] = int(line[3:6])
+
+
+# Function to decode a Compact RINEX (Hatanaka 1.0 / 3.0) text stream into RINEX lines
+def _crinex_lines(lines):
+    """
+    CRINEX satırlarını okurken RINEX 2/3 satırları üretir. Epoch satırları bir önceki epoch'a
+    göre karakter farkı, gözlemler ise yay (arc) başına n. dereceden tam sayı farkları olarak
+    saklanır; hiçbir ara dosya yazılmaz.
+    """
+    lines = (line.rstrip('\r\n') for line in lines)
+    first = next(lines, '')
+    if first[:3] not in ('1.0', '3.0') or "CRINEX VERS   / TYPE" not in first[60:]:
+        raise ValueError("Not a Compact RINEX (CRINEX 1.0/3.0) file")
+    crinex_version = int(first[0])
+    next(lines, None)  # CRINEX PROG / DATE
+
+    # Başlık olduğu gibi aktarılır
+    rinex_version = 3
+    num_types = {}
+    for line in lines:
+        line = line.rstrip()
+        yield line + '\n'
+        if "RINEX VERSION / TYPE" in line[60:]:
+            rinex_version = int(float(line[:9]))
+        _count_obs_types(line, num_types)
+        if "END OF HEADER" in line[60:]:
+            break
+
+    if rinex_version == 2:
+        epoch_top, rinex_top, flag_pos, nsat_pos, satlist_pos, clock_decimals = '&', ' ', 28, 29, 32, 9
+    else:
+        epoch_top, rinex_top, flag_pos, nsat_pos, satlist_pos, clock_decimals = '>', '>', 31, 32, 41, 12
+
+    epoch_line = ''
+    previous = {}         # uydu -> (bayraklar, alan durumları) bir önceki epoch'ta
+    clock = None
+    clock_order = 0
+    clock_arc_order = 0
+
+    for line in lines:
+        if crinex_version == 3 and line.startswith('&'):
+            continue  # CRINEX 3 kaçış (escape) satırları
+        if line.startswith('\x1a'):
+            break  # DOS EOF
+
+        if line.startswith(epoch_top):
+            line = rinex_top + line[1:]
+            if line[flag_pos:flag_pos + 1] not in ('0', '1'):
+                # Olay (event) epoch'u: kayıt ve ardındaki özel satırlar olduğu gibi aktarılır
+                line = line.rstrip()
+                yield line + '\n'
+                if len(line) > 29:
+                    for _ in range(int(line[flag_pos + 1:flag_pos + 4] or 0)):
+                        special = next(lines).rstrip()
+                        yield special + '\n'
+                        _count_obs_types(special, num_types)
+                epoch_line = ''
+                previous = {}
+                continue
+            # Başlatılmış epoch: tüm yaylar sıfırlanır
+            epoch_line = ''
+            previous = {}
+
+        epoch_line = _repair(epoch_line, line).rstrip()
+        num_sats = int(epoch_line[nsat_pos:nsat_pos + 3])
+        satellites = [epoch_line[satlist_pos + 3 * i:satlist_pos + 3 * i + 3] for i in range(num_sats)]
+
+        # Alıcı saat hatası satırı (boş olabilir)
+        clock_line = next(lines)
+        if clock_line:
+            if clock_line[1:2] == '&':
+                clock_arc_order = int(clock_line[0])
+                clock_order = -1
+                clock_line = clock_line[2:]
+            clock_order, clock = _undifference(int(clock_line), clock_arc_order, clock_order, clock)
+        else:
+            clock_order = -1
+
+        if rinex_version == 2:
+            if clock_order >= 0:
+                output = [epoch_line[:68].ljust(68) + _format_fixed(clock[clock_order], clock_decimals, 12)]
+            else:
+                output = [epoch_line[:68]]
+            for start in range(68, satlist_pos + 3 * num_sats, 36):
+                output.append(' ' * 32 + epoch_line[start:start + 36])
+        elif clock_order >= 0:
+            output = [epoch_line[:41].ljust(41) + _format_fixed(clock[clock_order], clock_decimals, 15)]
+        else:
+            output = [epoch_line[:41].rstrip()]
+
+        current = {}
+        for satellite in satellites:
+            count = num_types.get(None if rinex_version == 2 else satellite[0])
+            if count is None:
+                raise ValueError(f"CRINEX: no obs types declared for satellite {satellite}")
+
+            # Alanlar tek boşlukla ayrılır; boş alan eksik gözlemdir, kalan kısım bayrak farkıdır
+            data_line = next(lines)
+            fields = []
+            position = 0
+            for _ in range(count):
+                end = data_line.find(' ', position)
+                if end < 0:
+                    fields.append(data_line[position:])
+                    position = len(data_line) + 1
+                else:
+                    fields.append(data_line[position:end])
+                    position = end + 1
+            flag_diff = data_line[position:]
+
+            previous_flags, previous_states = previous.get(satellite, (None, None))
+            if previous_flags is None:
+                old_flags = '' if rinex_version >= 3 else flag_diff.ljust(count * 2)
+            else:
+                old_flags = previous_flags[:count * 2]
+            flags = list(_repair(old_flags, flag_diff).ljust(count * 2))
+
+            states = []
+            values = []
+            for j, field in enumerate(fields):
+                if not field:
+                    states.append(None)
+                    if crinex_version == 1:
+                        flags[2 * j] = flags[2 * j + 1] = ' '
+                    values.append(' ' * 14 + flags[2 * j] + flags[2 * j + 1])
+                    continue
+                if field[1:2] == '&':
+                    arc_order, order, previous_values = int(field[0]), -1, None
+                    field = field[2:]
+                else:
+                    if previous_states is None or previous_states[j] is None:
+                        raise ValueError(f"CRINEX: data arc of {satellite} is not initialized")
+                    arc_order, order, previous_values = previous_states[j]
+                order, field_values = _undifference(int(field), arc_order, order, previous_values)
+                states.append((arc_order, order, field_values))
+                values.append(_format_fixed(field_values[order], _CRINEX_OBS_DECIMALS, 14)
+                              + flags[2 * j] + flags[2 * j + 1])
+
+            if rinex_version == 2:
+                for start in range(0, count, 5):
+                    output.append(''.join(values[start:start + 5]).rstrip())
+            else:
+                output.append((satellite + ''.join(values)).rstrip())
+            current[satellite] = (''.join(flags), states)
+
+        previous = current
+        for output_line in output:
+            yield output_line + '\n'
+
+
+# Function to open a RINEX file or file object, decompressing gzip/.Z and CRINEX as it is read
+@contextmanager
+def open_rinex(source, binary=False):
+    """
+    RINEX dosyasını (yol ya da dosya nesnesi) okumak için açar. gzip (.gz) ve Unix compress (.Z)
+    sıkıştırması ilk baytlardan, Hatanaka (CRINEX) biçimi ilk satırdan tanınır ve veri okundukça
+    açılır; diske ara dosya yazılmaz.
+
+    Args:
+        source (str | file): Dosya yolu ya da ikili/metin dosya nesnesi. Çağıranın dosya nesnesi
+            kapatılmaz.
+        binary (bool): True ise açılmış (decompressed) ikili akış döner; CRINEX çözülmez.
+
+    Yields:
+        Metin akışı (satır satır okunabilir) ya da binary=True ise ikili akış.
+    """
+    owned = isinstance(source, (str, bytes)) or hasattr(source, '__fspath__')
+    if owned:
+        stream = open(source, 'rb')
+    elif isinstance(source, io.TextIOBase):
+        # Metin nesnesi: sıkıştırma olamaz, sadece CRINEX kontrol edilir
+        first = source.readline()
+        lines = chain([first], source)
+        yield _LineStream(_crinex_lines(lines) if "CRINEX VERS" in first[60:] else lines)
+        return
+    else:
+        stream = source if hasattr(source, 'peek') else io.BufferedReader(_GeneratorReader(
+            iter(lambda: source.read(CHUNK_SIZE), b'')))
+
+    wrappers = []
+    try:
+        magic = stream.peek(2)[:2]
+        if magic == GZIP_MAGIC:
+            data = gzip.GzipFile(fileobj=stream, mode='rb')
+            wrappers.append(data)
+        elif magic == LZW_MAGIC:
+            data = io.BufferedReader(_GeneratorReader(_unlzw_chunks(stream)), CHUNK_SIZE)
+            wrappers.append(data)
+        else:
+            data = stream
+
+        if binary:
+            yield data
+            return
+
+        is_crinex = b"CRINEX VERS" in data.peek(128).split(b'\n', 1)[0][60:]
+        # Düz dosya okuyucularıyla aynı: latin-1 (her bayt geçerli) ve evrensel satır sonları
+        text = io.TextIOWrapper(data, encoding='latin-1')
+        wrappers.append(text)
+        yield _LineStream(_crinex_lines(text)) if is_crinex else text
+    finally:
+        if owned:
+            for wrapper in reversed(wrappers):
+                wrapper.close()
+            stream.close()
+        else:
+            # Çağıranın dosya nesnesi açık kalsın: sarmalayıcılar ayrılır (detach), kapatılmaz
+            for wrapper in reversed(wrappers):
+                if isinstance(wrapper, io.TextIOWrapper):
+                    wrapper.detach()
+                elif isinstance(wrapper, gzip.GzipFile):
+                    wrapper.close()
@@ -0,0 +1,85 @@
+import argparse
+import os
+import sys
+
+import rinex_io
+
+# Kontrol dosyalarının klasörü: kısa RINEX 3.05 / 2.11 örnekleri ve bunların .Z (ncompress) ve
+# CRINEX (rnx2crx) ile üretilmiş karşılıkları; başlıklarda latin-1 karakterli bir COMMENT satırı var
+CHECK_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Rinex Files", "io_check")
+
+# (sıkıştırılmış girdi, referans RINEX, CRINEX mi) - CRINEX satır sonu boşluklarını saklamaz
+CHECKS = [
+    ("base123i.24o.Z", "base123i.24o", False),
+    ("base123i.24d", "base123i.24o", True),
+    ("base2i.24d", "base2i.24o", True),
+]
+
+
+# Function to read a file as text lines the way the plain-file readers do (latin-1, universal newlines)
+def _reference_lines(file_path):
+    with open(file_path, "r", encoding="latin-1") as file:
+        return file.readlines()
+
+
+# Function to compare the decoded lines with the reference and return the first mismatch, or None
+def _first_mismatch(lines, reference, strip):
+    if strip:
+        lines = [line.rstrip() for line in lines]
+        reference = [line.rstrip() for line in reference]
+    for line_number, (line, expected) in enumerate(zip(lines, reference), 1):
+        if line != expected:
+            return f"line {line_number}: {line!r} != {expected!r}"
+    if len(lines) != len(reference):
+        return f"{len(lines)} lines decoded, {len(reference)} expected"
+    return None
+
+
+# Function to run the decoder checks against the reference files and return the failures
+def run_checks(directory=CHECK_DIRECTORY):
+    """
+    open_rinex ile .Z (LZW) ve CRINEX girdilerini hem dosya yolu hem de ikili dosya nesnesi
+    olarak açar ve çıktıyı referans RINEX dosyasıyla satır satır karşılaştırır; .Z için açılmış
+    bayt akışı da referansla bayt bayt karşılaştırılır.
+
+    Returns:
+        list: Başarısız kontrollerin açıklamaları (boşsa tüm kontroller geçti).
+    """
+    failures = []
+    for input_name, reference_name, is_crinex in CHECKS:
+        input_path = os.path.join(directory, input_name)
+        reference_path = os.path.join(directory, reference_name)
+        reference = _reference_lines(reference_path)
+
+        with rinex_io.open_rinex(input_path) as text:
+            mismatch = _first_mismatch(list(text), reference, is_crinex)
+        if mismatch:
+            failures.append(f"{input_name} (path): {mismatch}")
+
+        with open(input_path, "rb") as file, rinex_io.open_rinex(file) as text:
+            mismatch = _first_mismatch(list(text), reference, is_crinex)
+        if mismatch:
+            failures.append(f"{input_name} (file object): {mismatch}")
+
+        if not is_crinex:
+            with open(reference_path, "rb") as file:
+                expected = file.read()
+            with rinex_io.open_rinex(input_path, binary=True) as data:
+                if data.read() != expected:
+                    failures.append(f"{input_name} (binary): decompressed bytes differ from {reference_name}")
+
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the .Z (LZW) and CRINEX decoders of rinex_io "
+                                                 "against reference RINEX files")
+    parser.add_argument("--directory", default=CHECK_DIRECTORY, help="folder with the check files")
+    args = parser.parse_args()
+
+    failures = run_checks(args.directory)
+    for failure in failures:
+        print("HATA:", failure)
+    if not failures:
+        print(f"Tüm kontroller geçti ({len(CHECKS)} dosya)")
+    sys.exit(1 if failures else 0)
@@ -4,130 +4,50 @@ import nav_reader
 import gps_timer
 import numpy as np
 import json
-from brdc_calculator import calculate_satellite_position
+import spp_processing
+import spp_writer
+from brdc_calculator import calculate_satellite_position, build_orbit_tables
 import brdc_c_test1
 from gps_timer import utc_to_gps_sow  
 from datetime import datetime  
 
 obs_file_path = r"C:\Users\Root\Desktop\SPP Python Codes\base123i.24o"
 nav_file_path = r"C:\Users\Root\Desktop\SPP Python Codes\base123i.24p"
-obs_convert305 = obs_reader.convert_to_305(obs_file_path)
-nav_convert305 = nav_reader.convert_to_305(nav_file_path)
+# RINEX 2.10/2.11 dosyaları doğrudan okunabilir; gfzrnx ile 3.05'e dönüşüm isteğe bağlıdır
+convert_rinex = False
+obs_convert305 = obs_reader.convert_to_305(obs_file_path) if convert_rinex else obs_file_path
+nav_convert305 = nav_reader.convert_to_305(nav_file_path) if convert_rinex else nav_file_path
 
 obs_header_data = obs_reader.decode_obs_header_data(obs_convert305)
-obs_body_data = obs_reader.decode_obs_body_data(obs_convert305)
 
 nav_header_data = nav_reader.decode_nav_header_data(nav_convert305)
 nav_body_data = nav_reader.decode_nav_body_data(nav_convert305)
+ephemeris_index = nav_reader.build_ephemeris_index(nav_body_data)
 
-# Tüm epoch'ları içeren listeyi oluştur
-epoch_times = []
-t_obs = []
-
-# obs_body_data listesinin uzunluğunu bul
-num_epochs = len(obs_body_data)
-
-# Her epoch için döngü
-for i in range(num_epochs):
-    # Epoch bilgilerini al
-    epoch_data = obs_body_data[i]['epoch']
-    
-    # Epoch zamanını string olarak formatla
-    epoch_time = f"{epoch_data['year']} {epoch_data['month']} {epoch_data['day']} {epoch_data['hour']} {epoch_data['minute']} {epoch_data['second']}"
-    
-    # Epoch zamanını listeye ekle
-    epoch_times.append(epoch_time)
-    
-    # GPS zamanına çevir ve t_obs listesine ekle
-    _, gps_sow = utc_to_gps_sow(epoch_time)
-    t_obs.append(gps_sow)
-
-# Işık hızı (m/s)
-c = 299792458.0
-
-# Dünyanın dönüş hızı (rad/s)
-OMEGA_dot_Earth = 7.2921151467e-5
-
-# Her epoch için gözlemlenen PRN'leri ve uydu konumlarını tutan sözlükler
-epoch_prns = {}
-satellite_positions = {}  # Her epoch için uydu konumlarını saklayacak sözlük
+# Yörünge tablosu modu: her efemeris oturum boyunca bir kez örneklenip Chebyshev polinomlarıyla
+# temsil edilir, epoch başına konumlar polinomdan hesaplanır (hata sınırı ORBIT_TABLE_TOLERANCE)
+use_orbit_tables = False
+orbit_tables = (build_orbit_tables(ephemeris_index, *spp_processing.session_span(obs_header_data))
+                if use_orbit_tables else None)
 
 # Alıcı yaklaşık konumu (XYZ0)
 XYZ0 = obs_header_data['approx_position_xyz']
 
-# Tüm epoch'lar için döngü
-for epoch_idx, epoch_data in enumerate(obs_body_data):
-    # Bu epoch için PRN listesi
-    prn_list = []
-    epoch_positions = {}  # Bu epoch'taki uydu konumlarını saklayacak sözlük
-    
-    # t_rec değeri (alıcı zamanı) - MATLAB'daki trec'e denk gelir
-    t_rec = t_obs[epoch_idx]
-    
-    # Bu epoch'taki tüm gözlemler için döngü
-    for sat_data in epoch_data['observations']:
-        prn = sat_data['prn']
-        
-        # Pseudorange değerini al (C1C - MATLAB'daki OBS(i,2)'ye denk gelir)
-        if 'C1C' in sat_data['observation_data']:
-            pseudorange = sat_data['observation_data']['C1C']
-            
-            if prn not in prn_list:
-                prn_list.append(prn)
-                
-                # Bu PRN için NAV verisini bul
-                nav_data = next((data for data in nav_body_data if data['prn'] == prn), None)
-                
-                if nav_data:
-                    # t_emi hesapla (sinyal gönderim zamanı) - MATLAB'daki Temi'ye denk gelir
-                    t_emi = t_rec - pseudorange / c
-                    
-                    # İlk uydu pozisyonu hesaplaması
-                    X, Y, Z, dts = calculate_satellite_position(nav_data, t_emi)
-                    
-                    # Düzeltilmiş t_emi hesaplaması (uydu saat hatası düzeltmesi ile)
-                    t_emi = t_rec - pseudorange / c - dts
-                    
-                    # Son uydu pozisyonu hesaplaması
-                    X, Y, Z, dts = calculate_satellite_position(nav_data, t_emi)
-                    
-                    # Uydu ve alıcı arasındaki fark vektörü (dXYZ)
-                    dXYZ = np.array([X - XYZ0[0], Y - XYZ0[1], Z - XYZ0[2]])
-                    
-                    # Sinyalin yayılma süresi (tau)
-                    tau = np.linalg.norm(dXYZ) / c
-                    
-                    # Dünya dönüşü düzeltme matrisi
-                    R = np.array([
-                        [np.cos(OMEGA_dot_Earth * tau), np.sin(OMEGA_dot_Earth * tau), 0],
-                        [-np.sin(OMEGA_dot_Earth * tau), np.cos(OMEGA_dot_Earth * tau), 0],
-                        [0, 0, 1]
-                    ])
-                    
-                    # Düzeltilmiş uydu pozisyonu
-                    XYZsat_corrected = np.dot(R, np.array([X, Y, Z]))
-                    
-                    # Uydu pozisyonunu kaydet
-                    epoch_positions[prn] = {
-                        'X': float(XYZsat_corrected[0]),
-                        'Y': float(XYZsat_corrected[1]),
-                        'Z': float(XYZsat_corrected[2]),
-                        'dts': dts,
-                        'pseudorange': pseudorange,
-                        't_emi': t_emi,
-                        'dXYZ': dXYZ.tolist(),
-                        'tau': tau
-                    }
-    
-    # Sözlüklere ekle
-    epoch_prns[epoch_idx] = prn_list
-    satellite_positions[epoch_idx] = epoch_positions
-
-# Sonuçları yazdır ve kaydet
-print(satellite_positions)
-file_path = r"C:\Users\Root\Desktop\SPP Python Codes\satellite_positions.json"
-with open(file_path, "w") as file:
-    json.dump(satellite_positions, file)
+# Uydu konumları epoch epoch yazılır: .jsonl satır başına bir epoch (tüm alanlar), .spb sıkı ikili
+# kayıtlar (epoch, GPS zamanı, PRN, X, Y, Z, dts, pseudorange, tau; spp_writer.read_output ile memmap olarak okunur)
+output_file_path = r"C:\Users\Root\Desktop\SPP Python Codes\satellite_positions.jsonl"
+output_metadata = {"obs_file_path": obs_file_path, "nav_file_path": nav_file_path, "approx_position_xyz": XYZ0}
+
+# Tüm epoch'lar için döngü: epoch'lar dosya okunurken gelir ve parça parça işlenir; uydu konumları
+# (gönderim zamanı, saat hatası ve Dünya dönüşü düzeltmeli) her epoch çözülünce dosyaya yazılır ve
+# bellekte tutulmaz (çok çekirdekli işlem için: python spp_processing.py <obs> <nav> --workers N)
+with spp_writer.open_output(output_file_path, metadata=output_metadata) as write_epoch:
+    output = spp_processing.process_epochs(obs_reader.iter_obs_epochs(obs_convert305), ephemeris_index, XYZ0,
+                                           orbit_tables=orbit_tables, write_epoch=write_epoch)
+
+# Alıcı konumu ve saat hatası: her parçanın epoch'ları birlikte en küçük kareler ile çözülür
+receiver_solution = output["solution"]
+print("Ortalama alıcı konumu (XYZ):", np.nanmean(receiver_solution['xyz'], axis=0))
 
 
 
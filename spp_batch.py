@@ -0,0 +1,286 @@
+import argparse
+import json
+import multiprocessing
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+import nav_reader
+import obs_reader
+import spp_processing
+import spp_writer
+
+# Gözlem ve navigasyon dosyası uzantıları (RINEX 2 kısa adlar: .yyo, Hatanaka .yyd / .yyn .yyp .yyg)
+OBS_SUFFIXES = ('o', 'd')
+NAV_SUFFIXES = ('n', 'p', 'g')
+
+# Aynı güne ait birden çok nav dosyası varsa seçim sırası: karışık (mixed), sonra GPS; çözüm GPS
+# uydularıyla yapıldığı için sadece GLONASS içeren dosyalar (.yyg, _RN) en sona kalır
+NAV_PREFERENCE = ('p', 'MN', 'n', 'GN')
+
+# Okuyucuların doğrudan açabildiği sıkıştırma uzantıları (gzip, Unix compress)
+COMPRESSION_SUFFIXES = ('.gz', '.z')
+
+# İşçi süreçlerinde salt okunur paylaşılan efemeris indeksleri (nav dosyası yolu -> indeks)
+_shared = {}
+
+
+# Function to strip a .gz/.Z compression suffix from a file name
+def _strip_compression(file_name):
+    base_name, ext = os.path.splitext(file_name)
+    return base_name if ext.lower() in COMPRESSION_SUFFIXES else file_name
+
+
+# Function to classify a RINEX file name as 'obs', 'nav' or None
+def _file_kind(file_name):
+    base_name, ext = os.path.splitext(_strip_compression(file_name))
+    ext = ext.lower()
+    if ext in ('.rnx', '.crx'):
+        # RINEX 3 uzun ad: ..._MO.rnx (gözlem) / ..._MN.rnx, _GN.rnx (navigasyon)
+        if base_name.upper().endswith('O'):
+            return 'obs'
+        if base_name.upper().endswith('N'):
+            return 'nav'
+        return None
+    if len(ext) == 4 and ext[1:3].isdigit():
+        if ext[3] in OBS_SUFFIXES:
+            return 'obs'
+        if ext[3] in NAV_SUFFIXES:
+            return 'nav'
+    return None
+
+
+# Function to build the day key of a RINEX file name: (4-digit year, day of year) or None
+def _day_key(file_name):
+    base_name, ext = os.path.splitext(_strip_compression(file_name))
+    if ext.lower() in ('.rnx', '.crx') and len(base_name) >= 19 and base_name[12:19].isdigit():
+        return int(base_name[12:16]), int(base_name[16:19])
+    if len(base_name) >= 7 and base_name[4:7].isdigit() and len(ext) == 4 and ext[1:3].isdigit():
+        # Kısa adlarda iki haneli yıl (RINEX: 80-99 -> 19xx, 00-79 -> 20xx); uzun adlarla aynı anahtar
+        year = int(ext[1:3])
+        return year + (2000 if year < 80 else 1900), int(base_name[4:7])
+    return None
+
+
+# Function to rank a navigation file name by NAV_PREFERENCE (lower is preferred)
+def _nav_rank(file_name):
+    base_name, ext = os.path.splitext(_strip_compression(file_name))
+    kind = base_name[-2:].upper() if ext.lower() in ('.rnx', '.crx') else ext[3:].lower()
+    return NAV_PREFERENCE.index(kind) if kind in NAV_PREFERENCE else len(NAV_PREFERENCE)
+
+
+# Function to pair observation and navigation files found in a directory
+def find_jobs(directory):
+    """
+    Bir klasördeki gözlem dosyalarını navigasyon dosyalarıyla eşleştirir: önce aynı kök adlı
+    nav dosyası, yoksa aynı güne ait (ör. brdc1230.24n; kısa ve uzun RINEX adları birbiriyle
+    eşleşir) nav dosyası kullanılır. Birden çok aday varsa NAV_PREFERENCE sırası uygulanır.
+
+    Returns:
+        list: {"station", "obs_file_path", "nav_file_path"} sözlükleri.
+    """
+    obs_files = []
+    nav_files = []
+    for file_name in sorted(os.listdir(directory)):
+        kind = _file_kind(file_name)
+        if kind == 'obs':
+            obs_files.append(file_name)
+        elif kind == 'nav':
+            nav_files.append(file_name)
+
+    # Her anahtara tercih sırasına göre (eşitlikte ada göre) ilk nav dosyası atanır
+    nav_by_stem = {}
+    nav_by_day = {}
+    for file_name in sorted(nav_files, key=_nav_rank):
+        file_path = os.path.join(directory, file_name)
+        nav_by_stem.setdefault(os.path.splitext(_strip_compression(file_name))[0], file_path)
+        nav_by_day.setdefault(_day_key(file_name), file_path)
+    nav_by_day.pop(None, None)
+
+    jobs = []
+    for file_name in obs_files:
+        stem = os.path.splitext(_strip_compression(file_name))[0]
+        nav_file_path = nav_by_stem.get(stem) or nav_by_day.get(_day_key(file_name))
+        jobs.append({
+            "station": stem,
+            "obs_file_path": os.path.join(directory, file_name),
+            "nav_file_path": nav_file_path
+        })
+    return jobs
+
+
+# Function to read a manifest file with one "obs_path,nav_path[,station]" line per job
+def read_manifest(manifest_path):
+    manifest_directory = os.path.dirname(os.path.abspath(manifest_path))
+    jobs = []
+    with open(manifest_path, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            fields = [field.strip() for field in line.split(',')]
+            obs_file_path = os.path.join(manifest_directory, fields[0])
+            nav_file_path = os.path.join(manifest_directory, fields[1]) if len(fields) > 1 and fields[1] else None
+            station = fields[2] if len(fields) > 2 and fields[2] else os.path.splitext(os.path.basename(fields[0]))[0]
+            jobs.append({"station": station, "obs_file_path": obs_file_path, "nav_file_path": nav_file_path})
+    return jobs
+
+
+# İşçi başlatıcı: efemeris indeksleri her işçiye bir kez gönderilir (spawn/forkserver için)
+def _init_worker(ephemeris_indexes):
+    _shared["ephemeris_indexes"] = ephemeris_indexes
+
+
+# Function to process one station-day in a worker and write its outputs
+def _run_job(job, output_directory, output_format="binary"):
+    started = time.perf_counter()
+    try:
+        ephemeris_index = _shared["ephemeris_indexes"][job["nav_file_path"]]
+        obs_header_data = obs_reader.decode_obs_header_data(job["obs_file_path"])
+        if obs_header_data["rinex_version"] is None:
+            raise ValueError(f"{job['obs_file_path']} is not a RINEX observation file")
+        XYZ0 = obs_header_data['approx_position_xyz']
+
+        # Uydu konumları parça parça çözülürken yazılır; istasyon-günün tamamı bellekte tutulmaz
+        output_ext = {file_format: ext for ext, file_format in spp_writer.OUTPUT_FORMATS.items()}[output_format]
+        with spp_writer.open_output(
+                os.path.join(output_directory, f"{job['station']}_satellite_positions{output_ext}"), output_format,
+                {"obs_file_path": job["obs_file_path"], "nav_file_path": job["nav_file_path"],
+                 "approx_position_xyz": XYZ0}) as write_epoch:
+            output = spp_processing.process_epochs(
+                obs_reader.iter_obs_epochs(job["obs_file_path"], obs_codes=spp_processing.SPP_OBS_CODES),
+                ephemeris_index, XYZ0, write_epoch=write_epoch)
+
+        solution = output["solution"]
+        epochs_solved = int(np.isfinite(solution["xyz"]).all(axis=1).sum())
+        with open(os.path.join(output_directory, f"{job['station']}_solution.json"), "w") as file:
+            json.dump({
+                "obs_file_path": job["obs_file_path"],
+                "nav_file_path": job["nav_file_path"],
+                "approx_position_xyz": XYZ0,
+                "xyz": np.where(np.isnan(solution["xyz"]), None, solution["xyz"]).tolist(),
+                "dtr": np.where(np.isnan(solution["dtr"]), None, solution["dtr"]).tolist(),
+                "num_satellites": solution["num_satellites"].tolist(),
+                "converged": solution["converged"].tolist()
+            }, file)
+
+        result = {"status": "ok", "epochs": len(solution["xyz"]), "epochs_solved": epochs_solved,
+                  "seconds": time.perf_counter() - started}
+        if not epochs_solved:
+            # Hiç çözüm yoksa (ör. istasyonun uydularını içermeyen nav dosyası) iş başarısız sayılır
+            result.update(status="failed", error="no epoch could be solved (check the navigation file)")
+        return result
+    except Exception as e:
+        return {"status": "failed", "error": f"{type(e).__name__}: {e}", "traceback": traceback.format_exc(),
+                "seconds": time.perf_counter() - started}
+
+
+# Function to run many station-days on a bounded worker pool
+def run_batch(jobs, output_directory, num_workers=None, output_format="binary"):
+    """
+    İstasyon-gün işlerini sınırlı bir süreç havuzunda çalıştırır. Aynı nav dosyasını kullanan
+    tüm istasyonlar tek bir ayrıştırılmış efemeris indeksini paylaşır. Bir işin hatası diğerlerini
+    durdurmaz; sonuçlar ve özet (summary.json) output_directory altına yazılır. Uydu konumları
+    output_format'a göre ikili (.spb) ya da JSON satırları (.jsonl) olarak yazılır (spp_writer).
+
+    Returns:
+        dict: İş sonuçları, başarısızlıklar ve verim (epoch/s) bilgisini içeren özet.
+    """
+    os.makedirs(output_directory, exist_ok=True)
+    started = time.perf_counter()
+    num_workers = num_workers or multiprocessing.cpu_count()
+    # Çağıranın iş sözlükleri değiştirilmez (istasyon adları aşağıda yeniden adlandırılabilir)
+    jobs = [dict(job) for job in jobs]
+
+    # İstasyon adları çakışmasın: tekrarlanan ada, hiçbir istasyonun kullanmadığı ilk _n eki verilir
+    used = {job["station"] for job in jobs}
+    assigned = set()
+    next_suffix = {}
+    for job in jobs:
+        station = job["station"]
+        if station in assigned:
+            count = next_suffix.get(station, 1)
+            while f"{station}_{count}" in used:
+                count += 1
+            next_suffix[station] = count + 1
+            job["station"] = f"{station}_{count}"
+            used.add(job["station"])
+        assigned.add(job["station"])
+
+    # Her nav dosyası ana süreçte bir kez ayrıştırılır
+    results = {}
+    ephemeris_indexes = {}
+    for nav_file_path in sorted({job["nav_file_path"] for job in jobs if job["nav_file_path"]}):
+        try:
+            ephemeris_indexes[nav_file_path] = nav_reader.build_ephemeris_index(
+                nav_reader.decode_nav_body_data(nav_file_path))
+        except Exception as e:
+            ephemeris_indexes[nav_file_path] = f"{type(e).__name__}: {e}"
+
+    runnable = []
+    for job in jobs:
+        ephemeris_index = ephemeris_indexes.get(job["nav_file_path"])
+        if ephemeris_index is None:
+            results[job["station"]] = {"status": "failed", "error": "no navigation file for this station", "seconds": 0.0}
+        elif isinstance(ephemeris_index, str):
+            results[job["station"]] = {"status": "failed", "error": f"navigation file: {ephemeris_index}", "seconds": 0.0}
+        else:
+            runnable.append(job)
+    ephemeris_indexes = {key: value for key, value in ephemeris_indexes.items() if not isinstance(value, str)}
+
+    context = multiprocessing.get_context()
+    if context.get_start_method() == 'fork':
+        _init_worker(ephemeris_indexes)
+        executor = ProcessPoolExecutor(num_workers, mp_context=context)
+    else:
+        executor = ProcessPoolExecutor(num_workers, mp_context=context,
+                                       initializer=_init_worker, initargs=(ephemeris_indexes,))
+
+    try:
+        with executor:
+            futures = {executor.submit(_run_job, job, output_directory, output_format): job for job in runnable}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"status": "failed", "error": f"{type(e).__name__}: {e}", "seconds": 0.0}
+                results[job["station"]] = result
+                print(f"{job['station']}: {result['status']} ({result['seconds']:.2f} s)")
+    finally:
+        _shared.clear()
+
+    elapsed = time.perf_counter() - started
+    total_epochs = sum(result.get("epochs", 0) for result in results.values())
+    summary = {
+        "jobs": len(jobs),
+        "succeeded": sum(result["status"] == "ok" for result in results.values()),
+        "failed": sum(result["status"] != "ok" for result in results.values()),
+        "workers": num_workers,
+        "elapsed_seconds": elapsed,
+        "epochs": total_epochs,
+        "epochs_per_second": total_epochs / elapsed if elapsed > 0 else None,
+        "stations": {job["station"]: dict(results[job["station"]], obs_file_path=job["obs_file_path"],
+                                          nav_file_path=job["nav_file_path"]) for job in jobs}
+    }
+    with open(os.path.join(output_directory, "summary.json"), "w") as file:
+        json.dump(summary, file, indent=2)
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch SPP processing of many station-days")
+    parser.add_argument("input", help="directory with RINEX files, or a manifest of 'obs,nav[,station]' lines")
+    parser.add_argument("--output-dir", default="spp_output")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output-format", choices=sorted(spp_writer.OUTPUT_FORMATS.values()), default="binary",
+                        help="satellite position output: compact binary records (.spb) or JSON lines (.jsonl)")
+    args = parser.parse_args()
+
+    jobs = find_jobs(args.input) if os.path.isdir(args.input) else read_manifest(args.input)
+    summary = run_batch(jobs, args.output_dir, args.workers, args.output_format)
+    print(f"{summary['succeeded']}/{summary['jobs']} succeeded, "
+          f"{summary['epochs']} epochs in {summary['elapsed_seconds']:.2f} s")
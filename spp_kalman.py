@@ -0,0 +1,212 @@
+import numpy as np
+
+import spp_solver
+
+# Işık hızı (m/s)
+c = 299792458.0
+
+# Varsayılan süreç gürültüsü spektral yoğunlukları:
+# "acceleration" eksen başına ivme (m²/s³), "clock_bias" saat fazı (m²/s), "clock_drift" saat hızı (m²/s³)
+DEFAULT_PROCESS_NOISE = {"acceleration": 1.0, "clock_bias": 10.0, "clock_drift": 1.0}
+
+# Pseudorange ölçüm standart sapması (m)
+PSEUDORANGE_SIGMA = 3.0
+
+# Soğuk başlangıçtaki hız belirsizliği (m/s); hız ilk epoch'ta bilinmez
+INITIAL_VELOCITY_SIGMA = 100.0
+
+# Bir sistemin ortanca ön-fit artığı bundan büyükse (m) alıcı saati sıçramış sayılır (ör. 1 ms ayarı)
+CLOCK_JUMP_THRESHOLD = 1.0e4
+
+# İki epoch arası bundan uzunsa (s) filtre soğuk başlangıçla yeniden kurulur
+MAX_PREDICTION_GAP = 300.0
+
+
+class KinematicFilter:
+    """
+    Hareketli alıcı için genişletilmiş Kalman filtresi (EKF). Durum vektörü konum (3), hız (3),
+    sistem başına alıcı saat hatası (m) ve ortak saat hızıdır (m/s); sabit hız modeliyle
+    epoch'tan epoch'a taşınır.
+
+    İlk epoch (ya da uzun bir boşluk sonrası) spp_solver.solve_spp_batch ile iteratif çözülür;
+    sonraki her epoch'ta tahmin edilen durum etrafında tek bir ölçüm güncellemesi yapılır.
+    Bilinmeyen sayısından az uydulu epoch'lar da güncellemeye katılır.
+
+    Args:
+        XYZ0 (list): Soğuk başlangıç için yaklaşık konum.
+        process_noise (dict): DEFAULT_PROCESS_NOISE anahtarlarından değiştirilecek olanlar.
+        pseudorange_sigma (float): Ölçüm standart sapması (m).
+        systems (tuple): Saat bilinmeyeni kestirilen uydu sistemleri.
+    """
+
+    def __init__(self, XYZ0, process_noise=None, pseudorange_sigma=PSEUDORANGE_SIGMA,
+                 systems=spp_solver.SPP_SYSTEMS):
+        self.XYZ0 = np.asarray(XYZ0, dtype=np.float64)
+        self.process_noise = dict(DEFAULT_PROCESS_NOISE, **(process_noise or {}))
+        self.pseudorange_sigma = pseudorange_sigma
+        self.systems = tuple(systems)
+        self.num_states = 7 + len(self.systems)
+        self.reset()
+
+    def reset(self):
+        self.x = None
+        self.P = None
+        self.time = None
+        self.clock_initialized = np.zeros(len(self.systems), dtype=bool)
+
+    @property
+    def initialized(self):
+        return self.x is not None
+
+    def _clock_slice(self):
+        return slice(6, 6 + len(self.systems))
+
+    def _cold_start(self, sat_xyz, dts, pseudorange, system_index):
+        mask = np.ones((1, len(pseudorange)), dtype=bool)
+        solution = spp_solver.solve_spp_batch(sat_xyz[None], dts[None], pseudorange[None], mask, self.XYZ0,
+                                              system_index=system_index[None], num_systems=len(self.systems))
+        if not np.isfinite(solution["xyz"][0]).all():
+            return None
+
+        x = np.zeros(self.num_states)
+        x[:3] = solution["xyz"][0]
+        cdtr = c * np.concatenate(([0.0], solution["system_bias"][0])) + c * solution["dtr"][0]
+        self.clock_initialized = np.isfinite(cdtr)
+        x[self._clock_slice()] = np.where(self.clock_initialized, cdtr, 0.0)
+
+        P = np.zeros((self.num_states, self.num_states))
+        P[:3, :3] = np.eye(3) * (10.0 * self.pseudorange_sigma) ** 2
+        P[3:6, 3:6] = np.eye(3) * INITIAL_VELOCITY_SIGMA ** 2
+        clocks = self._clock_slice()
+        P[clocks, clocks] = np.eye(len(self.systems)) * (10.0 * self.pseudorange_sigma) ** 2
+        P[-1, -1] = (c * 1e-6) ** 2
+        self.x, self.P = x, P
+        return solution["iterations"][0]
+
+    def transition(self, dt):
+        """
+        dt saniyelik durum geçiş matrisini (F) ve süreç gürültüsü kovaryansını (Q) döndürür.
+        """
+        n = self.num_states
+        clocks = self._clock_slice()
+        F = np.eye(n)
+        F[:3, 3:6] = np.eye(3) * dt
+        F[clocks, -1] = dt
+
+        q_a, q_b, q_d = (self.process_noise[key] for key in ("acceleration", "clock_bias", "clock_drift"))
+        Q = np.zeros((n, n))
+        Q[:3, :3] = np.eye(3) * q_a * dt ** 3 / 3
+        Q[:3, 3:6] = Q[3:6, :3] = np.eye(3) * q_a * dt ** 2 / 2
+        Q[3:6, 3:6] = np.eye(3) * q_a * dt
+        # Sistem saatleri ortak saat hızını paylaşır; faz gürültüsü her sistemde ayrıdır
+        Q[clocks, clocks] = q_d * dt ** 3 / 3 + np.eye(len(self.systems)) * q_b * dt
+        Q[clocks, -1] = Q[-1, clocks] = q_d * dt ** 2 / 2
+        Q[-1, -1] = q_d * dt
+        return F, Q
+
+    def predict(self, time):
+        """
+        Durumu time anına (sürekli GPS saniyesi) taşır.
+        """
+        dt = time - self.time
+        if dt != 0.0:
+            F, Q = self.transition(dt)
+            self.x = F @ self.x
+            self.P = F @ self.P @ F.T + Q
+        self.time = time
+
+    def update(self, sat_xyz, dts, pseudorange, system_index):
+        """
+        Tahmin edilen durum etrafında doğrusallaştırılmış tek bir ölçüm güncellemesi yapar.
+
+        Args:
+            sat_xyz (ndarray): uydu x 3 uydu konumları.
+            dts, pseudorange (ndarray): Uydu saat hataları (s) ve pseudorange'ler (m).
+            system_index (ndarray): Uyduların self.systems içindeki indeksi.
+        """
+        clocks = self._clock_slice()
+        corrected_range = pseudorange + c * dts
+
+        dXYZ = sat_xyz - self.x[:3]
+        rho = np.sqrt(np.einsum('sk,sk->s', dXYZ, dXYZ))
+        residual = corrected_range - rho - self.x[clocks][system_index]
+
+        # Yeni görülen sistemin saati ve saat sıçramaları ortanca artıktan başlatılır
+        for system in np.unique(system_index):
+            system_residual = np.median(residual[system_index == system])
+            if not self.clock_initialized[system] or abs(system_residual) > CLOCK_JUMP_THRESHOLD:
+                state = 6 + system
+                self.x[state] += system_residual
+                self.P[state, :] = 0.0
+                self.P[:, state] = 0.0
+                self.P[state, state] = (10.0 * self.pseudorange_sigma) ** 2
+                self.clock_initialized[system] = True
+                residual[system_index == system] -= system_residual
+
+        H = np.zeros((len(rho), self.num_states))
+        H[:, :3] = -dXYZ / rho[:, None]
+        H[np.arange(len(rho)), 6 + system_index] = 1.0
+        R = np.eye(len(rho)) * self.pseudorange_sigma ** 2
+
+        PHt = self.P @ H.T
+        K = np.linalg.solve(H @ PHt + R, PHt.T).T
+        self.x = self.x + K @ residual
+        # Joseph biçimi: kovaryans simetrik ve pozitif tanımlı kalır
+        I_KH = np.eye(self.num_states) - K @ H
+        self.P = I_KH @ self.P @ I_KH.T + K @ R @ K.T
+
+    def step(self, time, epoch_positions):
+        """
+        Bir epoch'u işler: gerekiyorsa soğuk başlangıç, değilse tahmin + tek ölçüm güncellemesi.
+
+        Args:
+            time (float): Epoch zamanı (sürekli GPS saniyesi).
+            epoch_positions (dict): spp_processing.compute_epoch_positions çıktısı ({prn: {...}});
+                "iono_delay"/"tropo_delay" varsa pseudorange'den çıkarılır.
+
+        Returns:
+            dict: "xyz", "velocity", "dtr", "system_bias", "position_sigma", "num_satellites",
+            "iterations" (soğuk başlangıçta çözücü iterasyonu, sonra 1) ve "cold_start".
+        """
+        positions = [(prn, position) for prn, position in epoch_positions.items() if prn[0] in self.systems]
+        sat_xyz = np.array([(position['X'], position['Y'], position['Z']) for _, position in positions]).reshape(-1, 3)
+        dts = np.array([position['dts'] for _, position in positions])
+        # Atmosfer gecikmeleri hesaplanmışsa (spp_processing corrections) düzeltilmiş uzaklık kullanılır
+        pseudorange = np.array([position['pseudorange'] - position.get('iono_delay', 0.0)
+                                - position.get('tropo_delay', 0.0) for _, position in positions])
+        system_index = np.array([self.systems.index(prn[0]) for prn, _ in positions], dtype=np.int64)
+
+        if self.initialized and (time - self.time > MAX_PREDICTION_GAP or time < self.time):
+            self.reset()
+
+        cold_start = not self.initialized
+        if cold_start:
+            iterations = self._cold_start(sat_xyz, dts, pseudorange, system_index) if len(positions) else None
+            if iterations is None:
+                return self._result(len(positions), 0, cold_start)
+            self.time = time
+        else:
+            self.predict(time)
+            iterations = 0
+            if len(positions):
+                self.update(sat_xyz, dts, pseudorange, system_index)
+                iterations = 1
+        return self._result(len(positions), iterations, cold_start)
+
+    def _result(self, num_satellites, iterations, cold_start):
+        if not self.initialized:
+            nan3 = np.full(3, np.nan)
+            return {"xyz": nan3, "velocity": nan3, "dtr": np.nan, "system_bias": np.full(len(self.systems) - 1, np.nan),
+                    "position_sigma": nan3, "num_satellites": num_satellites, "iterations": iterations,
+                    "cold_start": cold_start}
+        cdtr = np.where(self.clock_initialized, self.x[self._clock_slice()], np.nan)
+        return {
+            "xyz": self.x[:3].copy(),
+            "velocity": self.x[3:6].copy(),
+            "dtr": cdtr[0] / c,
+            "system_bias": (cdtr[1:] - cdtr[0]) / c,
+            "position_sigma": np.sqrt(np.diag(self.P)[:3]),
+            "num_satellites": num_satellites,
+            "iterations": iterations,
+            "cold_start": cold_start
+        }
@@ -0,0 +1,628 @@
+import argparse
+import multiprocessing
+import time
+from collections import deque
+from contextlib import ExitStack
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+import atmosphere
+import instrumentation
+import nav_reader
+import obs_reader
+import precise_orbit
+import precise_reader
+import rinex_cache
+import spp_kalman
+import spp_solver
+import spp_writer
+from brdc_calculator import (EPHEMERIS_KEYS, GLONASS_EPHEMERIS_KEYS, build_orbit_tables, calculate_glonass_positions,
+                             calculate_satellite_positions, calculate_satellite_positions_table, stack_ephemerides)
+from gps_timer import gps_time_ns, gps_week_sow
+
+# Işık hızı (m/s)
+c = 299792458.0
+
+# Dünyanın dönüş hızı (rad/s)
+OMEGA_dot_Earth = 7.2921151467e-5
+
+# Uydu konumu ve SPP çözümünde kullanılan gözlem kodları; okuyucular sadece bunları çözer
+SPP_OBS_CODES = ("C1C",)
+
+# Varsayılan parça (chunk) boyutu: her işçiye gönderilen epoch sayısı
+DEFAULT_CHUNK_SIZE = 500
+
+# İşçi süreçlerinde salt okunur paylaşılan veriler (efemeris indeksi, XYZ0)
+_shared = {}
+
+# GLONASS entegrasyon düğümlerinin süreç başına önbelleği; parçalar arasında yeniden kullanılır
+_glonass_nodes = {}
+
+
+# Function to format an epoch dict as a "YYYY MM DD HH mm ss" string (fractional seconds kept, e.g. 10 Hz)
+def epoch_time_string(epoch):
+    return f"{epoch['year']} {epoch['month']} {epoch['day']} {epoch['hour']} {epoch['minute']} {epoch['second']:g}"
+
+
+# Function to return the GPS week and seconds of week of an epoch dict, without string round trips
+def epoch_gps_week_sow(epoch):
+    # obs_reader epoch'ları tam sayı nanosaniye GPS zamanını ("time") taşır
+    time_ns = epoch.get("time")
+    if time_ns is None:
+        time_ns = gps_time_ns(epoch["year"], epoch["month"], epoch["day"], epoch["hour"], epoch["minute"],
+                              epoch["second"])
+    return gps_week_sow(time_ns)
+
+
+# Function to parse an ISO date/time string ("2024-05-02T10:00:00", GPS time scale) into GPS ns
+def parse_gps_time(text):
+    moment = datetime.fromisoformat(text)
+    return gps_time_ns(moment.year, moment.month, moment.day, moment.hour, moment.minute,
+                       moment.second + moment.microsecond / 1e6)
+
+
+# Function to return the session span (continuous GPS seconds) from the TIME OF FIRST/LAST OBS
+# header records; None where a record is missing
+def session_span(obs_header_data):
+    span = []
+    time_system = obs_reader.obs_time_system(obs_header_data)
+    for key in ("time_of_first_obs", "time_of_last_obs"):
+        obs_time = obs_header_data.get(key)
+        if obs_time is None:
+            span.append(None)
+            continue
+        # Epoch'larla aynı şekilde (başlığın zaman sisteminden GPS zamanına) çevrilir
+        span.append(gps_time_ns(obs_time["year"], obs_time["month"], obs_time["day"], obs_time["hour"],
+                                obs_time["minute"], obs_time["second"], time_system) / 1e9)
+    return tuple(span)
+
+
+# Function to return the orbit model groups of stacked satellite queries: [(rows, ephemerides, function)]
+def _orbit_groups(nav_records, prns, orbit_tables=None, precise_orbits=None):
+    # Hassas ürün ve tablo modunda tüm sorgular tek grupta hesaplanır
+    if precise_orbits is not None:
+        return [(np.arange(len(prns)), np.asarray(prns),
+                 lambda prn_array, t: precise_orbit.calculate_precise_positions(precise_orbits, prn_array, t))]
+    if orbit_tables is not None:
+        return [(np.arange(len(nav_records)), nav_records,
+                 lambda records, t: calculate_satellite_positions_table(orbit_tables, records, t, _glonass_nodes))]
+
+    # GLONASS kayıtları durum vektörü entegrasyonuyla, diğerleri Kepler modeliyle hesaplanır
+    is_glonass = np.array([prn[0] == 'R' for prn in prns], dtype=bool)
+    groups = []
+    for selected, keys, function in (
+            (~is_glonass, EPHEMERIS_KEYS, calculate_satellite_positions),
+            (is_glonass, GLONASS_EPHEMERIS_KEYS,
+             lambda ephemerides, t: calculate_glonass_positions(ephemerides, t, _glonass_nodes))):
+        rows = np.flatnonzero(selected)
+        if rows.size:
+            groups.append((rows, stack_ephemerides([nav_records[row] for row in rows], keys), function))
+    return groups
+
+
+# Function to evaluate the orbit model groups at the emission times of all queries
+def _evaluate_orbits(groups, t_emi):
+    values = np.full((4, len(t_emi)), np.nan)
+    for rows, ephemerides, function in groups:
+        if rows.size:
+            values[:, rows] = function(ephemerides, t_emi[rows])
+    return values
+
+
+# Function to compute corrected satellite positions for a list of decoded epochs in one pass
+def compute_chunk_positions(epochs, ephemeris_index, XYZ0, orbit_tables=None, precise_orbits=None):
+    """
+    compute_epoch_positions'ın toplu sürümü: tüm epoch'ların uydu/efemeris çiftleri bir kez
+    yığılır (stack_ephemerides) ve gönderim zamanındaki konumlar iki çağrıda
+    (calculate_satellite_positions / calculate_glonass_positions) hesaplanır; Dünya dönüşü
+    düzeltmesi de tüm uydular için birlikte yapılır. Skaler calculate_satellite_position
+    sadece referans olarak kalır.
+
+    Returns:
+        list: Her epoch için (epoch_positions, prn_list).
+    """
+    # Ölçüm açıksa efemeris seçimi, yörünge ve dönüş düzeltmesi süreleri ayrı ayrı toplanır
+    profiling = instrumentation.enabled
+    if profiling:
+        started = time.perf_counter()
+
+    prn_lists = []
+    query_epoch = []
+    query_prn = []
+    query_nav = []
+    query_pseudorange = []
+    query_t_rec = []
+    for epoch_idx, epoch_data in enumerate(epochs):
+        prn_list = []
+        # t_rec değeri (alıcı zamanı) - MATLAB'daki trec'e denk gelir
+        gps_week, t_rec = epoch_gps_week_sow(epoch_data['epoch'])
+
+        for sat_data in epoch_data['observations']:
+            prn = sat_data['prn']
+
+            # Pseudorange değerini al (C1C - MATLAB'daki OBS(i,2)'ye denk gelir); değeri boş olup
+            # sadece LLI/SNR'si yazılmış kodlar None'dır
+            pseudorange = sat_data['observation_data'].get('C1C')
+            if pseudorange is None or prn in prn_list:
+                continue
+            prn_list.append(prn)
+
+            # Bu PRN için epoch zamanına en uygun (sağlıklı, fit aralığı içinde) NAV verisini bul;
+            # hassas ürün modunda efemeris seçilmez, konum ve saat ürün düğümlerinden enterpole edilir
+            if precise_orbits is not None:
+                nav_data = prn if prn in precise_orbits["prn_index"] else None
+            else:
+                nav_data = nav_reader.select_ephemeris(ephemeris_index, prn, gps_week, t_rec)
+            if not nav_data:
+                instrumentation.count("spp.missing_ephemeris")
+                continue
+
+            query_epoch.append(epoch_idx)
+            query_prn.append(prn)
+            query_nav.append(nav_data)
+            query_pseudorange.append(pseudorange)
+            query_t_rec.append(t_rec)
+        prn_lists.append(prn_list)
+
+    if profiling:
+        lookup_done = time.perf_counter()
+        instrumentation.add_time("spp.ephemeris_lookup", lookup_done - started)
+
+    # t_emi hesapla (sinyal gönderim zamanı) ve uydu saat hatasıyla düzelterek tekrar hesapla
+    pseudorange = np.array(query_pseudorange, dtype=np.float64)
+    t_rec = np.array(query_t_rec, dtype=np.float64)
+    groups = _orbit_groups(query_nav, query_prn, orbit_tables, precise_orbits)
+    t_emi = t_rec - pseudorange / c
+    X, Y, Z, dts = _evaluate_orbits(groups, t_emi)
+    t_emi = t_rec - pseudorange / c - dts
+    X, Y, Z, dts = _evaluate_orbits(groups, t_emi)
+    if profiling:
+        orbit_done = time.perf_counter()
+        instrumentation.add_time("spp.orbit", orbit_done - lookup_done)
+
+    # Uydu ve alıcı arasındaki fark vektörü (dXYZ) ve sinyalin yayılma süresi (tau)
+    dXYZ = np.stack([X - XYZ0[0], Y - XYZ0[1], Z - XYZ0[2]], axis=-1)
+    tau = np.sqrt(np.einsum('sk,sk->s', dXYZ, dXYZ)) / c
+
+    # Dünya dönüşü düzeltmesi (z ekseni etrafında OMEGA_dot_Earth * tau)
+    cos_rotation = np.cos(OMEGA_dot_Earth * tau)
+    sin_rotation = np.sin(OMEGA_dot_Earth * tau)
+    X_corrected = cos_rotation * X + sin_rotation * Y
+    Y_corrected = -sin_rotation * X + cos_rotation * Y
+
+    # Hassas ürünün kapsamı dışındaki ya da düğümleri eksik uydular atlanır
+    valid = (np.isfinite(X) & np.isfinite(dts)).tolist()
+    results = [({}, prn_list) for prn_list in prn_lists]
+    for query, (epoch_idx, prn, row_valid, X_row, Y_row, Z_row, dts_row, pseudorange_row, t_emi_row, dXYZ_row,
+                tau_row) in enumerate(zip(query_epoch, query_prn, valid, X_corrected.tolist(), Y_corrected.tolist(),
+                                          Z.tolist(), dts.tolist(), query_pseudorange, t_emi.tolist(),
+                                          dXYZ.tolist(), tau.tolist())):
+        if not row_valid:
+            instrumentation.count("spp.missing_ephemeris")
+            continue
+        results[epoch_idx][0][prn] = {
+            'X': X_row,
+            'Y': Y_row,
+            'Z': Z_row,
+            'dts': dts_row,
+            'pseudorange': pseudorange_row,
+            't_emi': t_emi_row,
+            'dXYZ': dXYZ_row,
+            'tau': tau_row
+        }
+
+    if profiling:
+        instrumentation.add_time("spp.rotation", time.perf_counter() - orbit_done)
+        instrumentation.count("spp.epochs", len(results))
+        instrumentation.count("spp.satellites", sum(len(epoch_positions) for epoch_positions, _ in results))
+    return results
+
+
+# Function to compute corrected satellite positions for one decoded epoch
+def compute_epoch_positions(epoch_data, ephemeris_index, XYZ0, orbit_tables=None, precise_orbits=None):
+    """
+    Bir epoch'taki her GPS/GLONASS uydusu için gönderim zamanındaki konumu, saat hatasını ve
+    Dünya dönüşü düzeltmesini hesaplar (tek epoch'luk compute_chunk_positions).
+
+    Args:
+        epoch_data (dict): obs_reader epoch sözlüğü ("epoch", "observations").
+        ephemeris_index (dict): nav_reader.build_ephemeris_index çıktısı.
+        XYZ0 (list): Alıcı yaklaşık konumu.
+        orbit_tables (dict): İsteğe bağlı brdc_calculator.build_orbit_tables çıktısı; verilirse
+            uydu konumları kesin model yerine tablo polinomlarından hesaplanır.
+        precise_orbits (dict): İsteğe bağlı precise_orbit.build_precise_orbits çıktısı; verilirse
+            konum ve saat hatası yayın efemerisi yerine SP3/CLK ürününden enterpole edilir.
+
+    Returns:
+        tuple: (epoch_positions, prn_list)
+    """
+    return compute_chunk_positions([epoch_data], ephemeris_index, XYZ0, orbit_tables, precise_orbits)[0]
+
+
+# Function to build the atmospheric correction settings from the navigation header
+def atmosphere_corrections(nav_header_data, ionosphere=True, troposphere=True):
+    """
+    Returns:
+        dict: {"ion_alpha", "ion_beta", "troposphere"} - _process_chunk ve filter_epoch'un corrections
+        argümanı. Başlıkta Klobuchar katsayıları yoksa iyonosfer düzeltmesi yapılmaz.
+    """
+    return {"ion_alpha": nav_header_data.get("ion_alpha") if ionosphere else None,
+            "ion_beta": nav_header_data.get("ion_beta") if ionosphere else None,
+            "troposphere": troposphere}
+
+
+# Function to compute the atmospheric delays of stacked epochs and record them in the position dicts
+def _apply_corrections(epochs, epoch_positions, stacked, receiver_xyz, corrections):
+    sat_xyz, dts, pseudorange, mask = stacked
+    sow = [epoch_gps_week_sow(epoch_data['epoch'])[1] for epoch_data in epochs]
+    glonass = np.zeros(mask.shape, dtype=bool)
+    for epoch_idx, positions in enumerate(epoch_positions):
+        glonass[epoch_idx, :len(positions)] = [prn[0] == 'R' for prn in positions]
+
+    delays = atmosphere.atmospheric_delays(sat_xyz, mask, receiver_xyz, sow, corrections.get("ion_alpha"),
+                                           corrections.get("ion_beta"), corrections.get("troposphere", True),
+                                           glonass)
+    iono, tropo, elevation = (values.tolist() for values in
+                              (delays["iono"], delays["tropo"], np.degrees(delays["elevation"])))
+    for epoch_idx, positions in enumerate(epoch_positions):
+        for sat_idx, position in enumerate(positions.values()):
+            position['iono_delay'] = iono[epoch_idx][sat_idx]
+            position['tropo_delay'] = tropo[epoch_idx][sat_idx]
+            position['elevation'] = elevation[epoch_idx][sat_idx]
+    return sat_xyz, dts, pseudorange - delays["iono"] - delays["tropo"], mask
+
+
+# Function to process a list of epochs: satellite positions and the batched receiver solution
+def _process_chunk(epochs, ephemeris_index, XYZ0, orbit_tables=None, corrections=None, precise_orbits=None):
+    results = compute_chunk_positions(epochs, ephemeris_index, XYZ0, orbit_tables, precise_orbits)
+    epoch_positions = [positions for positions, _ in results]
+    stacked = spp_solver.stack_epoch_positions(epoch_positions)
+    if corrections is not None:
+        # İyonosfer/troposfer gecikmeleri parçanın tüm uydu-epoch çiftleri için tek geçişte hesaplanır
+        stacked = _apply_corrections(epochs, epoch_positions, stacked, XYZ0, corrections)
+    with instrumentation.timer("spp.solve"):
+        solution = spp_solver.solve_spp_batch(*stacked, XYZ0,
+                                              system_index=spp_solver.stack_epoch_systems(epoch_positions))
+    return results, solution
+
+
+# İşçi başlatıcı: paylaşılan veriler her işçiye bir kez gönderilir (spawn/forkserver için)
+def _init_worker(ephemeris_index, XYZ0, orbit_tables=None, instrument=False, corrections=None, precise_orbits=None):
+    _shared["ephemeris_index"] = ephemeris_index
+    _shared["XYZ0"] = XYZ0
+    _shared["orbit_tables"] = orbit_tables
+    _shared["corrections"] = corrections
+    _shared["precise_orbits"] = precise_orbits
+    if instrument:
+        instrumentation.enable()
+
+
+# İşçide bir parçayı işler; ölçüm açıksa işçinin ölçümleri sonuçla birlikte ana sürece gönderilir
+def _process_shared_chunk(epochs):
+    result = _process_chunk(epochs, _shared["ephemeris_index"], _shared["XYZ0"], _shared["orbit_tables"],
+                            _shared["corrections"], _shared["precise_orbits"])
+    if not instrumentation.enabled:
+        return result, None
+    worker_report = instrumentation.snapshot()
+    instrumentation.reset()
+    return result, worker_report
+
+
+# Function to merge (chunk epochs, chunk result) pairs into epoch-ordered dicts and concatenated solution
+# arrays; with write_epoch the satellite positions are written epoch by epoch instead of being kept
+def _merge_results(chunk_results, write_epoch=None):
+    satellite_positions = {}
+    epoch_prns = {}
+    solutions = []
+    epoch_idx = 0
+    for epochs, (results, solution) in chunk_results:
+        for epoch_data, (epoch_positions, prn_list) in zip(epochs, results):
+            if write_epoch is not None:
+                write_epoch(epoch_idx, epoch_positions, epoch_time_string(epoch_data['epoch']),
+                            epoch_data['epoch'].get('time'))
+            else:
+                satellite_positions[epoch_idx] = epoch_positions
+                epoch_prns[epoch_idx] = prn_list
+            epoch_idx += 1
+        solutions.append(solution)
+
+    if solutions:
+        solution = {key: np.concatenate([part[key] for part in solutions]) for key in solutions[0]}
+    else:
+        solution = spp_solver.solve_spp_batch(*spp_solver.stack_epoch_positions([]), [0.0, 0.0, 0.0])
+    if write_epoch is not None:
+        return {"satellite_positions": None, "epoch_prns": None, "solution": solution}
+    return {"satellite_positions": satellite_positions, "epoch_prns": epoch_prns, "solution": solution}
+
+
+# Function to split an epoch sequence (list, ObsBodyView or stream) into lists of chunk_size epochs
+def _chunks(epochs, chunk_size):
+    epochs = iter(epochs)
+    while True:
+        chunk = list(islice(epochs, chunk_size))
+        if not chunk:
+            break
+        yield chunk
+
+
+# Function to process epochs in a single process
+def process_epochs(epochs, ephemeris_index, XYZ0, chunk_size=DEFAULT_CHUNK_SIZE, orbit_tables=None,
+                   corrections=None, precise_orbits=None, write_epoch=None):
+    """
+    Epoch'ları tek süreçte işler. Dönüş yapısı process_epochs_parallel ile aynıdır:
+    {"satellite_positions", "epoch_prns", "solution"}.
+
+    write_epoch (spp_writer.open_output) verilirse her epoch'un uydu konumları parçası çözülür
+    çözülmez yazılır ve bellekte tutulmaz; "satellite_positions" ve "epoch_prns" None döner.
+    """
+    return _merge_results(((chunk, _process_chunk(chunk, ephemeris_index, XYZ0, orbit_tables, corrections,
+                                                  precise_orbits))
+                           for chunk in _chunks(epochs, chunk_size)), write_epoch)
+
+
+# Function to process epochs on a process pool, chunk by chunk, merged back in epoch order
+def process_epochs_parallel(epochs, ephemeris_index, XYZ0, num_workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                            orbit_tables=None, corrections=None, precise_orbits=None, write_epoch=None):
+    """
+    Epoch aralığını chunk_size'lık parçalara bölüp bir süreç havuzunda işler.
+
+    Efemeris indeksi görevlerle birlikte gönderilmez: 'fork' ile başlatılan işçiler ana
+    süreçteki kopyayı miras alır, diğer başlatma yöntemlerinde işçi başına bir kez gönderilir.
+    Epochs bir akış (obs_reader.iter_obs_epochs) olabilir; aynı anda en fazla
+    2 * num_workers parça bellekte tutulur. Sonuç (write_epoch dahil) process_epochs ile birebir aynıdır.
+    """
+    num_workers = num_workers or multiprocessing.cpu_count()
+    context = multiprocessing.get_context()
+    if context.get_start_method() == 'fork':
+        # İşçiler ana sürecin o ana kadarki ölçümlerini de miras alır; iki kez sayılmasınlar
+        _init_worker(ephemeris_index, XYZ0, orbit_tables, corrections=corrections, precise_orbits=precise_orbits)
+        executor = ProcessPoolExecutor(num_workers, mp_context=context, initializer=instrumentation.reset)
+    else:
+        executor = ProcessPoolExecutor(num_workers, mp_context=context, initializer=_init_worker,
+                                       initargs=(ephemeris_index, XYZ0, orbit_tables, instrumentation.enabled,
+                                                 corrections, precise_orbits))
+
+    # Function to unpack a worker result, adding the worker's measurements to this process
+    def chunk_result(chunk, future):
+        result, worker_report = future.result()
+        if worker_report is not None:
+            instrumentation.merge(worker_report)
+        return chunk, result
+
+    def ordered_results():
+        pending = deque()
+        with executor:
+            for chunk in _chunks(epochs, chunk_size):
+                pending.append((chunk, executor.submit(_process_shared_chunk, chunk)))
+                if len(pending) >= 2 * num_workers:
+                    yield chunk_result(*pending.popleft())
+            while pending:
+                yield chunk_result(*pending.popleft())
+
+    try:
+        return _merge_results(ordered_results(), write_epoch)
+    finally:
+        _shared.clear()
+
+
+# Function to solve a single epoch as soon as it is available (live processing)
+def solve_epoch(epoch_data, ephemeris_index, XYZ0, orbit_tables=None, corrections=None, precise_orbits=None):
+    """
+    Tek bir epoch için uydu konumlarını ve alıcı çözümünü hesaplar.
+
+    Returns:
+        tuple: (epoch_positions, solution) - solution tek epoch'luk spp_solver.solve_spp_batch
+        satırıdır ({"xyz", "dtr", ...}).
+    """
+    results, solution = _process_chunk([epoch_data], ephemeris_index, XYZ0, orbit_tables, corrections, precise_orbits)
+    return results[0][0], {key: value[0] for key, value in solution.items()}
+
+
+# Function to process one epoch with a spp_kalman.KinematicFilter
+def filter_epoch(kinematic_filter, epoch_data, ephemeris_index, XYZ0, orbit_tables=None, corrections=None,
+                 precise_orbits=None):
+    """
+    Returns:
+        tuple: (epoch_positions, result) - result KinematicFilter.step çıktısıdır.
+    """
+    epoch_time = epoch_data["epoch"]["time"] / 1e9
+    approx_xyz = XYZ0
+    if kinematic_filter.initialized and 0.0 <= epoch_time - kinematic_filter.time <= spp_kalman.MAX_PREDICTION_GAP:
+        # Dünya dönüşü düzeltmesi filtrenin bu epoch için tahmin ettiği konuma göre yapılır
+        x = kinematic_filter.x
+        approx_xyz = (x[:3] + x[3:6] * (epoch_time - kinematic_filter.time)).tolist()
+    epoch_positions, _ = compute_epoch_positions(epoch_data, ephemeris_index, approx_xyz, orbit_tables, precise_orbits)
+    if corrections is not None:
+        # Alıcı geometrisi önbellekten gelir; alıcı GEOMETRY_REUSE_DISTANCE kadar yer değiştirince yenilenir
+        _apply_corrections([epoch_data], [epoch_positions], spp_solver.stack_epoch_positions([epoch_positions]),
+                           approx_xyz, corrections)
+    return epoch_positions, kinematic_filter.step(epoch_time, epoch_positions)
+
+
+# Function to run the sequential (Kalman) estimator over an epoch stream
+def filter_epochs(epochs, ephemeris_index, XYZ0, process_noise=None, orbit_tables=None,
+                  systems=spp_solver.SPP_SYSTEMS, corrections=None, precise_orbits=None):
+    """
+    Epoch'ları (liste, ObsBodyView ya da iter_obs_epochs/follow_obs_epochs akışı) sırayla
+    spp_kalman.KinematicFilter'dan geçirir. Filtre kurulduktan sonra uydu konumlarının Dünya dönüşü
+    düzeltmesi sabit XYZ0 yerine filtrenin tahmin ettiği konuma göre yapılır.
+
+    Yields:
+        tuple: (epoch_idx, epoch_data, epoch_positions, result) - result KinematicFilter.step çıktısıdır.
+    """
+    kinematic_filter = spp_kalman.KinematicFilter(XYZ0, process_noise, systems=systems)
+    for epoch_idx, epoch_data in enumerate(epochs):
+        yield (epoch_idx, epoch_data) + filter_epoch(kinematic_filter, epoch_data, ephemeris_index, XYZ0,
+                                                     orbit_tables, corrections, precise_orbits)
+
+
+# Function to process epochs with the sequential estimator (moving receivers)
+def process_epochs_kinematic(epochs, ephemeris_index, XYZ0, process_noise=None, orbit_tables=None,
+                             corrections=None, precise_orbits=None, write_epoch=None):
+    """
+    process_epochs ile aynı yapıda sonuç döndürür (write_epoch dahil); "solution" ayrıca "velocity",
+    "position_sigma" ve "cold_start" dizilerini içerir.
+    """
+    satellite_positions = {}
+    epoch_prns = {}
+    rows = []
+    for epoch_idx, epoch_data, epoch_positions, result in filter_epochs(epochs, ephemeris_index, XYZ0, process_noise,
+                                                                        orbit_tables, corrections=corrections,
+                                                                        precise_orbits=precise_orbits):
+        if write_epoch is not None:
+            write_epoch(epoch_idx, epoch_positions, epoch_time_string(epoch_data['epoch']),
+                        epoch_data['epoch'].get('time'))
+        else:
+            satellite_positions[epoch_idx] = epoch_positions
+            epoch_prns[epoch_idx] = list(epoch_positions)
+        rows.append(result)
+    solution = {key: np.array([row[key] for row in rows]) for key in rows[0]} if rows else {}
+    if write_epoch is not None:
+        return {"satellite_positions": None, "epoch_prns": None, "solution": solution}
+    return {"satellite_positions": satellite_positions, "epoch_prns": epoch_prns, "solution": solution}
+
+
+# Function to follow a growing observation file and position each epoch as soon as it is complete
+def follow_positions(obs_file_path, ephemeris_index, XYZ0, checkpoint_path=None, orbit_tables=None,
+                     systems=obs_reader.OBS_SYSTEMS, poll_interval=obs_reader.FOLLOW_POLL_INTERVAL,
+                     idle_timeout=None, kinematic_filter=None, corrections=None, precise_orbits=None):
+    """
+    obs_reader.follow_obs_epochs ile dosyaya eklenen her tamamlanmış epoch'u okur, uydu konumlarını
+    ve alıcı çözümünü hemen hesaplar. Ekleme ile çözüm arasındaki gecikme yaklaşık poll_interval
+    artı tek epoch'un işlem süresidir. kinematic_filter (spp_kalman.KinematicFilter) verilirse
+    epoch'lar bağımsız çözülmek yerine filtreden geçirilir (filtre durumu checkpoint'e yazılmaz).
+
+    Yields:
+        tuple: (epoch_idx, epoch_data, epoch_positions, solution) - solve_epoch ya da filter_epoch çıktısıyla.
+    """
+    for epoch_idx, epoch_data in obs_reader.follow_obs_epochs(obs_file_path, systems, checkpoint_path,
+                                                              poll_interval, idle_timeout, SPP_OBS_CODES):
+        if kinematic_filter is not None:
+            yield (epoch_idx, epoch_data) + filter_epoch(kinematic_filter, epoch_data, ephemeris_index, XYZ0,
+                                                         orbit_tables, corrections, precise_orbits)
+        else:
+            yield (epoch_idx, epoch_data) + solve_epoch(epoch_data, ephemeris_index, XYZ0, orbit_tables,
+                                                        corrections, precise_orbits)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SPP processing of a RINEX 3 observation/navigation file pair")
+    parser.add_argument("obs_file_path")
+    parser.add_argument("nav_file_path")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes (1 = single process)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--parse-workers", type=int, default=1,
+                        help="decode the observation file with this many processes (memory-mapped chunks)")
+    parser.add_argument("--cache", action="store_true", help="load decoded files through the binary parse cache")
+    parser.add_argument("--systems", default="G", help="satellite systems to use, e.g. GR for GPS + GLONASS")
+    parser.add_argument("--orbit-tables", action="store_true",
+                        help="evaluate satellite orbits from precomputed Chebyshev tables")
+    parser.add_argument("--output", help="write satellite positions to this .spb (binary) or .jsonl file")
+    parser.add_argument("--profile", help="collect per-stage timings and counters and write them to this JSON file")
+    parser.add_argument("--follow", action="store_true",
+                        help="follow a growing observation file and position each epoch as it is appended")
+    parser.add_argument("--checkpoint", help="follow mode: file to keep the read offset in, for resuming")
+    parser.add_argument("--idle-timeout", type=float,
+                        help="follow mode: stop after this many seconds without a new epoch")
+    parser.add_argument("--kinematic", action="store_true",
+                        help="moving receiver: sequential Kalman filter instead of independent epoch solutions")
+    parser.add_argument("--acceleration-noise", type=float, default=spp_kalman.DEFAULT_PROCESS_NOISE["acceleration"],
+                        help="kinematic mode: acceleration process noise (m^2/s^3)")
+    parser.add_argument("--iono", action="store_true",
+                        help="correct pseudoranges with the Klobuchar model (navigation header coefficients)")
+    parser.add_argument("--tropo", action="store_true", help="correct pseudoranges with the Saastamoinen model")
+    parser.add_argument("--start", help="process only epochs from this GPS time on, e.g. 2024-05-02T10:00:00")
+    parser.add_argument("--end", help="process only epochs up to this GPS time (inclusive)")
+    parser.add_argument("--sp3", nargs="+", help="precise orbit (SP3) files to use instead of the broadcast "
+                                                 "ephemerides; add the neighbouring days for day boundaries")
+    parser.add_argument("--clk", nargs="+", help="precise satellite clock (RINEX CLK) files for --sp3")
+    args = parser.parse_args()
+    if args.follow and (args.cache or args.orbit_tables or args.workers > 1):
+        parser.error("--follow cannot be combined with --cache, --orbit-tables or --workers")
+    if args.follow and (args.start or args.end):
+        parser.error("--follow cannot be combined with --start/--end")
+    if args.parse_workers > 1 and (args.follow or args.cache or args.start or args.end):
+        parser.error("--parse-workers cannot be combined with --follow, --cache or --start/--end")
+    if args.sp3 and args.orbit_tables:
+        parser.error("--sp3 cannot be combined with --orbit-tables")
+    if args.clk and not args.sp3:
+        parser.error("--clk needs --sp3")
+    if args.kinematic and args.workers > 1:
+        parser.error("--kinematic runs in a single process; it cannot be combined with --workers")
+    process_noise = {"acceleration": args.acceleration_noise}
+    systems = tuple(args.systems)
+    if args.profile:
+        instrumentation.enable()
+
+    if args.start or args.end:
+        # Zaman penceresi: epoch indeksiyle sadece pencerenin baytları okunur (--cache ile indeks saklanır)
+        obs_header_data = obs_reader.decode_obs_header_data(args.obs_file_path)
+        nav_header_data, nav_body_data = (rinex_cache.load_nav(args.nav_file_path) if args.cache else
+                                          (nav_reader.decode_nav_header_data(args.nav_file_path),
+                                           nav_reader.decode_nav_body_data(args.nav_file_path)))
+        epoch_index = (rinex_cache.load_epoch_index(args.obs_file_path) if args.cache
+                       else obs_reader.build_epoch_index(args.obs_file_path))
+        epochs = obs_reader.ObsBodyView(obs_reader.decode_obs_window_columnar(
+            args.obs_file_path, args.start and parse_gps_time(args.start), args.end and parse_gps_time(args.end),
+            epoch_index=epoch_index, systems=systems, obs_codes=SPP_OBS_CODES))
+    elif args.cache:
+        obs_header_data, columnar = rinex_cache.load_obs(args.obs_file_path, systems=systems, obs_codes=SPP_OBS_CODES)
+        nav_header_data, nav_body_data = rinex_cache.load_nav(args.nav_file_path)
+        epochs = obs_reader.ObsBodyView(columnar)
+    else:
+        obs_header_data = obs_reader.decode_obs_header_data(args.obs_file_path)
+        nav_header_data = nav_reader.decode_nav_header_data(args.nav_file_path)
+        nav_body_data = nav_reader.decode_nav_body_data(args.nav_file_path)
+        if args.parse_workers > 1:
+            epochs = obs_reader.ObsBodyView(obs_reader.decode_obs_body_columnar_parallel(
+                args.obs_file_path, args.parse_workers, systems, SPP_OBS_CODES))
+        else:
+            epochs = obs_reader.iter_obs_epochs(args.obs_file_path, systems=systems, obs_codes=SPP_OBS_CODES)
+    ephemeris_index = nav_reader.build_ephemeris_index(nav_body_data)
+    XYZ0 = obs_header_data['approx_position_xyz']
+    corrections = atmosphere_corrections(nav_header_data, args.iono, args.tropo) if args.iono or args.tropo else None
+    with instrumentation.timer("spp.build_orbit_tables"):
+        orbit_tables = (build_orbit_tables(ephemeris_index, *session_span(obs_header_data))
+                        if args.orbit_tables else None)
+    precise_orbits = None
+    if args.sp3:
+        precise_orbits = precise_orbit.build_precise_orbits(
+            [precise_reader.decode_sp3_data(file_path) for file_path in args.sp3],
+            [precise_reader.decode_clk_data(file_path, systems) for file_path in args.clk] if args.clk else None)
+
+    with ExitStack() as stack:
+        # Uydu konumları epoch epoch yazılır; tüm gün bellekte biriktirilmez
+        write_epoch = None
+        if args.output:
+            write_epoch = stack.enter_context(spp_writer.open_output(args.output, metadata={
+                "obs_file_path": args.obs_file_path, "nav_file_path": args.nav_file_path,
+                "approx_position_xyz": XYZ0}, append=args.follow and bool(args.checkpoint), flush=args.follow))
+        if args.follow:
+            kinematic_filter = spp_kalman.KinematicFilter(XYZ0, process_noise) if args.kinematic else None
+            for epoch_idx, epoch_data, epoch_positions, solution in follow_positions(
+                    args.obs_file_path, ephemeris_index, XYZ0, args.checkpoint, systems=systems,
+                    idle_timeout=args.idle_timeout, kinematic_filter=kinematic_filter, corrections=corrections,
+                    precise_orbits=precise_orbits):
+                if write_epoch is not None:
+                    write_epoch(epoch_idx, epoch_positions, epoch_time_string(epoch_data["epoch"]),
+                                epoch_data["epoch"].get("time"))
+                print(epoch_idx, epoch_time_string(epoch_data["epoch"]), solution["xyz"], flush=True)
+            output = None
+        elif args.kinematic:
+            output = process_epochs_kinematic(epochs, ephemeris_index, XYZ0, process_noise, orbit_tables, corrections,
+                                              precise_orbits, write_epoch)
+        elif args.workers > 1:
+            output = process_epochs_parallel(epochs, ephemeris_index, XYZ0, args.workers, args.chunk_size,
+                                             orbit_tables, corrections, precise_orbits, write_epoch)
+        else:
+            output = process_epochs(epochs, ephemeris_index, XYZ0, args.chunk_size, orbit_tables, corrections,
+                                    precise_orbits, write_epoch)
+    if output is not None:
+        print("Ortalama alıcı konumu (XYZ):", np.nanmean(output["solution"]["xyz"], axis=0))
+    if args.profile:
+        instrumentation.write_report(args.profile)
+        for stage, timing in instrumentation.report()["stages"].items():
+            print(f"{stage:28} {timing['calls']:9d} çağrı {timing['seconds']:9.4f} s")
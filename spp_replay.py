@@ -0,0 +1,113 @@
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import obs_reader
+from rinex_io import open_rinex
+from spp_server import DEFAULT_INGEST_ADDRESS, DEFAULT_SUBSCRIBE_ADDRESS, open_connection
+
+
+# Function to stream an observation file to the SPP server, paced by the epoch times
+async def replay(obs_file_path, address=DEFAULT_INGEST_ADDRESS, speed=1.0):
+    """
+    Gözlem dosyasını (başlık + epoch kayıtları) spp_server ingest soketine, alıcıdan canlı
+    geliyormuş gibi gönderir.
+
+    Args:
+        speed (float): Oynatma hızı; 1 gerçek zaman, 10 on kat hızlı, 0 beklemeden.
+
+    Returns:
+        int: Gönderilen epoch kaydı sayısı.
+    """
+    reader, writer = await open_connection(address)
+    num_records = 0
+    first_time = started = None
+    with open_rinex(obs_file_path) as file:
+        header_lines = []
+        for line in file:
+            header_lines.append(line)
+            if "END OF HEADER" in line[60:]:
+                break
+        writer.write(''.join(header_lines).encode('latin-1'))
+        obs_header_data = obs_reader.decode_obs_header_lines(header_lines)
+
+        lines = []
+        for line in file:
+            lines.append(line)
+            records, used = obs_reader.split_epoch_records(lines, obs_header_data)
+            del lines[:used]
+            for record_lines in records:
+                epoch_data = obs_reader.decode_epoch_record(record_lines, obs_header_data)
+                if speed and epoch_data is not None:
+                    # Kayıt, ilk epoch'a göre geçen süre / speed anında gönderilir
+                    if first_time is None:
+                        first_time, started = epoch_data["epoch"]["time"], time.monotonic()
+                    delay = started + (epoch_data["epoch"]["time"] - first_time) / 1e9 / speed - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                writer.write(''.join(record_lines).encode('latin-1'))
+                # Sunucu kuyruğu doluysa burada beklenir
+                await writer.drain()
+                num_records += 1
+    writer.close()
+    await writer.wait_closed()
+    return num_records
+
+
+# Function to receive results from the SPP server
+async def subscribe(address=DEFAULT_SUBSCRIBE_ADDRESS):
+    reader, writer = await open_connection(address)
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            yield json.loads(line)
+    finally:
+        writer.close()
+
+
+# Function to replay a file while printing the results the server sends back
+async def replay_and_subscribe(obs_file_path, ingest_address, subscribe_address, speed, idle_timeout=2.0):
+    results = []
+
+    async def collect():
+        async for message in subscribe(subscribe_address):
+            results.append(message)
+            print(message["epoch"], message["time"], message["xyz"], f"{message['latency'] * 1000:.1f} ms")
+
+    collector = asyncio.create_task(collect())
+    await asyncio.sleep(0.1)
+    num_records = await replay(obs_file_path, ingest_address, speed)
+    # Son sonuçlar için bir süre daha beklenir
+    while True:
+        count = len(results)
+        await asyncio.sleep(idle_timeout)
+        if len(results) == count:
+            break
+    collector.cancel()
+    return num_records, results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a RINEX observation file to the live SPP server")
+    parser.add_argument("obs_file_path")
+    parser.add_argument("--ingest", default=DEFAULT_INGEST_ADDRESS, help="server ingest address")
+    parser.add_argument("--subscribe", default=DEFAULT_SUBSCRIBE_ADDRESS,
+                        help="server subscribe address (results are printed)")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay rate: 1 = real time, 0 = as fast as possible")
+    parser.add_argument("--no-subscribe", action="store_true", help="only send, do not wait for results")
+    args = parser.parse_args()
+
+    if args.no_subscribe:
+        print("Gönderilen epoch sayısı:", asyncio.run(replay(args.obs_file_path, args.ingest, args.speed)))
+    else:
+        num_records, results = asyncio.run(replay_and_subscribe(args.obs_file_path, args.ingest, args.subscribe,
+                                                                args.speed))
+        print("Gönderilen epoch sayısı:", num_records, "Alınan sonuç:", len(results))
+        if results:
+            latencies = [message["latency"] for message in results]
+            print(f"Gecikme (ms): medyan {statistics.median(latencies) * 1000:.1f}, "
+                  f"en fazla {max(latencies) * 1000:.1f}")
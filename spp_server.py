@@ -0,0 +1,232 @@
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+
+import numpy as np
+
+import nav_reader
+import obs_reader
+import spp_processing
+
+# Varsayılan adresler: alıcı verisinin gönderildiği (ingest) ve sonuçların dağıtıldığı (subscribe) soketler
+DEFAULT_INGEST_ADDRESS = "127.0.0.1:2101"
+DEFAULT_SUBSCRIBE_ADDRESS = "127.0.0.1:2102"
+
+# Çözülmeyi bekleyen en fazla epoch; kuyruk dolunca göndericiden okuma durur (TCP geri basıncı)
+EPOCH_QUEUE_SIZE = 64
+
+# Abone başına bekleyen en fazla sonuç; yavaş abone çözümü bekletmez, en eski sonucu kaybeder
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+# Function to parse a socket address: "unix:/path", "host:port" or "port"
+def parse_address(address):
+    if address.startswith("unix:"):
+        return "unix", address[5:]
+    host, _, port = address.rpartition(":")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+# Function to open a client connection to a parse_address style address
+async def open_connection(address, limit=2 ** 20):
+    kind, target = parse_address(address)
+    if kind == "unix":
+        return await asyncio.open_unix_connection(target, limit=limit)
+    return await asyncio.open_connection(*target, limit=limit)
+
+
+# Function to start a listening server on a parse_address style address
+async def start_listener(address, handler, limit=2 ** 20):
+    kind, target = parse_address(address)
+    if kind == "unix":
+        return await asyncio.start_unix_server(handler, target, limit=limit)
+    return await asyncio.start_server(handler, *target, limit=limit)
+
+
+# Function to convert numpy values to JSON values (NaN -> None)
+def _json_value(value):
+    if isinstance(value, np.ndarray):
+        return [_json_value(item) for item in value.tolist()]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+# Canlı SPP servisi: epoch kayıtlarını soketten alır, çözer ve abonelere dağıtır
+class SppServer:
+    """
+    Asyncio tabanlı canlı SPP servisi.
+
+    Ingest soketine bağlanan her istemci önce bir RINEX gözlem başlığı (END OF HEADER dahil),
+    ardından epoch kayıtlarını decode_obs_body_data ile aynı biçimde gönderir. Tamamlanan her kayıt
+    sınırlı bir kuyruğa alınır ve tek bir çözücü görevi tarafından sırayla çözülür; kuyruk dolduğunda
+    göndericiden okuma durur. Subscribe soketine bağlanan her istemciye sonuçlar satır başına bir
+    JSON nesnesi olarak gönderilir.
+
+    Args:
+        ephemeris_index (dict): nav_reader.build_ephemeris_index çıktısı.
+        systems (tuple): Çözüme katılan uydu sistemleri.
+        corrections (dict): spp_processing.atmosphere_corrections çıktısı (None: düzeltme yok).
+    """
+
+    def __init__(self, ephemeris_index, systems=('G',), epoch_queue_size=EPOCH_QUEUE_SIZE,
+                 subscriber_queue_size=SUBSCRIBER_QUEUE_SIZE, corrections=None):
+        self.ephemeris_index = ephemeris_index
+        self.systems = tuple(systems)
+        self.corrections = corrections
+        self.epochs = asyncio.Queue(epoch_queue_size)
+        self.subscriber_queue_size = subscriber_queue_size
+        self.subscribers = set()
+        self.stats = {"epochs_received": 0, "epochs_solved": 0, "epochs_failed": 0, "results_dropped": 0}
+
+    # Function to count and report an epoch record that could not be split, decoded or solved
+    def _record_failure(self, source, epoch_idx, error):
+        self.stats["epochs_failed"] += 1
+        print(f"{source}: epoch {epoch_idx} atlandı: {error!r}", file=sys.stderr, flush=True)
+
+    # Function to read one ingest connection: header, then epoch records into the epoch queue
+    async def handle_ingest(self, reader, writer):
+        source = str(writer.get_extra_info("peername") or writer.get_extra_info("sockname"))
+        try:
+            header_lines = []
+            while not header_lines or "END OF HEADER" not in header_lines[-1][60:]:
+                line = await reader.readline()
+                if not line:
+                    return
+                header_lines.append(line.decode('latin-1').rstrip('\r\n') + '\n')
+            obs_header_data = obs_reader.decode_obs_header_lines(header_lines)
+            XYZ0 = obs_header_data['approx_position_xyz'] or [0.0, 0.0, 0.0]
+
+            lines = []
+            epoch_idx = 0
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                lines.append(line.decode('latin-1').rstrip('\r\n') + '\n')
+                try:
+                    records, used = obs_reader.split_epoch_records(lines, obs_header_data)
+                except ValueError as e:
+                    # Bozuk kayıt başı (ör. sayısal olmayan uydu sayısı) atlanır; bağlantı açık kalır
+                    self._record_failure(source, epoch_idx, e)
+                    del lines[:1]
+                    continue
+                del lines[:used]
+                for record_lines in records:
+                    # Kuyruk doluysa burada beklenir; bu sırada soketten okunmaz
+                    await self.epochs.put((source, epoch_idx, time.monotonic(), record_lines, obs_header_data, XYZ0))
+                    self.stats["epochs_received"] += 1
+                    epoch_idx += 1
+        except ConnectionError:
+            pass
+        except ValueError as e:
+            # Başlık çözülemedi: bu bağlantıdan kayıt alınmaz
+            self._record_failure(source, None, e)
+        finally:
+            writer.close()
+
+    # Function to send the published results to one subscriber connection
+    async def handle_subscribe(self, reader, writer):
+        queue = asyncio.Queue(self.subscriber_queue_size)
+        self.subscribers.add(queue)
+        try:
+            while True:
+                message = await queue.get()
+                writer.write(json.dumps(message).encode('utf-8') + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.subscribers.discard(queue)
+            writer.close()
+
+    # Function to put a result on every subscriber queue, dropping the oldest result of full queues
+    def publish(self, message):
+        for queue in self.subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self.stats["results_dropped"] += 1
+            queue.put_nowait(message)
+
+    # Function to decode and solve one queued epoch record (runs in a worker thread)
+    def _solve(self, source, epoch_idx, received, record_lines, obs_header_data, XYZ0):
+        epoch_data = obs_reader.decode_epoch_record(record_lines, obs_header_data, self.systems,
+                                                    obs_codes=spp_processing.SPP_OBS_CODES)
+        if epoch_data is None:
+            return None
+        epoch_positions, solution = spp_processing.solve_epoch(epoch_data, self.ephemeris_index, XYZ0,
+                                                                     corrections=self.corrections)
+        gps_week, sow = spp_processing.epoch_gps_week_sow(epoch_data["epoch"])
+        message = {
+            "source": source,
+            "epoch": epoch_idx,
+            "time": spp_processing.epoch_time_string(epoch_data["epoch"]),
+            "gps_week": gps_week,
+            "sow": sow,
+            "satellites": list(epoch_positions)
+        }
+        message.update({key: _json_value(value) for key, value in solution.items()})
+        message["latency"] = time.monotonic() - received
+        return message
+
+    # Function to solve queued epochs in arrival order and publish the results
+    async def solve_epochs(self):
+        while True:
+            item = await self.epochs.get()
+            # Çözüm iş parçacığında yapılır; olay döngüsü bu sırada soketleri okumaya devam eder.
+            # Bozuk bir kayıt çözücü görevini durdurmaz: sayılır, bildirilir ve atlanır
+            try:
+                message = await asyncio.to_thread(self._solve, *item)
+            except Exception as e:
+                self._record_failure(item[0], item[1], e)
+                message = None
+            finally:
+                self.epochs.task_done()
+            if message is not None:
+                self.stats["epochs_solved"] += 1
+                self.publish(message)
+
+    # Function to run the server until cancelled
+    async def serve(self, ingest_address=DEFAULT_INGEST_ADDRESS, subscribe_address=DEFAULT_SUBSCRIBE_ADDRESS,
+                    started=None):
+        ingest_server = await start_listener(ingest_address, self.handle_ingest)
+        subscribe_server = await start_listener(subscribe_address, self.handle_subscribe)
+        solver = asyncio.create_task(self.solve_epochs())
+        if started is not None:
+            started.set()
+        try:
+            async with ingest_server, subscribe_server:
+                await asyncio.gather(ingest_server.serve_forever(), subscribe_server.serve_forever())
+        finally:
+            solver.cancel()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Live SPP service: solve RINEX observation epochs received over "
+                                                 "a socket and stream the results to subscribers")
+    parser.add_argument("nav_file_path")
+    parser.add_argument("--ingest", default=DEFAULT_INGEST_ADDRESS,
+                        help="address for incoming epoch records: host:port or unix:/path")
+    parser.add_argument("--subscribe", default=DEFAULT_SUBSCRIBE_ADDRESS,
+                        help="address for result subscribers: host:port or unix:/path")
+    parser.add_argument("--systems", default="G", help="satellite systems to use, e.g. GR for GPS + GLONASS")
+    parser.add_argument("--queue-size", type=int, default=EPOCH_QUEUE_SIZE, help="epochs waiting to be solved")
+    parser.add_argument("--iono", action="store_true", help="apply the Klobuchar ionosphere correction")
+    parser.add_argument("--tropo", action="store_true", help="apply the Saastamoinen troposphere correction")
+    args = parser.parse_args()
+
+    ephemeris_index = nav_reader.build_ephemeris_index(nav_reader.decode_nav_body_data(args.nav_file_path))
+    corrections = (spp_processing.atmosphere_corrections(nav_reader.decode_nav_header_data(args.nav_file_path),
+                                                         args.iono, args.tropo)
+                   if args.iono or args.tropo else None)
+    server = SppServer(ephemeris_index, tuple(args.systems), args.queue_size, corrections=corrections)
+    print(f"Ingest: {args.ingest}  Subscribe: {args.subscribe}")
+    try:
+        asyncio.run(server.serve(args.ingest, args.subscribe))
+    except KeyboardInterrupt:
+        print(server.stats)
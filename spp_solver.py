@@ -0,0 +1,163 @@
+import numpy as np
+
+# Işık hızı (m/s)
+c = 299792458.0
+
+# Çözümde kullanılan uydu sistemleri; her sistem için ayrı bir alıcı saat bilinmeyeni kestirilir
+SPP_SYSTEMS = ('G', 'R')
+
+# Normal matrisinin bu koşul sayısını aştığı epoch'lar (bozuk geometri, tekrarlanan uydu satırı vb.)
+# çözülmez; sonuçları NaN kalır
+MAX_CONDITION_NUMBER = 1e12
+
+
+def stack_epoch_positions(satellite_positions):
+    """
+    Epoch bazlı uydu konumu sözlüklerini (spp_basic1'deki epoch_positions yapısı) doldurulmuş
+    (padded) dizilere çevirir.
+
+    Args:
+        satellite_positions (dict | list): {epoch_idx: {prn: {"X", "Y", "Z", "dts", "pseudorange", ...}}}
+            ya da epoch_positions sözlüklerinin listesi.
+
+    Returns:
+        tuple: (sat_xyz [epoch x uydu x 3], dts [epoch x uydu], pseudorange [epoch x uydu],
+        mask [epoch x uydu, bool]).
+    """
+    if isinstance(satellite_positions, dict):
+        epochs = [satellite_positions[key] for key in sorted(satellite_positions)]
+    else:
+        epochs = list(satellite_positions)
+
+    num_epochs = len(epochs)
+    max_sats = max((len(epoch_positions) for epoch_positions in epochs), default=0)
+    sat_xyz = np.zeros((num_epochs, max_sats, 3))
+    dts = np.zeros((num_epochs, max_sats))
+    pseudorange = np.zeros((num_epochs, max_sats))
+    mask = np.zeros((num_epochs, max_sats), dtype=bool)
+
+    for epoch_idx, epoch_positions in enumerate(epochs):
+        for sat_idx, position in enumerate(epoch_positions.values()):
+            sat_xyz[epoch_idx, sat_idx] = (position['X'], position['Y'], position['Z'])
+            dts[epoch_idx, sat_idx] = position['dts']
+            pseudorange[epoch_idx, sat_idx] = position['pseudorange']
+            mask[epoch_idx, sat_idx] = True
+
+    return sat_xyz, dts, pseudorange, mask
+
+
+def stack_epoch_systems(satellite_positions, systems=SPP_SYSTEMS):
+    """
+    stack_epoch_positions ile aynı düzende (epoch x uydu) her uydunun sistem indeksini
+    (systems içindeki sırası) döndürür; solve_spp_batch'in system_index argümanı için.
+    """
+    if isinstance(satellite_positions, dict):
+        epochs = [satellite_positions[key] for key in sorted(satellite_positions)]
+    else:
+        epochs = list(satellite_positions)
+
+    max_sats = max((len(epoch_positions) for epoch_positions in epochs), default=0)
+    system_index = np.zeros((len(epochs), max_sats), dtype=np.int64)
+    for epoch_idx, epoch_positions in enumerate(epochs):
+        for sat_idx, prn in enumerate(epoch_positions):
+            system_index[epoch_idx, sat_idx] = systems.index(prn[0])
+    return system_index
+
+
+def solve_spp_batch(sat_xyz, dts, pseudorange, mask, XYZ0, max_iterations=10, tolerance=1e-4,
+                    system_index=None, num_systems=len(SPP_SYSTEMS)):
+    """
+    Tüm epoch'lar için alıcı konumunu ve saat hatasını iteratif en küçük kareler ile birlikte çözer.
+    Her iterasyonda aktif epoch'ların tasarım matrisleri üst üste konur ve normal denklemler
+    tek seferde çözülür; yakınsayan epoch'lar sonraki iterasyonlardan çıkarılır.
+
+    Args:
+        sat_xyz, dts, pseudorange, mask: stack_epoch_positions çıktısı.
+        XYZ0 (list): Alıcı yaklaşık konumu (approx_position_xyz).
+        max_iterations (int): Epoch başına en fazla iterasyon.
+        tolerance (float): Konum düzeltmesi bu değerin (metre) altına inince epoch yakınsamış sayılır.
+        system_index (ndarray): stack_epoch_systems çıktısı (verilmezse tüm uydular ilk sistemdendir).
+        num_systems (int): Saat bilinmeyeni sayısı; epoch'ta gözlenmeyen sistemlerin saati çözülmez.
+
+    Returns:
+        dict: "xyz" (epoch x 3, metre), "dtr" (ilk sistemin alıcı saat hatası, saniye),
+        "system_bias" (epoch x num_systems-1, diğer sistemlerin ilk sisteme göre saat farkı, saniye),
+        "num_satellites", "iterations", "converged". Bilinmeyen sayısından az uydulu ya da normal
+        matrisi tekil/kötü koşullu olan epoch'lar NaN (converged=False) olarak döner.
+    """
+    sat_xyz = np.asarray(sat_xyz, dtype=np.float64)
+    mask = np.asarray(mask, dtype=bool)
+    corrected_range = np.where(mask, np.asarray(pseudorange, dtype=np.float64) + c * np.asarray(dts, dtype=np.float64), 0.0)
+    num_epochs = mask.shape[0]
+
+    if system_index is None:
+        system_index = np.zeros(mask.shape, dtype=np.int64)
+    system_index = np.asarray(system_index, dtype=np.int64)
+    # Uydu x sistem saat sütunu seçici; epoch'ta gözlenmeyen sistemlerin sütunu sıfır kalır
+    clock_columns = (system_index[..., None] == np.arange(num_systems)) & mask[..., None]
+    empty_clock = ~clock_columns.any(axis=1)
+    num_unknowns = 3 + num_systems
+
+    xyz = np.tile(np.asarray(XYZ0, dtype=np.float64), (num_epochs, 1))
+    cdtr = np.zeros((num_epochs, num_systems))
+    iterations = np.zeros(num_epochs, dtype=np.int64)
+    converged = np.zeros(num_epochs, dtype=bool)
+    num_satellites = mask.sum(axis=1)
+    solvable = num_satellites >= 3 + num_systems - empty_clock.sum(axis=1)
+
+    # Sadece bilinmeyen sayısı kadar uydusu olan epoch'lar çözülebilir
+    active = np.flatnonzero(solvable)
+    for _ in range(max_iterations):
+        if active.size == 0:
+            break
+        active_mask = mask[active]
+        dXYZ = sat_xyz[active] - xyz[active, None, :]
+        rho = np.sqrt(np.einsum('esk,esk->es', dXYZ, dXYZ))
+        rho = np.where(active_mask, rho, 1.0)
+
+        # Ön-fit artıkları ve tasarım matrisi (maskeli satırlar sıfır)
+        active_clocks = clock_columns[active]
+        sat_clock = np.einsum('esk,ek->es', active_clocks, cdtr[active])
+        residual = np.where(active_mask, corrected_range[active] - rho - sat_clock, 0.0)
+        H = np.empty(dXYZ.shape[:2] + (num_unknowns,))
+        H[..., :3] = -dXYZ / rho[..., None]
+        H[..., 3:] = active_clocks
+        H *= active_mask[..., None]
+
+        # Toplu normal denklemler: (H^T H) dx = H^T v; gözlenmeyen sistemin saati sabit tutulur
+        N = np.einsum('esi,esj->eij', H, H)
+        N[:, 3:, 3:] += np.einsum('ek,kj->ekj', empty_clock[active], np.eye(num_systems))
+        b = np.einsum('esi,es->ei', H, residual)
+
+        # Tekil ya da kötü koşullu epoch'lar toplu çözümü bozmasın diye aktif listeden çıkarılır
+        well_conditioned = np.isfinite(N).all(axis=(1, 2)) & np.isfinite(b).all(axis=1)
+        well_conditioned[well_conditioned] = np.linalg.cond(N[well_conditioned]) < MAX_CONDITION_NUMBER
+        if not well_conditioned.all():
+            solvable[active[~well_conditioned]] = False
+            active = active[well_conditioned]
+            N = N[well_conditioned]
+            b = b[well_conditioned]
+            if active.size == 0:
+                break
+        dx = np.linalg.solve(N, b[..., None])[..., 0]
+
+        xyz[active] += dx[:, :3]
+        cdtr[active] += dx[:, 3:]
+        iterations[active] += 1
+
+        done = np.linalg.norm(dx[:, :3], axis=1) < tolerance
+        converged[active[done]] = True
+        active = active[~done]
+
+    xyz[~solvable] = np.nan
+    cdtr[~solvable] = np.nan
+    cdtr[empty_clock] = np.nan
+
+    return {
+        "xyz": xyz,
+        "dtr": cdtr[:, 0] / c,
+        "system_bias": (cdtr[:, 1:] - cdtr[:, :1]) / c,
+        "num_satellites": num_satellites,
+        "iterations": iterations,
+        "converged": converged
+    }
@@ -0,0 +1,181 @@
+import json
+import os
+from contextlib import contextmanager
+
+import numpy as np
+
+import instrumentation
+
+# İkili çıktı dosyası imzası (6 bayt ad + biçim sürümü); sürüm 2 kayıtlara GPS zamanını ekler
+OUTPUT_MAGIC = b'SPPOUT\x00\x02'
+
+# Kayıtlar dosyada bu bayt sınırından başlar (başlık boşlukla doldurulur)
+HEADER_ALIGNMENT = 64
+
+# İkili çıktının kayıt tipi: epoch/uydu başına bir kayıt, 63 bayt (JSON'da ~400 bayt). "epoch" çalışma
+# içindeki sıra numarasıdır (--start/--end ya da takip modunda yeniden başlatınca 0'dan başlar);
+# kaydın hangi ana ait olduğunu "time" (GPS başlangıcından itibaren ns) belirler
+OUTPUT_DTYPE = np.dtype([("epoch", "<i4"), ("time", "<i8"), ("prn", "S3"),
+                         ("X", "<f8"), ("Y", "<f8"), ("Z", "<f8"),
+                         ("dts", "<f8"), ("pseudorange", "<f8"), ("tau", "<f8")])
+
+# Zamanı bilinmeyen epoch'ların "time" değeri
+UNKNOWN_TIME = np.iinfo(np.int64).min
+
+# Dosya uzantısından çıktı biçimi: ikili kayıtlar ya da satır başına bir epoch'luk JSON
+OUTPUT_FORMATS = {".spb": "binary", ".jsonl": "jsonl"}
+
+
+# Function to choose the output format of a file from its extension
+def output_format(file_path):
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format for {file_path}: use one of {', '.join(OUTPUT_FORMATS)}")
+    return OUTPUT_FORMATS[ext]
+
+
+# Function to pack one epoch of compute_epoch_positions results into OUTPUT_DTYPE records
+def _epoch_records(epoch_idx, epoch_positions, time_ns=None):
+    records = np.empty(len(epoch_positions), dtype=OUTPUT_DTYPE)
+    records["epoch"] = epoch_idx
+    records["time"] = UNKNOWN_TIME if time_ns is None else time_ns
+    records["prn"] = [prn.encode('ascii') for prn in epoch_positions]
+    for key in OUTPUT_DTYPE.names[3:]:
+        records[key] = [position[key] for position in epoch_positions.values()]
+    return records
+
+
+# Function to open an incremental satellite position output file
+@contextmanager
+def open_output(file_path, file_format=None, metadata=None, append=False, flush=False):
+    """
+    Uydu konumlarını epoch epoch yazan bir çıktı dosyası açar; sonuçlar bellekte biriktirilmez.
+
+    "binary" biçiminde dosya OUTPUT_MAGIC, 4 baytlık başlık uzunluğu, JSON başlık (kayıt tipi ve
+    metadata) ve ardından OUTPUT_DTYPE kayıtlarından oluşur; read_output ile memmap olarak okunur.
+    "jsonl" biçiminde ilk satır başlık, sonraki her satır bir epoch'tur
+    ({"epoch", "time", "positions"}); iter_output ile okunur.
+
+    append=True ile var olan dosyanın sonuna yazılır (takip modu yeniden başlatıldığında); yarıda
+    kalmış son kayıt/satır önce kesilip atılır, başlık yeniden yazılmaz.
+
+    Args:
+        file_path (str): Çıktı dosyası (.spb ya da .jsonl).
+        file_format (str): "binary" ya da "jsonl"; verilmezse uzantıdan seçilir.
+        metadata (dict): Başlığa yazılacak ek bilgiler (ör. dosya adları, XYZ0).
+        append (bool): Dosya varsa sonuna ekle.
+        flush (bool): Her epoch'tan sonra dosyayı diske aktar (canlı okuyucular için).
+
+    Yields:
+        function: write_epoch(epoch_idx, epoch_positions, epoch_time=None, time_ns=None) - epoch_time
+        JSON satırlarına yazılan zaman metni, time_ns ikili kayıtların GPS zamanıdır (epoch_data["epoch"]["time"]).
+    """
+    file_format = file_format or output_format(file_path)
+    header = {"format": file_format, "metadata": metadata or {}}
+    append = append and os.path.exists(file_path) and os.path.getsize(file_path) > 0
+
+    if file_format == "binary":
+        header["dtype"] = OUTPUT_DTYPE.descr
+        with open(file_path, "r+b" if append else "wb") as file:
+            if append:
+                existing_header, offset = _read_binary_header(file_path)
+                if [tuple(field) for field in existing_header["dtype"]] != OUTPUT_DTYPE.descr:
+                    raise ValueError(f"{file_path} was written with an older record format; cannot append to it")
+                num_records = (os.path.getsize(file_path) - offset) // OUTPUT_DTYPE.itemsize
+                file.truncate(offset + num_records * OUTPUT_DTYPE.itemsize)
+                file.seek(0, os.SEEK_END)
+            else:
+                header_bytes = json.dumps(header).encode('utf-8')
+                header_bytes += b' ' * (-(len(OUTPUT_MAGIC) + 4 + len(header_bytes)) % HEADER_ALIGNMENT)
+                file.write(OUTPUT_MAGIC + len(header_bytes).to_bytes(4, 'little') + header_bytes)
+
+            def write_epoch(epoch_idx, epoch_positions, epoch_time=None, time_ns=None):
+                with instrumentation.timer("output.write"):
+                    file.write(_epoch_records(epoch_idx, epoch_positions, time_ns).tobytes())
+                    if flush:
+                        file.flush()
+
+            yield write_epoch
+    elif file_format == "jsonl":
+        if append:
+            with open(file_path, "r+b") as binary_file:
+                binary_file.truncate(_complete_lines_length(binary_file))
+        with open(file_path, "a" if append else "w") as file:
+            if not append:
+                file.write(json.dumps(header) + "\n")
+
+            def write_epoch(epoch_idx, epoch_positions, epoch_time=None, time_ns=None):
+                with instrumentation.timer("output.write"):
+                    file.write(json.dumps({"epoch": epoch_idx, "time": epoch_time, "positions": epoch_positions}) + "\n")
+                    if flush:
+                        file.flush()
+
+            yield write_epoch
+    else:
+        raise ValueError(f"Unknown output format: {file_format}")
+
+
+# Function to return the length of a text file up to and including its last newline
+def _complete_lines_length(binary_file):
+    end = binary_file.seek(0, os.SEEK_END)
+    position = end
+    while position > 0:
+        start = max(0, position - 65536)
+        binary_file.seek(start)
+        newline = binary_file.read(position - start).rfind(b'\n')
+        if newline >= 0:
+            return start + newline + 1
+        position = start
+    return 0
+
+
+# Function to write already collected satellite positions ({epoch_idx: {prn: {...}}}) to an output file
+def write_satellite_positions(file_path, satellite_positions, file_format=None, metadata=None):
+    with open_output(file_path, file_format, metadata) as write_epoch:
+        for epoch_idx, epoch_positions in satellite_positions.items():
+            write_epoch(epoch_idx, epoch_positions)
+
+
+# Function to read the header of a binary output file: (header dict, offset of the first record)
+def _read_binary_header(file_path):
+    with open(file_path, "rb") as file:
+        # Kayıt tipi başlıkta saklandığı için eski sürüm dosyalar da okunabilir
+        if file.read(len(OUTPUT_MAGIC))[:6] != OUTPUT_MAGIC[:6]:
+            raise ValueError(f"{file_path} is not a binary SPP output file")
+        header_length = int.from_bytes(file.read(4), 'little')
+        header = json.loads(file.read(header_length))
+    return header, len(OUTPUT_MAGIC) + 4 + header_length
+
+
+# Function to memory-map the records of a binary output file
+def read_output(file_path):
+    """
+    İkili çıktı dosyasını belleğe kopyalamadan (memmap) açar. Sütunlara alan adıyla erişilir,
+    ör. records["time"], records["X"], records["prn"]; yazım yarıda kalmışsa son eksik kayıt yok
+    sayılır. Sürüm 1 dosyalarında "time" alanı yoktur.
+
+    Returns:
+        tuple: (metadata dict, OUTPUT_DTYPE tipinde salt okunur dizi)
+    """
+    header, offset = _read_binary_header(file_path)
+    dtype = np.dtype([tuple(field) for field in header["dtype"]])
+    num_records = (os.path.getsize(file_path) - offset) // dtype.itemsize
+    if num_records == 0:
+        return header["metadata"], np.empty(0, dtype=dtype)
+    return header["metadata"], np.memmap(file_path, dtype=dtype, mode='r', offset=offset, shape=(num_records,))
+
+
+# Function to stream the epochs of a JSON-lines output file
+def iter_output(file_path):
+    """
+    JSON satırları çıktısını epoch epoch okur.
+
+    Yields:
+        tuple: (epoch_idx, epoch_time, epoch_positions)
+    """
+    with open(file_path, "r") as file:
+        next(file, None)  # başlık satırı
+        for line in file:
+            if line.strip():
+                record = json.loads(line)
+                yield record["epoch"], record["time"], record["positions"]
@@ -0,0 +1,248 @@
+import argparse
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+
+import nav_reader
+from brdc_calculator import calculate_satellite_positions
+
+# Işık hızı (m/s) ve Dünyanın dönüş hızı (rad/s)
+c = 299792458.0
+OMEGA_dot_Earth = 7.2921151467e-5
+
+# GPS L1 dalga boyu (m)
+L1_WAVELENGTH = c / 1575.42e6
+
+# Gerçek efemeris şablonları ve alıcı konumu için varsayılan örnek dosya
+TEMPLATE_NAV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Rinex Files", "base123i.24p")
+DEFAULT_RECEIVER_XYZ = (4451477.4519, 2271046.0177, 3950022.8913)
+
+# Sentetik dosya ayarları
+SYNTHETIC_OBS_TYPES = ("C1C", "L1C", "S1C")
+EPHEMERIS_UPDATE_INTERVAL = 7200.0   # Yayın efemerisi yenileme aralığı (s)
+ELEVATION_MASK_DEG = 10.0
+PSEUDORANGE_NOISE = 0.3              # Kod gürültüsü (m, 1 sigma)
+MAX_GPS_SATELLITES = 32
+
+# Kayıt başına bir seferde üretilen epoch sayısı (bellek sınırı)
+EPOCH_BLOCK = 3600
+
+
+# Function to convert continuous GPS seconds (week * 604800 + sow) to a calendar datetime
+def gps_seconds_to_datetime(t_gps):
+    return datetime(1980, 1, 6) + timedelta(seconds=float(t_gps))
+
+
+# Function to format a float as a RINEX D19.12 field (blank for NaN)
+def _nav_field(value):
+    return ' ' * 19 if np.isnan(value) else f"{value:19.12e}"
+
+
+# Function to build synthetic GPS ephemerides from real broadcast records
+def synthetic_ephemerides(num_satellites, t_start, t_end, template_nav_file=TEMPLATE_NAV_FILE,
+                          update_interval=EPHEMERIS_UPDATE_INTERVAL):
+    """
+    Gerçek yayın efemerislerinden (şablon nav dosyasındaki GPS kayıtları) sentetik bir takımyıldız
+    üretir. Şablon sayısından fazla uydu istenirse kopyalar ortalama anomali ve düğüm boylamında
+    kaydırılır. Oturum boyunca her update_interval saniyede bir yeni efemeris yazılır; M0, OMEGA0,
+    i0 ve a0 yeni toe'ya ilerletildiği için yörünge ve saat kayıtlar arasında süreklidir.
+
+    Returns:
+        numpy.ndarray: nav_reader.GPS_NAV_DTYPE tipinde kayıtlar (uydu ve toe sırasıyla).
+    """
+    if not 1 <= num_satellites <= MAX_GPS_SATELLITES:
+        raise ValueError(f"num_satellites must be between 1 and {MAX_GPS_SATELLITES}")
+
+    templates = nav_reader.decode_nav_body_array(template_nav_file)
+    _, first = np.unique(templates["prn"], return_index=True)
+    templates = templates[np.sort(first)]
+    if len(templates) == 0:
+        raise ValueError(f"{template_nav_file} has no GPS ephemerides")
+
+    mu = 3.986004418e14
+    records = []
+    for satellite in range(num_satellites):
+        template = templates[satellite % len(templates)].copy()
+        copy = satellite // len(templates)
+        template["prn"] = f"G{satellite + 1:02d}"
+        template["M0"] += copy * 2.4
+        template["OMEGA0"] += copy * np.pi / 3
+        template["SV_health"] = 0.0
+        template["fit_interval"] = 4.0
+        template_toe = template["GPS_week"] * 604800 + template["toe"]
+        mean_motion = np.sqrt(mu / template["sqrtA"] ** 6) + template["dn"]
+
+        first_update = int(np.floor((t_start - template_toe) / update_interval))
+        last_update = int(np.ceil((t_end - template_toe) / update_interval))
+        for update in range(first_update, last_update + 1):
+            dt = update * update_interval
+            toe = template_toe + dt
+            record = template.copy()
+            record["GPS_week"], record["toe"] = divmod(toe, 604800)
+            record["M0"] = np.angle(np.exp(1j * (template["M0"] + mean_motion * dt)))
+            record["OMEGA0"] = np.angle(np.exp(1j * (template["OMEGA0"] + template["OMEGA"] * dt
+                                                     - OMEGA_dot_Earth * 604800 * (record["GPS_week"] - template["GPS_week"]))))
+            record["i0"] = template["i0"] + template["idot"] * dt
+            record["a0"] = template["a0"] + template["a1"] * dt
+            record["trans_time"] = record["toe"] - update_interval / 2
+            record["epoch"] = gps_seconds_to_datetime(toe).strftime("%Y %m %d %H %M %S")
+            records.append(record)
+    return np.array(records, dtype=nav_reader.GPS_NAV_DTYPE)
+
+
+# Function to write GPS ephemerides as a RINEX 3.05 navigation file
+def write_nav_file(file_path, nav_array, leap_seconds=18):
+    with open(file_path, "w") as file:
+        file.write(f"{'3.05':>9}{'':11}{'N: GNSS NAV DATA':20}{'G: GPS':20}RINEX VERSION / TYPE\n")
+        file.write(f"{'synthetic_rinex':20}{'':20}{datetime.now().strftime('%Y%m%d %H%M%S UTC'):20}PGM / RUN BY / DATE\n")
+        file.write(f"{leap_seconds:6d}{'':54}LEAP SECONDS\n")
+        file.write(f"{'':60}END OF HEADER\n")
+        for record in nav_array:
+            values = [record[field] for field in nav_reader.GPS_NAV_FIELDS]
+            lines = [f"{record['prn']} {record['epoch']}" + ''.join(_nav_field(value) for value in values[:3])]
+            for start in range(3, len(values), 4):
+                lines.append("    " + ''.join(_nav_field(value) for value in values[start:start + 4]))
+            file.write('\n'.join(line.ljust(80) for line in lines) + '\n')
+
+
+# Function to compute geometric ranges and satellite clocks for epochs x satellites
+def _simulate_ranges(nav_array, t_epochs, XYZ0):
+    """
+    Alıcı zamanlarında (sürekli GPS saniyesi) her uydunun geometrik uzaklığını (ışık zamanı ve
+    Dünya dönüşü düzeltmeli), saat hatasını ve yükseklik açısını hesaplar. Her epoch için
+    toe'su en yakın efemeris kullanılır.
+
+    Returns:
+        tuple: (rho, dts, elevation) dizileri, şekil (epoch, uydu)
+    """
+    prns = list(dict.fromkeys(nav_array["prn"]))
+    toes = nav_array["GPS_week"] * 604800 + nav_array["toe"]
+    selected = np.empty((len(t_epochs), len(prns)), dtype=np.int64)
+    for column, prn in enumerate(prns):
+        rows = np.flatnonzero(nav_array["prn"] == prn)
+        nearest = np.abs(t_epochs[:, None] - toes[rows][None, :]).argmin(axis=1)
+        selected[:, column] = rows[nearest]
+    ephemerides = {key: nav_array[key][selected] for key in ("sqrtA", "e", "i0", "OMEGA0", "omega", "M0", "dn",
+                                                               "OMEGA", "idot", "toe", "cuc", "cus", "crc", "crs",
+                                                               "cic", "cis", "a0", "a1", "a2")}
+
+    XYZ0 = np.asarray(XYZ0, dtype=np.float64)
+    t_sow = (t_epochs % 604800)[:, None]
+    tau = np.full(selected.shape, 0.075)
+    for _ in range(3):
+        X, Y, Z, dts = calculate_satellite_positions(ephemerides, t_sow - tau)
+        angle = OMEGA_dot_Earth * tau
+        dX = np.cos(angle) * X + np.sin(angle) * Y - XYZ0[0]
+        dY = -np.sin(angle) * X + np.cos(angle) * Y - XYZ0[1]
+        dZ = Z - XYZ0[2]
+        rho = np.sqrt(dX ** 2 + dY ** 2 + dZ ** 2)
+        tau = rho / c
+
+    up = XYZ0 / np.linalg.norm(XYZ0)
+    elevation = np.degrees(np.arcsin((dX * up[0] + dY * up[1] + dZ * up[2]) / rho))
+    return rho, dts, elevation
+
+
+# Function to write a synthetic RINEX 3.05 GPS observation file from ephemerides
+def write_obs_file(file_path, nav_array, t_start, duration, interval, XYZ0=DEFAULT_RECEIVER_XYZ,
+                   elevation_mask=ELEVATION_MASK_DEG, seed=0):
+    """
+    Efemerislerden sentetik gözlemler (C1C, L1C, S1C) üretip RINEX 3.05 gözlem dosyası yazar.
+    Pseudorange = geometrik uzaklık + c * (alıcı saat hatası - uydu saat hatası) + gürültü;
+    yükseklik açısı elevation_mask'in altındaki uydular yazılmaz.
+
+    Returns:
+        int: Yazılan epoch sayısı.
+    """
+    rng = np.random.default_rng(seed)
+    num_epochs = int(duration // interval) + 1
+    prns = list(dict.fromkeys(nav_array["prn"]))
+    ambiguities = rng.integers(-1000000, 1000000, len(prns)).astype(np.float64)
+    first = gps_seconds_to_datetime(t_start)
+    last = gps_seconds_to_datetime(t_start + (num_epochs - 1) * interval)
+
+    with open(file_path, "w") as file:
+        header = [
+            f"{'3.05':>9}{'':11}{'OBSERVATION DATA':20}{'G: GPS':20}RINEX VERSION / TYPE",
+            f"{'synthetic_rinex':20}{'':20}{datetime.now().strftime('%Y%m%d %H%M%S UTC'):20}PGM / RUN BY / DATE",
+            f"{'SYNTHETIC':60}MARKER NAME",
+            f"{XYZ0[0]:14.4f}{XYZ0[1]:14.4f}{XYZ0[2]:14.4f}{'':18}APPROX POSITION XYZ",
+            f"{'G':1}{len(SYNTHETIC_OBS_TYPES):5d}" + ''.join(f" {obs_type}" for obs_type in SYNTHETIC_OBS_TYPES).ljust(54)
+            + "SYS / # / OBS TYPES",
+            f"{interval:10.3f}{'':50}INTERVAL",
+            f"{first.year:6d}{first.month:6d}{first.day:6d}{first.hour:6d}{first.minute:6d}"
+            f"{first.second + first.microsecond / 1e6:13.7f}{'GPS':>8}{'':9}TIME OF FIRST OBS",
+            f"{last.year:6d}{last.month:6d}{last.day:6d}{last.hour:6d}{last.minute:6d}"
+            f"{last.second + last.microsecond / 1e6:13.7f}{'GPS':>8}{'':9}TIME OF LAST OBS",
+            f"{'':60}END OF HEADER",
+        ]
+        file.write('\n'.join(header) + '\n')
+
+        for block_start in range(0, num_epochs, EPOCH_BLOCK):
+            t_epochs = t_start + interval * np.arange(block_start, min(block_start + EPOCH_BLOCK, num_epochs))
+            rho, dts, elevation = _simulate_ranges(nav_array, t_epochs, XYZ0)
+            receiver_clock = 1e-7 + 1e-10 * (t_epochs - t_start)[:, None]
+            pseudorange = rho + c * (receiver_clock - dts) + rng.normal(0.0, PSEUDORANGE_NOISE, rho.shape)
+            phase = (rho + c * (receiver_clock - dts)) / L1_WAVELENGTH + ambiguities
+            snr = 30.0 + 20.0 * np.sin(np.radians(np.clip(elevation, 0.0, 90.0)))
+            visible = elevation >= elevation_mask
+
+            lines = []
+            for row, t_epoch in enumerate(t_epochs):
+                epoch_time = gps_seconds_to_datetime(t_epoch)
+                columns = np.flatnonzero(visible[row])
+                lines.append(f"> {epoch_time.year:4d} {epoch_time.month:02d} {epoch_time.day:02d} "
+                             f"{epoch_time.hour:02d} {epoch_time.minute:02d}"
+                             f"{epoch_time.second + epoch_time.microsecond / 1e6:11.7f}  0{len(columns):3d}")
+                for column in columns:
+                    lines.append(f"{prns[column]}{pseudorange[row, column]:14.3f}  "
+                                 f"{phase[row, column]:14.3f}  {snr[row, column]:14.3f}  ")
+            file.write('\n'.join(lines) + '\n')
+    return num_epochs
+
+
+# Function to generate a synthetic observation/navigation file pair
+def generate_rinex(directory, duration=3600.0, interval=30.0, num_satellites=MAX_GPS_SATELLITES, t_start=None,
+                   template_nav_file=TEMPLATE_NAV_FILE, XYZ0=DEFAULT_RECEIVER_XYZ, seed=0):
+    """
+    Ölçeklenme ölçümleri için sentetik bir RINEX 3.05 gözlem/navigasyon dosya çifti üretir.
+
+    Args:
+        directory (str): Dosyaların yazılacağı klasör.
+        duration (float): Oturum uzunluğu (s).
+        interval (float): Örnekleme aralığı (s).
+        num_satellites (int): Takımyıldızdaki GPS uydusu sayısı (görünenler epoch'a yazılır).
+        t_start (float): Başlangıç (sürekli GPS saniyesi); verilmezse şablonun ilk toe'su.
+
+    Returns:
+        tuple: (obs_file_path, nav_file_path)
+    """
+    if t_start is None:
+        templates = nav_reader.decode_nav_body_array(template_nav_file)
+        t_start = float(np.min(templates["GPS_week"] * 604800 + templates["toe"]))
+    nav_array = synthetic_ephemerides(num_satellites, t_start, t_start + duration, template_nav_file)
+
+    os.makedirs(directory, exist_ok=True)
+    first = gps_seconds_to_datetime(t_start)
+    stem = f"synt{first.timetuple().tm_yday:03d}0"
+    obs_file_path = os.path.join(directory, f"{stem}.{first.year % 100:02d}o")
+    nav_file_path = os.path.join(directory, f"{stem}.{first.year % 100:02d}n")
+    write_nav_file(nav_file_path, nav_array)
+    write_obs_file(obs_file_path, nav_array, t_start, duration, interval, XYZ0, seed=seed)
+    return obs_file_path, nav_file_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic RINEX 3.05 GPS observation/navigation pair")
+    parser.add_argument("directory")
+    parser.add_argument("--duration", type=float, default=3600.0, help="session length (s)")
+    parser.add_argument("--interval", type=float, default=30.0, help="sampling interval (s)")
+    parser.add_argument("--satellites", type=int, default=MAX_GPS_SATELLITES)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    obs_file_path, nav_file_path = generate_rinex(args.directory, args.duration, args.interval, args.satellites,
+                                                  seed=args.seed)
+    print(obs_file_path)
+    print(nav_file_path)